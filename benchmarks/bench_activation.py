@@ -0,0 +1,62 @@
+"""Mario update cost on wide levels: everything simulated vs camera-window activation"""
+import random
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from utils.headless import KeyState
+from mario.game import MarioGame
+from mario.activation import ACTIVE_MARGIN
+from mario.level_format import compile_level, LevelFile
+
+FRAMES = 300
+LEVEL_WIDTHS = (2000, 20000, 100000, 500000)
+
+
+def wide_level(level_width, seed=1):
+    """Level dict with a platform, two enemies and two coins every 400 px"""
+    rng = random.Random(seed)
+    level = {"width": level_width, "platforms": [{"x": 0, "y": GROUND_Y, "width": level_width, "height": 50}],
+             "coins": [], "powerups": [], "enemies": [], "checkpoints": []}
+    for x in range(200, level_width, 400):
+        level["platforms"].append({"x": x, "y": rng.randrange(250, 450), "width": 150, "height": 20})
+        level["enemies"].append({"x": x + rng.randrange(300), "y": GROUND_Y - 24,
+                                 "direction": rng.choice((-1, 1))})
+        level["enemies"].append({"x": x + rng.randrange(300), "y": rng.randrange(100, 300),
+                                 "direction": -1, "type": "flying"})
+        level["coins"].append({"x": x + 50, "y": 200})
+        level["coins"].append({"x": x + 250, "y": GROUND_Y - 60})
+    return level
+
+
+def build_wide_level(game, level_width, seed=1):
+    game.load_level(LevelFile(compile_level(wide_level(level_width, seed))))
+
+
+def measure(level_width, active_margin):
+    game = MarioGame()
+    game.active_margin = game.sleep_margin = game.load_margin = active_margin
+    build_wide_level(game, level_width)
+    keys = KeyState({pygame.K_RIGHT})
+
+    def frame():
+        game.player.invincible_timer = 10  # Keep running through enemies
+        game.handle_input(keys)
+        game.update()
+    return summarize(time_calls(frame, FRAMES)), len(game.enemies), len(game.dormant_enemies)
+
+
+def main():
+    print(f"{FRAMES} frames running right per run")
+    for level_width in LEVEL_WIDTHS:
+        everything, active, dormant = measure(level_width, level_width)
+        print(format_summary(f"{level_width} px, all active", everything) + f"  ({active} enemies live)")
+        windowed, active, dormant = measure(level_width, ACTIVE_MARGIN)
+        print(format_summary(f"{level_width} px, windowed", windowed) +
+              f"  ({active} live, {dormant} frozen)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Mario background: per-frame primitive drawing vs baked parallax layers"""
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from mario.background import ParallaxBackground
+
+FRAMES = 600
+
+
+def draw_immediate(surface, camera_x):
+    """The background as MarioGame.draw used to paint it every frame"""
+    for y in range(SCREEN_HEIGHT):
+        color_ratio = min(y / GROUND_Y, 1.0)
+        color = (int(135 - 35 * color_ratio), int(206 - 56 * color_ratio), int(250 - 30 * color_ratio))
+        pygame.draw.line(surface, color, (0, y), (SCREEN_WIDTH, y))
+    for cloud_x in range(0, SCREEN_WIDTH + 200, 300):
+        pygame.draw.ellipse(surface, (150, 150, 200), pygame.Rect(cloud_x - 40, 100, 100, 30))
+        pygame.draw.circle(surface, (255, 255, 255), (cloud_x - 20, 80), 30)
+        pygame.draw.circle(surface, (255, 255, 255), (cloud_x, 80), 35)
+        pygame.draw.circle(surface, (255, 255, 255), (cloud_x + 20, 80), 30)
+    for y in range(GROUND_Y, GROUND_Y + 20):
+        ratio = (y - GROUND_Y) / 20
+        pygame.draw.line(surface, (int(100 - 50 * ratio), int(150 - 50 * ratio), int(220 - 170 * ratio)),
+                         (0, y), (SCREEN_WIDTH, y))
+    pygame.draw.rect(surface, (80, 60, 40), (0, GROUND_Y + 20, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y - 20))
+    offset = int(camera_x * 0.2)
+    pygame.draw.polygon(surface, (100, 120, 100), [
+        (-offset, GROUND_Y - 100), (300 - offset, GROUND_Y - 150), (600 - offset, GROUND_Y - 80),
+        (900 - offset, GROUND_Y - 140), (SCREEN_WIDTH - offset, GROUND_Y - 100),
+        (SCREEN_WIDTH, GROUND_Y), (0, GROUND_Y)
+    ])
+
+
+def main():
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background = ParallaxBackground()
+    frame = [0]
+
+    def immediate():
+        frame[0] += 1
+        draw_immediate(screen, frame[0] * 4 % 2000)
+
+    def baked():
+        frame[0] += 1
+        background.draw(screen, frame[0] * 4 % 2000)
+
+    before = summarize(time_calls(immediate, FRAMES))
+    after = summarize(time_calls(baked, FRAMES))
+    print(format_summary("immediate background", before))
+    print(format_summary("baked parallax layers", after))
+    print(f"speedup {before['mean'] / max(after['mean'], 1e-9):.1f}x, bakes: {background.bake_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Mario collisions: brute-force platform scans vs the spatial-hash broadphase"""
+import random
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from mario.platforms import Platform
+from mario.enemies import Enemy
+from mario.spatial_hash import SpatialHash
+
+FRAMES = 100
+ENEMIES = 100
+PLATFORM_COUNTS = (100, 500, 1000, 2500, 5000)
+
+
+def build_level(platform_count, seed=1):
+    """Platforms spread over a level that widens with the platform count"""
+    rng = random.Random(seed)
+    level_width = platform_count * 40
+    platforms = [Platform(0, GROUND_Y, level_width, 50)]
+    for _ in range(platform_count - 1):
+        platforms.append(Platform(rng.randrange(level_width), rng.randrange(100, GROUND_Y - 20),
+                                  rng.randrange(60, 200), 20))
+    enemies = [Enemy(rng.randrange(level_width), rng.randrange(100, GROUND_Y - 40), rng.choice((-1, 1)))
+               for _ in range(ENEMIES)]
+    return level_width, platforms, enemies
+
+
+def step_enemies(enemies, level_width):
+    """Enemy movement without the off-screen despawn, so the population stays fixed"""
+    for enemy in enemies:
+        if not enemy.on_ground:
+            enemy.vel_y = min(enemy.vel_y + enemy.gravity, 15)
+        enemy.x += enemy.vel_x
+        enemy.y += enemy.vel_y
+        if enemy.x < 0 or enemy.x > level_width:
+            enemy.vel_x *= -1
+
+
+def land(enemy, candidates):
+    enemy.on_ground = False
+    for platform in candidates:
+        if enemy.get_rect().colliderect(platform.rect):
+            if enemy.vel_y > 0:
+                enemy.y = platform.rect.top - enemy.height
+                enemy.vel_y = 0
+                enemy.on_ground = True
+
+
+def main():
+    print(f"{ENEMIES} enemies, {FRAMES} frames per run")
+    for count in PLATFORM_COUNTS:
+        level_width, platforms, enemies = build_level(count)
+
+        def brute_force():
+            step_enemies(enemies, level_width)
+            for enemy in enemies:
+                land(enemy, platforms)
+
+        grid = SpatialHash()
+        for platform in platforms:
+            grid.insert(platform, platform.rect)
+
+        def broadphase():
+            step_enemies(enemies, level_width)
+            for enemy in enemies:
+                land(enemy, grid.query(enemy.get_rect()))
+
+        before = summarize(time_calls(brute_force, FRAMES))
+        level_width, platforms, enemies = build_level(count)
+        after = summarize(time_calls(broadphase, FRAMES))
+        print(format_summary(f"{count} platforms, scan", before))
+        print(format_summary(f"{count} platforms, grid", after))
+
+
+if __name__ == "__main__":
+    main()
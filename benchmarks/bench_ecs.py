@@ -0,0 +1,62 @@
+"""Mario pickups: per-object update loops vs the ECS systems"""
+import random
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from mario.items import Coin
+from mario.powerups import PowerUp
+from mario.player import MarioPlayer
+from mario.systems import (create_world, spawn_coin, spawn_powerup, AnimationSystem, PhysicsSystem,
+                           CollisionSystem, PickupSystem)
+
+FRAMES = 120
+COUNTS = (100, 1000, 10000)
+LEVEL_WIDTH = 20000
+
+
+def main():
+    print(f"{FRAMES} frames per run, half coins and half falling power-ups")
+    player = MarioPlayer(LEVEL_WIDTH // 2, GROUND_Y - 48)
+    for count in COUNTS:
+        rng = random.Random(1)
+        spots = [(rng.randrange(LEVEL_WIDTH), rng.randrange(100, GROUND_Y)) for _ in range(count)]
+        coins = [Coin(x, y) for x, y in spots[::2]]
+        powerups = [PowerUp(x, y - 10000) for x, y in spots[1::2]]  # Still falling at the end
+        collected = []
+
+        def per_object():
+            # MarioGame's pickup loops before the ECS
+            player_rect = player.get_rect()
+            for coin in coins[:]:
+                if player_rect.colliderect(coin.get_rect()):
+                    coins.remove(coin)
+                    collected.append(coin)
+                else:
+                    coin.update()
+            for powerup in powerups[:]:
+                powerup.update()
+                if player_rect.colliderect(powerup.get_rect()):
+                    powerups.remove(powerup)
+                    collected.append(powerup)
+
+        world = create_world()
+        for x, y in spots[::2]:
+            spawn_coin(world, x, y)
+        for x, y in spots[1::2]:
+            spawn_powerup(world, x, y - 10000)
+        world.add_system(AnimationSystem())
+        world.add_system(PhysicsSystem())
+        collision = world.add_system(CollisionSystem(player))
+        world.add_system(PickupSystem(collision, lambda kind, x, y: collected.append(kind)))
+
+        before = summarize(time_calls(per_object, FRAMES))
+        after = summarize(time_calls(world.update, FRAMES))
+        print(format_summary(f"{count} pickups, objects", before))
+        print(format_summary(f"{count} pickups, systems", after))
+
+
+if __name__ == "__main__":
+    main()
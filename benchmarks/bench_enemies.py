@@ -0,0 +1,66 @@
+"""Mario enemies: per-object updates vs the NumPy EnemyStore"""
+import random
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from mario.platforms import Platform
+from mario.enemies import Enemy
+from mario.enemy_store import EnemyStore
+from mario.spatial_hash import SpatialHash
+
+FRAMES = 120
+ENEMY_COUNTS = (100, 1000, 5000, 10000)
+LEVEL_WIDTH = 2000
+
+
+def build_level(enemy_count, seed=1):
+    rng = random.Random(seed)
+    platforms = [Platform(0, GROUND_Y, LEVEL_WIDTH, 50)]
+    for _ in range(40):
+        platforms.append(Platform(rng.randrange(LEVEL_WIDTH), rng.randrange(150, GROUND_Y - 20),
+                                  rng.randrange(60, 200), 20))
+    enemies = [Enemy(rng.randrange(LEVEL_WIDTH), rng.randrange(100, GROUND_Y - 40), rng.choice((-1, 1)),
+                     rng.choice(("goomba", "koopa", "flying"))) for _ in range(enemy_count)]
+    return platforms, enemies
+
+
+def main():
+    print(f"{FRAMES} frames per run")
+    for count in ENEMY_COUNTS:
+        platforms, enemies = build_level(count)
+        grid = SpatialHash()
+        for platform in platforms:
+            grid.insert(platform, platform.rect)
+
+        def per_object():
+            # MarioGame's enemy loop before the store
+            for enemy in enemies[:]:
+                if not enemy.update(LEVEL_WIDTH):
+                    enemies.remove(enemy)
+                    continue
+                right_wall = LEVEL_WIDTH - 100 if enemy.enemy_type == "flying" else LEVEL_WIDTH
+                if enemy.x < 0 or enemy.x > right_wall:
+                    enemy.vel_x *= -1
+                enemy.on_ground = False
+                for platform in grid.query(enemy.get_rect()):
+                    if enemy.get_rect().colliderect(platform.rect) and enemy.vel_y > 0:
+                        enemy.y = platform.rect.top - enemy.height
+                        enemy.vel_y = 0
+                        enemy.on_ground = True
+
+        platforms, fresh = build_level(count)
+        store = EnemyStore()
+        store.extend(fresh)
+        store.set_platforms(platforms)
+
+        before = summarize(time_calls(per_object, FRAMES))
+        after = summarize(time_calls(lambda: store.update(LEVEL_WIDTH), FRAMES))
+        print(format_summary(f"{count} enemies, objects", before))
+        print(format_summary(f"{count} enemies, store", after))
+
+
+if __name__ == "__main__":
+    main()
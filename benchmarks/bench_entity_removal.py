@@ -0,0 +1,51 @@
+"""Removing entities mid-frame: list copy + list.remove vs World.destroy"""
+import random
+
+import numpy as np
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+init_headless()
+
+from mario.items import Coin
+from mario.ecs import World
+
+FRAMES = 50
+COUNTS = (1000, 10000, 50000)
+REMOVED_PER_FRAME = 100
+POSITION = (("x", np.float64), ("y", np.float64))
+
+
+def main():
+    print(f"{REMOVED_PER_FRAME} removals and respawns per frame over {FRAMES} frames")
+    for count in COUNTS:
+        rng = random.Random(1)
+        coins = [Coin(rng.randrange(100000), 300) for _ in range(count)]
+
+        def with_list():
+            picked = set(id(coins[i]) for i in rng.sample(range(len(coins)), REMOVED_PER_FRAME))
+            for coin in coins[:]:
+                if id(coin) in picked:
+                    coins.remove(coin)
+            coins.extend(Coin(rng.randrange(100000), 300) for _ in range(REMOVED_PER_FRAME))
+
+        world = World({"position": POSITION})
+        world.create_many(count, position={"x": np.array([rng.randrange(100000) for _ in range(count)]),
+                                           "y": 300})
+
+        def with_world():
+            slots, _ = world.query("position")
+            for slot in rng.sample(slots.tolist(), REMOVED_PER_FRAME):
+                world.destroy(world.entity(slot))
+            world.flush()
+            world.create_many(REMOVED_PER_FRAME, position={
+                "x": np.array([rng.randrange(100000) for _ in range(REMOVED_PER_FRAME)]), "y": 300})
+
+        before = summarize(time_calls(with_list, FRAMES))
+        after = summarize(time_calls(with_world, FRAMES))
+        print(format_summary(f"{count} coins, list", before))
+        print(format_summary(f"{count} coins, world", after))
+
+
+if __name__ == "__main__":
+    main()
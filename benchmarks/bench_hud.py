@@ -0,0 +1,52 @@
+"""Fighting HUD: per-frame font loading vs the shared text and glyph cache"""
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from utils.text_cache import TextRenderer
+
+FRAMES = 600
+
+
+def draw_immediate(surface, health, energy):
+    """One player's HUD as GameManager.draw used to render it every frame"""
+    font_small = pygame.font.Font(None, 32)
+    hud_bg = pygame.Surface((300, 100))
+    hud_bg.set_alpha(200)
+    hud_bg.fill((0, 0, 0))
+    surface.blit(hud_bg, (10, 10))
+    surface.blit(font_small.render("Kyo", True, (100, 200, 255)), (20, 20))
+    surface.blit(font_small.render(f"HP: {health}", True, (0, 255, 0)), (20, 50))
+    surface.blit(font_small.render(f"EN: {energy}", True, (100, 150, 255)), (20, 80))
+
+
+def draw_cached(text, surface, health, energy):
+    surface.blit(text.panel((300, 100)), (10, 10))
+    text.draw(surface, "Kyo", 32, (100, 200, 255), (20, 20))
+    text.draw_field(surface, "HP: ", health, 32, (0, 255, 0), (20, 50))
+    text.draw_field(surface, "EN: ", energy, 32, (100, 150, 255), (20, 80))
+
+
+def main():
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    text = TextRenderer()
+    frame = [0]
+
+    def immediate():
+        frame[0] += 1
+        draw_immediate(screen, 100 - frame[0] % 100, frame[0] % 100)
+
+    def cached():
+        frame[0] += 1
+        draw_cached(text, screen, 100 - frame[0] % 100, frame[0] % 100)
+
+    before = summarize(time_calls(immediate, FRAMES))
+    after = summarize(time_calls(cached, FRAMES))
+    print(format_summary("font per frame", before))
+    print(format_summary("text + glyph cache", after))
+    print(f"speedup {before['mean'] / max(after['mean'], 1e-9):.1f}x, cache: {text.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
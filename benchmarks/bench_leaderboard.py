@@ -0,0 +1,68 @@
+"""Leaderboard queries as the table grows, against a linear scan of every record"""
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import time_calls, summarize, format_summary
+
+from utils.leaderboard import Leaderboard
+from utils.score_manager import HIGH_SCORES
+
+SIZES = (10_000, 100_000, 1_000_000)
+PLAYERS = 50_000
+MAX_SCORE = 50_000
+DAYS = 30
+CALLS = 200
+
+
+def linear_rank(records, score):
+    """get_rank as it was, over every record instead of the top ten"""
+    for i, entry in enumerate(records):
+        if score > entry["score"]:
+            return i + 1
+    return len(records) + 1
+
+
+def main():
+    rng = random.Random(0)
+    now = time.time()
+    with tempfile.TemporaryDirectory() as directory:
+        leaderboard = Leaderboard(Path(directory) / "leaderboard.db", cabinet="bench")
+        records = []
+        for size in SIZES:
+            start = time.perf_counter()
+            while len(records) < size:
+                player = f"player{rng.randrange(PLAYERS)}"
+                score = rng.randrange(MAX_SCORE // 50) * 50
+                leaderboard.submit("mario", player, score, now - rng.random() * DAYS * 86400)
+                records.append({"name": player, "score": score})
+            leaderboard.flush()
+            print(f"{size:,} records ({time.perf_counter() - start:.1f} s to insert, "
+                  f"{leaderboard.errors} errors)")
+            records.sort(key=lambda x: x["score"], reverse=True)
+
+            probes = [rng.randrange(MAX_SCORE) for _ in range(CALLS)]
+            for score in probes[:20]:
+                assert leaderboard.rank("mario", score) == linear_rank(records, score)
+            probe = iter(probes * 10)
+            print(format_summary("  linear scan get_rank", summarize(time_calls(
+                lambda: linear_rank(records, next(probe)), 20))))
+            for period in ("all", "week", "day"):
+                print(format_summary(f"  rank, {period}", summarize(time_calls(
+                    lambda: leaderboard.rank("mario", next(probe), period), CALLS))))
+            print(format_summary(f"  top {HIGH_SCORES}", summarize(time_calls(
+                lambda: leaderboard.top("mario", HIGH_SCORES), CALLS))))
+            print(format_summary(f"  top {HIGH_SCORES}, day", summarize(time_calls(
+                lambda: leaderboard.top("mario", HIGH_SCORES, "day"), CALLS))))
+            players = iter([f"player{rng.randrange(PLAYERS)}" for _ in range(CALLS)])
+            print(format_summary("  around me, 2 each side", summarize(time_calls(
+                lambda: leaderboard.around("mario", next(players)), CALLS))))
+            print(format_summary("  submit", summarize(time_calls(
+                lambda: leaderboard.submit("bench", "player", rng.randrange(MAX_SCORE)), CALLS))))
+            leaderboard.flush()
+        leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
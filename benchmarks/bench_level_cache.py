@@ -0,0 +1,59 @@
+"""Starting a level: building objects from the JSON source vs mapping the compiled cache"""
+import json
+import os
+import shutil
+import tempfile
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from mario.game import MarioGame, LEVELS_DIR
+from mario.platforms import Platform
+from mario.enemies import Enemy
+from mario.items import Coin
+from mario.powerups import PowerUp
+from mario.checkpoint import Checkpoint
+from mario.level_format import load_json, compile_level, open_level, LevelFile
+from benchmarks.bench_activation import wide_level
+
+LEVEL_WIDTHS = (2000, 200000, 1000000)
+CALLS = 20
+
+
+def build_objects(source):
+    """One object per platform and entity, the way create_level used to build a level"""
+    level = load_json(source)
+    return ([Platform(p["x"], p["y"], p["width"], p["height"], p.get("type", "normal")) for p in level["platforms"]],
+            [Coin(c["x"], c["y"]) for c in level.get("coins", [])],
+            [PowerUp(p["x"], p["y"], p.get("type", "mushroom")) for p in level.get("powerups", [])],
+            [Enemy(e["x"], e["y"], e.get("direction", 1), e.get("type", "goomba")) for e in level["enemies"]],
+            [Checkpoint(c["x"], c["y"]) for c in level.get("checkpoints", [])])
+
+
+def report(label, fn, calls=CALLS):
+    print(format_summary(label, summarize(time_calls(fn, calls))))
+
+
+def main():
+    game = MarioGame()
+    with tempfile.TemporaryDirectory() as directory:
+        for level_width in LEVEL_WIDTHS:
+            if level_width == 2000:
+                source = os.path.join(directory, "level1.json")
+                shutil.copy(os.path.join(LEVELS_DIR, "level1.json"), source)
+            else:
+                source = os.path.join(directory, f"wide{level_width}.json")
+                with open(source, "w") as f:
+                    json.dump(wide_level(level_width), f)
+            print(f"{level_width} px ({os.path.getsize(source) // 1024} KiB source)")
+            calls = CALLS if level_width < 1000000 else 5
+            report("  every object from JSON", lambda: build_objects(source), calls)
+            report("  compile JSON + stream", lambda: game.load_level(LevelFile(compile_level(load_json(source)))), calls)
+            open_level(source).close()  # Warm the cache
+            report("  cached + stream", lambda: game.load_level(open_level(source)), calls)
+    report("MarioGame() restart", MarioGame)
+
+
+if __name__ == "__main__":
+    main()
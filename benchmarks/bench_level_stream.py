@@ -0,0 +1,69 @@
+"""Level loading: instantiating a whole level vs streaming chunks from the compiled file"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.headless import KeyState
+from mario.game import MarioGame
+from mario.platforms import Platform
+from mario.enemies import Enemy
+from mario.level_format import compile_level, decompile_level, LevelFile
+from benchmarks.bench_activation import wide_level
+
+LEVEL_WIDTHS = (2000, 20000, 200000, 1000000)
+FRAMES = 300
+
+
+def load_everything(path):
+    """Every platform and enemy as objects, like the hard-coded level used to build"""
+    level = decompile_level(LevelFile(path))
+    platforms = [Platform(p["x"], p["y"], p["width"], p["height"], p["type"]) for p in level["platforms"]]
+    enemies = [Enemy(e["x"], e["y"], e["direction"], e["type"]) for e in level["enemies"]]
+    return platforms, enemies, level
+
+
+def measure_load(load):
+    """Seconds for one call, and peak traced bytes of another (tracing slows it down)"""
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    game = MarioGame()
+    keys = KeyState({pygame.K_RIGHT})
+    with tempfile.TemporaryDirectory() as directory:
+        for level_width in LEVEL_WIDTHS:
+            path = os.path.join(directory, f"wide{level_width}.mlvl")
+            with open(path, "wb") as f:
+                f.write(compile_level(wide_level(level_width)))
+
+            eager_time, eager_peak = measure_load(lambda: load_everything(path))
+            stream_time, stream_peak = measure_load(lambda: game.load_level(LevelFile(path)))
+            print(f"{level_width:>8} px ({os.path.getsize(path) // 1024} KiB file): "
+                  f"all at once {eager_time * 1000:8.2f} ms {eager_peak / 1024:8.0f} KiB peak, "
+                  f"streamed {stream_time * 1000:6.2f} ms {stream_peak / 1024:6.0f} KiB peak")
+
+            def frame():
+                game.player.invincible_timer = 10  # Keep running through enemies
+                game.handle_input(keys)
+                game.update()
+            stats = summarize(time_calls(frame, FRAMES))
+            stream = game.level_stream
+            print(format_summary(f"{level_width} px, update", stats) +
+                  f"  ({len(stream.loaded)} chunks loaded, {stream.load_count} loads, "
+                  f"{stream.unload_count} unloads)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Streamed music: render cost per block, and buffer memory while playing in real time"""
+import time
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.music import get_music_player, MusicSynth, TRACKS
+
+STREAM_SECONDS = 3
+FRAME_SECONDS = 1 / 60
+SONG_MINUTES = 3
+
+
+def main():
+    music = get_music_player()
+    block_seconds = music.block_samples / music.sample_rate
+    for name, track in TRACKS.items():
+        synth = MusicSynth(track, music.sample_rate)
+        for layer in track.layers:
+            synth.layer_on[layer.name] = True
+        stats = summarize(time_calls(lambda: synth.render(music.block_samples), 100))
+        print(format_summary(f"{name}, render block", stats) +
+              f"  ({block_seconds * 1000:.0f} ms of audio, {stats['mean'] / 1000 / block_seconds:.1%} of real time)")
+
+    for name in TRACKS:
+        music.play(name)
+        peak = 0
+        frames = int(STREAM_SECONDS / FRAME_SECONDS)
+        samples = []
+        for frame in range(frames):
+            if frame == frames // 2:
+                # What the games do as their state changes
+                music.set_tempo(1.2)
+                music.set_layers({layer.name: True for layer in TRACKS[name].layers})
+            start = time.perf_counter()
+            music.update()
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed * 1000.0)
+            peak = max(peak, music.get_stats()["buffered_bytes"])
+            time.sleep(max(0.0, FRAME_SECONDS - elapsed))
+        stats = music.get_stats()
+        music.stop()
+        print(format_summary(f"{name}, update() per frame", summarize(samples)) +
+              f"  ({stats['blocks_fed']} blocks, {stats['underruns']} underruns, "
+              f"peak {peak / 1024:.0f} KiB buffered)")
+
+    song = SONG_MINUTES * 60 * music.sample_rate * music.channels * 2
+    print(f"A {SONG_MINUTES} minute track as one Sound would be {song / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Particles: Particle objects vs the pooled NumPy ParticleSystem"""
+import random
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from utils.particle import Particle, ParticleSystem
+
+FRAMES = 120
+BURST = 8  # Particles per hit, as in KOFGame
+PARTICLE_COUNTS = (1000, 10000, 30000)
+
+
+def main():
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{FRAMES} frames per run, bursts of {BURST} keep the population steady")
+    for count in PARTICLE_COUNTS:
+        # Emitting count / 20 per frame with a 20 frame lifetime keeps ~count alive
+        bursts = max(1, count // 20 // BURST)
+        particles = []
+
+        def objects():
+            for _ in range(bursts):
+                x, y = random.randrange(SCREEN_WIDTH), random.randrange(SCREEN_HEIGHT)
+                for _ in range(BURST):
+                    angle = random.uniform(0, 360)
+                    speed = random.uniform(2, 5)
+                    vel_x = speed * pygame.math.Vector2(1, 0).rotate(angle).x
+                    vel_y = speed * pygame.math.Vector2(1, 0).rotate(angle).y
+                    particles.append(Particle(x, y, vel_x, vel_y, (255, 100, 0), 20))
+            for particle in particles[:]:
+                particle.update()
+                if particle.lifetime > 0:
+                    particle.draw(screen)
+                else:
+                    particles.remove(particle)
+
+        system = ParticleSystem(capacity=count * 2, seed=1)
+
+        def pooled():
+            for _ in range(bursts):
+                system.emit(random.randrange(SCREEN_WIDTH), random.randrange(SCREEN_HEIGHT),
+                            BURST, (255, 100, 0), 20)
+            system.update()
+            system.draw(screen)
+
+        before = summarize(time_calls(objects, FRAMES))
+        after = summarize(time_calls(pooled, FRAMES))
+        print(format_summary(f"~{count} live, objects", before))
+        print(format_summary(f"~{count} live, pooled", after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Score saving on the game thread: rewriting the JSON file vs queuing to the leaderboard writer"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import time_calls, summarize, format_summary
+
+from utils.leaderboard import Leaderboard
+from utils.score_manager import top_scores
+
+CALLS = 500
+
+
+def rewrite_file(path, high_scores, score):
+    """What save_score used to do on every call"""
+    high_scores.append({"name": "Player", "score": score})
+    high_scores[:] = top_scores(high_scores)
+    with open(path, 'w') as f:
+        json.dump(high_scores, f, indent=2)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "old_scores.json")
+        high_scores = []
+        scores = iter(range(10 ** 9))
+        print(format_summary("rewrite JSON", summarize(time_calls(
+            lambda: rewrite_file(path, high_scores, next(scores)), CALLS))))
+
+        leaderboard = Leaderboard(Path(directory) / "leaderboard.db", cabinet="bench")
+        print(format_summary("Leaderboard.submit", summarize(time_calls(
+            lambda: leaderboard.submit("mario", "Player", next(scores)), CALLS))))
+        start = time.perf_counter()
+        leaderboard.flush()
+        print(f"  writer caught up {(time.perf_counter() - start) * 1000:.1f} ms later, "
+              f"{leaderboard.written} written, {leaderboard.errors} errors")
+        leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Sound start-up: synthesising every effect vs the cached, process-wide sound bank"""
+import tempfile
+
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.sound_manager import SoundBank, SoundManager, synthesize, EFFECTS, SAMPLE_RATE
+from mario.game import MarioGame
+from kof.game import KOFGame
+
+CALLS = 50
+
+
+def main():
+    pygame.display.set_mode((800, 600))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def cold():
+            bank = SoundBank(cache_dir=tempfile.mkdtemp(dir=cache_dir))
+            assert not bank.from_cache
+
+        def warm():
+            bank = SoundBank(cache_dir=cache_dir)
+            assert bank.from_cache
+
+        SoundBank(cache_dir=cache_dir)
+        for name, fn in (("synthesise every effect", lambda: synthesize(EFFECTS, SAMPLE_RATE)),
+                         ("SoundBank, cold cache", cold),
+                         ("SoundBank, warm cache", warm),
+                         ("SoundManager(), shared", SoundManager),
+                         ("MarioGame()", MarioGame),
+                         ("KOFGame()", KOFGame)):
+            print(format_summary(name, summarize(time_calls(fn, CALLS))))
+
+
+if __name__ == "__main__":
+    main()
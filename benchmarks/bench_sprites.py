@@ -0,0 +1,57 @@
+"""Mario sprites: primitive drawing vs batched atlas blits for a crowded screen"""
+import random
+from benchmarks.common import init_headless, time_calls, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from mario.atlas import get_mario_atlas
+from mario.enemies import Enemy
+from mario.items import Coin
+from mario.powerups import PowerUp
+
+FRAMES = 200
+ENTITY_COUNT = 600
+
+
+def main():
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    random.seed(1)
+    entities = []
+    for _ in range(ENTITY_COUNT):
+        x = random.randrange(0, SCREEN_WIDTH - 40)
+        y = random.randrange(40, GROUND_Y - 40)
+        kind = random.choice(["goomba", "koopa", "flying", "coin", "star", "mushroom"])
+        if kind in ("goomba", "koopa", "flying"):
+            entity = Enemy(x, y, random.choice([-1, 1]), kind)
+            entity.bob_offset = random.uniform(0, 360)
+        elif kind == "coin":
+            entity = Coin(x, y)
+        else:
+            entity = PowerUp(x, y, kind)
+        entity.bob = random.uniform(0, 360)
+        entities.append(entity)
+
+    atlas = get_mario_atlas()
+
+    def primitives():
+        for entity in entities:
+            entity.draw(screen)
+
+    def batched():
+        sprites = []
+        for entity in entities:
+            key, (x, y) = entity.get_sprite()
+            sprites.append(atlas.blit_args(key, x, y))
+        screen.blits(sprites, False)
+
+    before = summarize(time_calls(primitives, FRAMES))
+    after = summarize(time_calls(batched, FRAMES))
+    print(f"{ENTITY_COUNT} sprites per frame")
+    print(format_summary("primitive draw calls", before))
+    print(format_summary("atlas Surface.blits", after))
+    print(f"speedup {before['mean'] / max(after['mean'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
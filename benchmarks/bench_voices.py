@@ -0,0 +1,58 @@
+"""Busy-scene audio: unlimited Sound.play() vs the voice manager's channel budget"""
+import time
+
+from benchmarks.common import init_headless, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.sound_manager import get_sound_bank, VoiceManager
+
+FRAMES = 120
+FRAME_SECONDS = 1 / 60
+# Effects started every frame: a coin chain plus a flurry of hits and jumps
+BURST = ("coin",) * 5 + ("hit",) * 5 + ("jump",) * 2
+VICTORY_FRAME = 90
+
+
+def run(play):
+    """Play the burst each frame in real time.
+
+    Returns per-frame ms, voices started, peak busy channels and whether
+    the victory cue got a channel.
+    """
+    channels = [pygame.mixer.Channel(i) for i in range(pygame.mixer.get_num_channels())]
+    samples = []
+    started = 0
+    peak = 0
+    victory = False
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+        for name in BURST:
+            started += play(name) is not None
+        if frame == VICTORY_FRAME:
+            victory = play("victory") is not None
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed * 1000.0)
+        peak = max(peak, sum(channel.get_busy() for channel in channels))
+        time.sleep(max(0.0, FRAME_SECONDS - elapsed))
+    pygame.mixer.stop()
+    time.sleep(0.1)
+    return samples, started, peak, victory
+
+
+def main():
+    sounds = get_sound_bank().sounds
+    pygame.mixer.set_reserved(0)
+    samples, started, peak, victory = run(lambda name: sounds[name].play())
+    print(format_summary("Sound.play(), per frame", summarize(samples)) +
+          f"  ({started} voices, peak {peak} busy channels, victory {'played' if victory else 'DROPPED'})")
+
+    voices = VoiceManager(sounds)
+    samples, started, peak, victory = run(voices.play)
+    print(format_summary("VoiceManager, per frame", summarize(samples)) +
+          f"  ({started} voices, peak {peak} busy channels, victory {'played' if victory else 'DROPPED'})")
+    print(f"  {voices.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Shared helpers for the benchmark scripts"""
+import os
+import sys
+import time
+
+# Benchmarks run from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.headless import init_headless  # Shared with the benchmarks
+
+
+def time_calls(func, count):
+    """Call func count times and return each call's duration in milliseconds"""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(pct / 100.0 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    """Mean and tail percentiles of a list of timings"""
+    ordered = sorted(samples)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+    }
+
+
+def format_summary(name, stats):
+    return (f"{name:<28} mean {stats['mean']:7.3f} ms  p50 {stats['p50']:7.3f}  "
+            f"p95 {stats['p95']:7.3f}  p99 {stats['p99']:7.3f}")
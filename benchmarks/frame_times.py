@@ -0,0 +1,147 @@
+"""Per-state frame-time benchmark: times GameManager.update and draw separately.
+
+Usage (from the repository root):
+    python -m benchmarks.frame_times                   # run and compare to the baseline
+    python -m benchmarks.frame_times --save-baseline   # record a new baseline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.common import init_headless, summarize, format_summary
+
+pygame = init_headless()
+
+from utils.constants import *
+from utils.headless import ScriptedInput, mario_demo_script, kof_demo_script
+from game_manager import GameManager
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frame_times_baseline.json")
+# Statistics compared against the baseline
+COMPARED = ("mean", "p95")
+
+
+def enter_main_menu(manager):
+    manager.state = GAME_STATE_MAIN_MENU
+
+
+def enter_character_select(manager):
+    manager.state = GAME_STATE_CHARACTER_SELECT
+
+
+def enter_fight(manager):
+    manager.selected_char_p1, manager.selected_char_p2 = 0, 1
+    manager.start_kof_fight()
+
+
+def enter_mario(manager):
+    from mario.game import MarioGame
+    manager.mario_game = MarioGame()
+    manager.state = GAME_STATE_MARIO
+
+
+# name -> (state the scenario stays in, setup, scripted input)
+SCENARIOS = {
+    "main_menu": (GAME_STATE_MAIN_MENU, enter_main_menu,
+                  lambda: [(10, ()), (1, {pygame.K_DOWN}), (10, ()), (1, {pygame.K_UP})]),
+    "character_select": (GAME_STATE_CHARACTER_SELECT, enter_character_select,
+                         lambda: [(10, ()), (1, {pygame.K_d, pygame.K_RIGHT}),
+                                  (10, ()), (1, {pygame.K_a, pygame.K_LEFT})]),
+    "kof_fight": (GAME_STATE_FIGHTING, enter_fight, kof_demo_script),
+    "mario": (GAME_STATE_MARIO, enter_mario, mario_demo_script),
+}
+
+
+def run_scenario(manager, name, frames, warmup):
+    """Drive one state for warmup + frames frames; returns update/draw summaries"""
+    state, setup, script = SCENARIOS[name]
+    keys = ScriptedInput(script())
+    frame = [0]
+    manager.get_keys = lambda: keys.keys_for(frame[0])
+    setup(manager)
+
+    update_times = []
+    draw_times = []
+    for i in range(warmup + frames):
+        # Rounds that end (KOF knockout, Mario game over) restart in place
+        if manager.state != state or (state == GAME_STATE_MARIO and
+                                      (manager.mario_game.game_over or manager.mario_game.won)):
+            setup(manager)
+
+        start = time.perf_counter()
+        manager.update()
+        middle = time.perf_counter()
+        manager.draw()
+        end = time.perf_counter()
+        frame[0] += 1
+
+        if i >= warmup:
+            update_times.append((middle - start) * 1000.0)
+            draw_times.append((end - middle) * 1000.0)
+    return {"update": summarize(update_times), "draw": summarize(draw_times)}
+
+
+def compare(results, baseline, threshold, min_delta=0.05):
+    """List of regression messages for stats more than threshold slower than baseline.
+
+    Slowdowns under min_delta milliseconds are ignored as timer noise.
+    """
+    regressions = []
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            base = baseline.get(name, {}).get(phase)
+            if not base:
+                continue
+            for stat in COMPARED:
+                if (base[stat] > 0 and stats[stat] > base[stat] * (1.0 + threshold)
+                        and stats[stat] - base[stat] >= min_delta):
+                    regressions.append(f"{name} {phase} {stat}: {stats[stat]:.3f} ms vs "
+                                       f"{base[stat]:.3f} ms baseline (+{stats[stat] / base[stat] - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-state update/draw frame times")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--states", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fractional slowdown flagged as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    manager = GameManager()
+
+    results = {}
+    for name in args.states:
+        results[name] = run_scenario(manager, name, args.frames, args.warmup)
+        for phase in ("update", "draw"):
+            print(format_summary(f"{name} {phase}", results[name][phase]))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --save-baseline first")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    for message in regressions:
+        print("REGRESSION", message)
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,23 @@ from utils.constants import *
 from kof.game import KOFGame
 from mario.game import MarioGame
 from ui.menu import MenuManager
+from utils.dirty_rects import DirtyRectPresenter
+from utils.text_cache import get_text_renderer
+from utils.music import get_music_player
 
 
 class GameManager:
     """Central game manager"""
-    def __init__(self):
+    def __init__(self, dirty_rects=False):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Game Collection")
         
+        # Opt-in: present only changed screen areas instead of flipping
+        self.presenter = DirtyRectPresenter(self.screen) if dirty_rects else None
+        
         self.state = GAME_STATE_MAIN_MENU
         self.menu = MenuManager()
+        self.text = get_text_renderer()
         
         # Menu state
         self.selected_game = 0
@@ -28,18 +35,40 @@ class GameManager:
         
         # Mario state
         self.mario_game = None
+        
+        # State shown by the last draw; menus recompose fully after a switch
+        self.drawn_state = None
+        
+        # Input hook, replaced by scripted input in benchmarks
+        self.get_keys = pygame.key.get_pressed
+        
+        # Ticks left before menu keys are read again, so a held key repeats slowly
+        self.key_cooldown = 0
+        
+        # Positions before the last update, for render interpolation
+        self.previous_positions = []
+        
+        # Streamed background music, following the running game; the player
+        # (and the mixer behind it) is set up when a game first asks for music
+        self.music = None
+    
+    def debounce(self, ms):
+        """Ignore menu keys for the next ms worth of ticks, without blocking the loop"""
+        self.key_cooldown = max(1, round(ms * FPS / 1000))
     
     def handle_main_menu(self):
         """Handle main menu navigation"""
-        keys = pygame.key.get_pressed()
+        if self.key_cooldown:
+            return
+        keys = self.get_keys()
         
         # Game selection
         if keys[pygame.K_UP] and self.selected_game > 0:
             self.selected_game -= 1
-            pygame.time.wait(150)
+            self.debounce(150)
         if keys[pygame.K_DOWN] and self.selected_game < len(self.available_games) - 1:
             self.selected_game += 1
-            pygame.time.wait(150)
+            self.debounce(150)
         
         # Start selected game
         if keys[pygame.K_RETURN]:
@@ -48,32 +77,34 @@ class GameManager:
             elif self.selected_game == 1:  # Super Mario
                 self.mario_game = MarioGame()
                 self.state = GAME_STATE_MARIO
-            pygame.time.wait(200)
+            self.debounce(200)
     
     def handle_character_select(self):
         """Handle character selection"""
-        keys = pygame.key.get_pressed()
+        if self.key_cooldown:
+            return
+        keys = self.get_keys()
         
         # Player 1 selection
         if keys[pygame.K_a] and self.selected_char_p1 > 0:
             self.selected_char_p1 -= 1
-            pygame.time.wait(150)
+            self.debounce(150)
         if keys[pygame.K_d] and self.selected_char_p1 < len(self.available_chars) - 1:
             self.selected_char_p1 += 1
-            pygame.time.wait(150)
+            self.debounce(150)
         
         # Player 2 selection
         if keys[pygame.K_LEFT] and self.selected_char_p2 > 0:
             self.selected_char_p2 -= 1
-            pygame.time.wait(150)
+            self.debounce(150)
         if keys[pygame.K_RIGHT] and self.selected_char_p2 < len(self.available_chars) - 1:
             self.selected_char_p2 += 1
-            pygame.time.wait(150)
+            self.debounce(150)
         
         # Start game
         if keys[pygame.K_RETURN]:
             self.start_kof_fight()
-            pygame.time.wait(200)
+            self.debounce(200)
     
     def start_kof_fight(self):
         """Initialize KOF fight"""
@@ -85,7 +116,7 @@ class GameManager:
     
     def handle_fighting(self):
         """Handle KOF gameplay"""
-        keys = pygame.key.get_pressed()
+        keys = self.get_keys()
         
         self.kof_game.handle_input(keys)
         self.kof_game.update()
@@ -100,34 +131,53 @@ class GameManager:
     
     def handle_game_over(self):
         """Handle KOF game over"""
-        keys = pygame.key.get_pressed()
+        if self.key_cooldown:
+            return
+        keys = self.get_keys()
         if keys[pygame.K_RETURN]:
             self.state = GAME_STATE_CHARACTER_SELECT
-            pygame.time.wait(200)
+            self.debounce(200)
     
     def handle_mario(self):
         """Handle Mario gameplay"""
-        keys = pygame.key.get_pressed()
+        keys = self.get_keys()
         
         self.mario_game.handle_input(keys)
         self.mario_game.update()
+        if self.key_cooldown:
+            return
         
         # Return to menu
         if keys[pygame.K_ESCAPE]:
             self.state = GAME_STATE_MAIN_MENU
-            pygame.time.wait(200)
+            self.debounce(200)
         
         # Restart on game over or win
         if self.mario_game.game_over or self.mario_game.won:
             if keys[pygame.K_RETURN]:
                 self.mario_game = MarioGame()
-                pygame.time.wait(200)
+                self.debounce(200)
             elif keys[pygame.K_ESCAPE]:
                 self.state = GAME_STATE_MAIN_MENU
-                pygame.time.wait(200)
+                self.debounce(200)
+    
+    def interpolated_attributes(self):
+        """(object, attribute) pairs that move smoothly between ticks"""
+        if self.state == GAME_STATE_FIGHTING:
+            return [(player, name) for player in (self.kof_game.player1, self.kof_game.player2)
+                    for name in ("x", "y")]
+        if self.state == GAME_STATE_MARIO:
+            return [(self.mario_game.player, "x"), (self.mario_game.player, "y"),
+                    (self.mario_game, "camera_x")]
+        return []
     
     def update(self):
         """Update game state"""
+        self.previous_positions = [(obj, name, getattr(obj, name))
+                                   for obj, name in self.interpolated_attributes()]
+        if self.key_cooldown:
+            self.key_cooldown -= 1
+        
         if self.state == GAME_STATE_MAIN_MENU:
             self.handle_main_menu()
         elif self.state == GAME_STATE_CHARACTER_SELECT:
@@ -138,53 +188,84 @@ class GameManager:
             self.handle_game_over()
         elif self.state == GAME_STATE_MARIO:
             self.handle_mario()
+        
+        self.update_music()
+    
+    def update_music(self):
+        """Play the running game's track as its state asks, and keep the stream fed"""
+        game = {GAME_STATE_FIGHTING: self.kof_game, GAME_STATE_MARIO: self.mario_game}.get(self.state)
+        music_state = game.music_state() if game is not None else None
+        if music_state is None:
+            if self.music is None:
+                return
+            if self.music.track_name is not None:
+                self.music.stop()
+        else:
+            if self.music is None:
+                self.music = get_music_player()
+            track, tempo, layers = music_state
+            self.music.play(track)
+            self.music.set_tempo(tempo)
+            self.music.set_layers(layers)
+        self.music.update()
+    
+    def draw_fighter_hud(self, player, hud_x, name_color):
+        """Draw a fighter's name, health and energy panel"""
+        self.kof_game.stage.mark(self.screen.blit(self.text.panel((300, 100)), (hud_x, 10)))
+        health_color = (0, 255, 0) if player.health > 30 else (255, 100, 0)
+        self.text.draw(self.screen, player.name, 32, name_color, (hud_x + 10, 20))
+        self.text.draw_field(self.screen, "HP: ", player.health, 32, health_color, (hud_x + 10, 50))
+        self.text.draw_field(self.screen, "EN: ", player.energy, 32, (100, 150, 255), (hud_x + 10, 80))
     
-    def draw(self):
-        """Draw current game state"""
+    def draw(self, alpha=1.0):
+        """Draw current game state, alpha of the way from the previous tick to the latest"""
+        # Drawn values only; the simulation keeps its own
+        view = {}
+        if alpha < 1.0:
+            current = set(self.interpolated_attributes())
+            for obj, name, previous in self.previous_positions:
+                if (obj, name) in current:
+                    view[obj, name] = previous + (getattr(obj, name) - previous) * alpha
+        self.draw_frame(view)
+    
+    def draw_offset(self, obj, view):
+        """(dx, dy) from where obj is to where the view draws it"""
+        return (view.get((obj, "x"), obj.x) - obj.x, view.get((obj, "y"), obj.y) - obj.y)
+    
+    def draw_frame(self, view=None):
+        """Draw current game state, with positions from view where it has them"""
+        view = view or {}
+        state_changed = self.state != self.drawn_state
+        if state_changed:
+            self.menu.invalidate()
+            self.drawn_state = self.state
+        
+        # Rects changed by this frame; None means the whole screen
+        dirty = None
         if self.state == GAME_STATE_MAIN_MENU:
-            self.menu.draw_main_menu(self.screen, self.selected_game, self.available_games)
+            dirty = self.menu.draw_main_menu(self.screen, self.selected_game, self.available_games)
         elif self.state == GAME_STATE_CHARACTER_SELECT:
-            self.menu.draw_character_select(self.screen, self.selected_char_p1, 
-                                           self.selected_char_p2, self.available_chars)
+            dirty = self.menu.draw_character_select(self.screen, self.selected_char_p1, 
+                                                   self.selected_char_p2, self.available_chars)
         elif self.state == GAME_STATE_FIGHTING:
-            self.kof_game.draw(self.screen)
+            if state_changed:
+                self.kof_game.stage.invalidate()
+            self.kof_game.draw(self.screen, {player: self.draw_offset(player, view)
+                                             for player in (self.kof_game.player1, self.kof_game.player2)})
             # Draw HUD
-            font_small = pygame.font.Font(None, 32)
-            hud_bg = pygame.Surface((300, 100))
-            hud_bg.set_alpha(200)
-            hud_bg.fill((0, 0, 0))
-            self.screen.blit(hud_bg, (10, 10))
-            
-            p1_name = font_small.render(f"{self.kof_game.player1.name}", True, (100, 200, 255))
-            self.screen.blit(p1_name, (20, 20))
-            
-            p1_health = font_small.render(f"HP: {int(self.kof_game.player1.health)}", True, (0, 255, 0) if self.kof_game.player1.health > 30 else (255, 100, 0))
-            self.screen.blit(p1_health, (20, 50))
-            
-            p1_energy = font_small.render(f"EN: {int(self.kof_game.player1.energy)}", True, (100, 150, 255))
-            self.screen.blit(p1_energy, (20, 80))
-            
-            p2_hud_x = SCREEN_WIDTH - 170
-            hud_bg2 = pygame.Surface((300, 100))
-            hud_bg2.set_alpha(200)
-            hud_bg2.fill((0, 0, 0))
-            self.screen.blit(hud_bg2, (p2_hud_x, 10))
-            
-            p2_name = font_small.render(f"{self.kof_game.player2.name}", True, (255, 100, 100))
-            self.screen.blit(p2_name, (p2_hud_x + 10, 20))
-            
-            p2_health = font_small.render(f"HP: {int(self.kof_game.player2.health)}", True, (0, 255, 0) if self.kof_game.player2.health > 30 else (255, 100, 0))
-            self.screen.blit(p2_health, (p2_hud_x + 10, 50))
-            
-            p2_energy = font_small.render(f"EN: {int(self.kof_game.player2.energy)}", True, (100, 150, 255))
-            self.screen.blit(p2_energy, (p2_hud_x + 10, 80))
+            self.draw_fighter_hud(self.kof_game.player1, 10, (100, 200, 255))
+            self.draw_fighter_hud(self.kof_game.player2, SCREEN_WIDTH - 170, (255, 100, 100))
+            dirty = self.kof_game.stage.dirty_rects
         elif self.state == GAME_STATE_GAME_OVER:
-            self.menu.draw_game_over(self.screen, self.game_over_winner)
+            dirty = self.menu.draw_game_over(self.screen, self.game_over_winner)
         elif self.state == GAME_STATE_MARIO:
-            self.mario_game.draw(self.screen)
+            self.mario_game.draw(self.screen, view.get((self.mario_game, "camera_x")),
+                                 self.draw_offset(self.mario_game.player, view))
             # Instructions
-            font_small = pygame.font.Font(None, 24)
-            info = font_small.render("ESC: Menu | ENTER: Restart (after game over)", True, WHITE)
-            self.screen.blit(info, (10, SCREEN_HEIGHT - 30))
+            self.text.draw(self.screen, "ESC: Menu | ENTER: Restart (after game over)", 24, WHITE,
+                           (10, SCREEN_HEIGHT - 30))
         
-        pygame.display.flip()
+        if self.presenter is None:
+            pygame.display.flip()
+        else:
+            self.presenter.present(None if state_changed else dirty)
@@ -1,5 +1,6 @@
 """King of Fighters game module"""
 from .character import Character
 from .game import KOFGame
+from .pose_cache import PoseCache
 
-__all__ = ['Character', 'KOFGame']
+__all__ = ['Character', 'KOFGame', 'PoseCache']
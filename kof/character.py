@@ -1,5 +1,13 @@
 import pygame
 from utils.constants import *
+from .pose_cache import get_pose_cache
+
+
+# Rendered pose frames: size and where (cx, cy) sits inside them
+POSE_SIZE = (112, 124)
+POSE_ORIGIN = (56, 28)
+# Distinct hit-flash tints
+FLASH_LEVELS = 5
 
 
 class Character:
@@ -37,6 +45,7 @@ class Character:
         # Animation
         self.anim_frame = 0
         self.anim_speed = 0.15
+        self.pose_cache = get_pose_cache()  # Shared rendered frames
         
         # Character-specific attributes
         self.character_type = name
@@ -178,6 +187,13 @@ class Character:
         """Get character bounding box"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_draw_rect(self, offset=(0, 0)):
+        """Screen area draw() can touch: status bars, auras, limbs and ground shadow"""
+        cx = int(self.x + offset[0] + self.width // 2)
+        top = int(self.y + offset[1]) - 78
+        bottom = max(int(self.y + offset[1]) + 93, GROUND_Y + 13)
+        return pygame.Rect(cx - 77, top, 154, bottom - top)
+    
     def get_attack_rect(self):
         """Get attack hitbox"""
         if self.current_attack is None:
@@ -215,40 +231,115 @@ class Character:
         else:  # Ryo
             return (70, 130, 180)  # Steel blue
     
-    def draw(self, surface):
-        """Draw character with smooth cartoon style"""
-        # Get character color
-        if self.hit_cooldown > 0:
+    def _get_flash_color(self, flash_level, blocking):
+        """Body colour for a quantised hit-flash level and blocking state"""
+        if flash_level > 0:
             base_color = self._get_character_color()
             # Flash effect when hit
-            flash_intensity = (self.hit_cooldown / 10.0)
-            color = (
+            flash_intensity = flash_level / FLASH_LEVELS
+            return (
                 int(base_color[0] + (255 - base_color[0]) * flash_intensity),
                 int(base_color[1] * (1 - flash_intensity * 0.5)),
                 int(base_color[2] * (1 - flash_intensity * 0.5))
             )
-        elif self.is_blocking:
-            color = (100, 150, 255)  # Blue tint when blocking
-        else:
-            color = self._get_character_color()
+        elif blocking:
+            return (100, 150, 255)  # Blue tint when blocking
+        return self._get_character_color()
+    
+    def get_pose_key(self):
+        """Everything the body drawing depends on:
+        (character_type, leg pose, facing, blocking, flash level, attack type)"""
+        # Leg animation (slight sway when moving)
+        leg_offset = 0
+        if abs(self.vel_x) > 0.3:
+            leg_offset = int(3 * abs(pygame.time.get_ticks() % 600 - 300) / 300 - 3)
         
+        # Hit flash quantised so a handful of tints cover the whole fade
+        flash_level = -(-self.hit_cooldown * FLASH_LEVELS // 10) if self.hit_cooldown > 0 else 0
+        attack_type = self.current_attack[0] if self.current_attack else None
+        return (self.character_type, leg_offset, self.direction, self.is_blocking, flash_level, attack_type)
+    
+    def _render_pose(self, key):
+        """Rasterise the body for a pose key onto a transparent surface"""
+        image = pygame.Surface(POSE_SIZE, pygame.SRCALPHA)
+        self._draw_pose(image, POSE_ORIGIN[0], POSE_ORIGIN[1], key)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+    
+    def draw(self, surface, offset=(0, 0)):
+        """Draw character with smooth cartoon style, shifted by offset"""
         # Animation offset for idle bobbing
         bob = 0
         if self.on_ground and abs(self.vel_x) < 0.5:
             bob = int(2 * abs(pygame.time.get_ticks() % 1000 - 500) / 500 - 2)
         
         # Center positions
-        cx = self.x + self.width // 2
-        cy = self.y + bob
+        cx = self.x + offset[0] + self.width // 2
+        cy = self.y + offset[1] + bob
         
         # ===== SHADOW =====
         shadow_width = int(self.width * 1.3)
         shadow_height = 12
-        for i in range(shadow_height):
-            alpha_ratio = 1 - (i / shadow_height)
-            shadow_rect = pygame.Rect(cx - shadow_width // 2, GROUND_Y + i, shadow_width, 1)
-            pygame.draw.line(surface, (20, 20, 30), (cx - shadow_width // 2, GROUND_Y + i), 
-                           (cx + shadow_width // 2, GROUND_Y + i))
+        surface.fill((20, 20, 30), (int(cx) - shadow_width // 2, GROUND_Y,
+                                    shadow_width // 2 * 2 + 1, shadow_height))
+        
+        # ===== BODY (cached per pose) =====
+        key = self.get_pose_key()
+        image = self.pose_cache.get(key)
+        if image is None:
+            image = self._render_pose(key)
+            self.pose_cache.put(key, image)
+        surface.blit(image, (int(cx) - POSE_ORIGIN[0], int(cy) - POSE_ORIGIN[1]))
+        
+        # ===== STATUS BARS WITH POLISH =====
+        health_bar_width = 140
+        health_bar_height = 18
+        health_bar_x = cx - health_bar_width // 2
+        health_bar_y = cy - 70
+        
+        # Bar background with glow
+        pygame.draw.rect(surface, (0, 0, 0), (int(health_bar_x - 4), int(health_bar_y - 4), 
+                                            health_bar_width + 8, health_bar_height + 8))
+        pygame.draw.rect(surface, (30, 30, 40), (int(health_bar_x), int(health_bar_y), 
+                                               health_bar_width, health_bar_height))
+        
+        # Health bar
+        health_percent = self.health / self.max_health
+        health_color = GREEN if health_percent > 0.5 else YELLOW if health_percent > 0.25 else RED
+        health_fill_width = health_percent * health_bar_width
+        pygame.draw.rect(surface, health_color, (int(health_bar_x), int(health_bar_y), 
+                                               int(health_fill_width), health_bar_height))
+        
+        # Health bar shine
+        if health_fill_width > 4:
+            pygame.draw.line(surface, WHITE, (int(health_bar_x + 2), int(health_bar_y + 2)), 
+                            (int(health_bar_x + health_fill_width - 2), int(health_bar_y + 2)), 1)
+        
+        # Health bar border
+        pygame.draw.rect(surface, WHITE, (int(health_bar_x), int(health_bar_y), 
+                                        health_bar_width, health_bar_height), 2)
+        
+        # Energy bar
+        energy_bar_y = health_bar_y + 22
+        pygame.draw.rect(surface, (30, 30, 60), (int(health_bar_x), int(energy_bar_y), 
+                                               health_bar_width, 10))
+        energy_percent = self.energy / self.max_energy
+        pygame.draw.rect(surface, (100, 200, 255), (int(health_bar_x), int(energy_bar_y), 
+                                        int(health_bar_width * energy_percent), 10))
+        
+        # Energy bar shine
+        if energy_percent * health_bar_width > 2:
+            pygame.draw.line(surface, WHITE, (int(health_bar_x + 2), int(energy_bar_y + 2)), 
+                            (int(health_bar_x + health_bar_width * energy_percent - 2), int(energy_bar_y + 2)), 1)
+        
+        pygame.draw.rect(surface, (100, 200, 255), (int(health_bar_x), int(energy_bar_y), 
+                                        health_bar_width, 10), 2)
+    
+    def _draw_pose(self, surface, cx, cy, key):
+        """Draw head, limbs and auras centred on (cx, cy) for a pose key"""
+        character_type, leg_offset, direction, blocking, flash_level, attack_type = key
+        color = self._get_flash_color(flash_level, blocking)
         
         # ===== HEAD =====
         head_radius = 16
@@ -286,7 +377,7 @@ class Character:
                         (int(right_eye_x + 6), int(eye_y - 8)), 2)
         
         # Pupils looking toward opponent
-        pupil_offset = 3 if self.direction > 0 else -3
+        pupil_offset = 3 if direction > 0 else -3
         pygame.draw.circle(surface, BLACK, (int(left_eye_x + pupil_offset), int(eye_y)), 3)
         pygame.draw.circle(surface, BLACK, (int(right_eye_x + pupil_offset), int(eye_y)), 3)
         
@@ -316,7 +407,7 @@ class Character:
                                  mouth_width * 2 + 4, 6), 0, 3.14, 2)
         
         # ===== HAIR - Character Specific =====
-        if self.character_type == "Kyo":
+        if character_type == "Kyo":
             # Spiky blonde hair
             hair_color = (255, 220, 0)
             dark_hair = (200, 170, 0)
@@ -328,7 +419,7 @@ class Character:
                                (int(spike_x), int(spike_tip_y)), 3)
                 pygame.draw.line(surface, dark_hair, (int(spike_x), int(spike_base_y)), 
                                (int(spike_x), int(spike_tip_y)), 1)
-        elif self.character_type == "Iori":
+        elif character_type == "Iori":
             # Dark spiky/disheveled hair
             hair_color = (15, 15, 20)
             for i in range(-2, 3):
@@ -337,7 +428,7 @@ class Character:
                 spike_tip_y = spike_base_y - 13
                 pygame.draw.line(surface, hair_color, (int(spike_x), int(spike_base_y)), 
                                (int(spike_x), int(spike_tip_y)), 3)
-        elif self.character_type == "Mai":
+        elif character_type == "Mai":
             # Long flowing hair with bows
             hair_color = (100, 50, 100)
             pygame.draw.circle(surface, hair_color, (int(cx - 18), int(head_y + 5)), 8)
@@ -372,15 +463,15 @@ class Character:
         shoulder_y = cy + 28
         
         # Arm angle changes when attacking
-        arm_angle_left = -40 if self.current_attack and self.direction > 0 else 20
-        arm_angle_right = 40 if self.current_attack and self.direction < 0 else -20
+        arm_angle_left = -40 if attack_type and direction > 0 else 20
+        arm_angle_right = 40 if attack_type and direction < 0 else -20
         
         arm_color = color
         
         # Left arm
         left_shoulder_x = cx - torso_width // 2 - 3
-        left_elbow_x = left_shoulder_x - int(arm_length * 0.6 * (1 if self.direction > 0 else -1))
-        left_hand_x = left_shoulder_x - arm_length * (1 if self.direction > 0 else -1)
+        left_elbow_x = left_shoulder_x - int(arm_length * 0.6 * (1 if direction > 0 else -1))
+        left_hand_x = left_shoulder_x - arm_length * (1 if direction > 0 else -1)
         left_hand_y = shoulder_y + 8
         
         # Upper arm
@@ -394,8 +485,8 @@ class Character:
         
         # Right arm
         right_shoulder_x = cx + torso_width // 2 + 3
-        right_elbow_x = right_shoulder_x + int(arm_length * 0.6 * (1 if self.direction > 0 else -1))
-        right_hand_x = right_shoulder_x + arm_length * (1 if self.direction > 0 else -1)
+        right_elbow_x = right_shoulder_x + int(arm_length * 0.6 * (1 if direction > 0 else -1))
+        right_hand_x = right_shoulder_x + arm_length * (1 if direction > 0 else -1)
         right_hand_y = shoulder_y + 8
         
         # Upper arm
@@ -408,7 +499,7 @@ class Character:
         pygame.draw.circle(surface, arm_color, (int(right_hand_x), int(right_hand_y)), 4)
         
         # ===== ATTACK GLOW EFFECT =====
-        if self.current_attack:
+        if attack_type:
             glow_color = (255, 180, 0)
             pygame.draw.circle(surface, glow_color, (int(left_hand_x), int(left_hand_y)), 8, 2)
             pygame.draw.circle(surface, glow_color, (int(right_hand_x), int(right_hand_y)), 8, 2)
@@ -418,11 +509,6 @@ class Character:
         leg_height = 28
         leg_color = tuple(max(0, c - 60) for c in color)
         
-        # Leg animation (slight sway when moving)
-        leg_offset = 0
-        if abs(self.vel_x) > 0.3:
-            leg_offset = int(3 * abs(pygame.time.get_ticks() % 600 - 300) / 300 - 3)
-        
         # Left leg
         left_leg_x = cx - 6
         pygame.draw.rect(surface, leg_color, 
@@ -460,62 +546,16 @@ class Character:
         pygame.draw.line(surface, (60, 60, 80), (int(right_leg_x - leg_offset + 1), int(cy + 85)), 
                         (int(right_leg_x - leg_offset + shoe_width - 2), int(cy + 85)), 1)
         
-        # ===== STATUS BARS WITH POLISH =====
-        health_bar_width = 140
-        health_bar_height = 18
-        health_bar_x = cx - health_bar_width // 2
-        health_bar_y = cy - 70
-        
-        # Bar background with glow
-        pygame.draw.rect(surface, (0, 0, 0), (int(health_bar_x - 4), int(health_bar_y - 4), 
-                                            health_bar_width + 8, health_bar_height + 8))
-        pygame.draw.rect(surface, (30, 30, 40), (int(health_bar_x), int(health_bar_y), 
-                                               health_bar_width, health_bar_height))
-        
-        # Health bar
-        health_percent = self.health / self.max_health
-        health_color = GREEN if health_percent > 0.5 else YELLOW if health_percent > 0.25 else RED
-        health_fill_width = health_percent * health_bar_width
-        pygame.draw.rect(surface, health_color, (int(health_bar_x), int(health_bar_y), 
-                                               int(health_fill_width), health_bar_height))
-        
-        # Health bar shine
-        if health_fill_width > 4:
-            pygame.draw.line(surface, WHITE, (int(health_bar_x + 2), int(health_bar_y + 2)), 
-                            (int(health_bar_x + health_fill_width - 2), int(health_bar_y + 2)), 1)
-        
-        # Health bar border
-        pygame.draw.rect(surface, WHITE, (int(health_bar_x), int(health_bar_y), 
-                                        health_bar_width, health_bar_height), 2)
-        
-        # Energy bar
-        energy_bar_y = health_bar_y + 22
-        pygame.draw.rect(surface, (30, 30, 60), (int(health_bar_x), int(energy_bar_y), 
-                                               health_bar_width, 10))
-        energy_percent = self.energy / self.max_energy
-        pygame.draw.rect(surface, (100, 200, 255), (int(health_bar_x), int(energy_bar_y), 
-                                        int(health_bar_width * energy_percent), 10))
-        
-        # Energy bar shine
-        if energy_percent * health_bar_width > 2:
-            pygame.draw.line(surface, WHITE, (int(health_bar_x + 2), int(energy_bar_y + 2)), 
-                            (int(health_bar_x + health_bar_width * energy_percent - 2), int(energy_bar_y + 2)), 1)
-        
-        pygame.draw.rect(surface, (100, 200, 255), (int(health_bar_x), int(energy_bar_y), 
-                                        health_bar_width, 10), 2)
-        
         # ===== SPECIAL ATTACK AURA =====
-        if self.current_attack:
-            attack_type, _ = self.current_attack
-            if attack_type == "special":
-                # Dramatic multi-layer aura
-                aura_y = cy + 30
-                pygame.draw.circle(surface, (255, 200, 0), (int(cx), int(aura_y)), 32, 3)
-                pygame.draw.circle(surface, (255, 150, 0), (int(cx), int(aura_y)), 38, 1)
-                pygame.draw.circle(surface, (255, 100, 0), (int(cx), int(aura_y)), 26, 2)
+        if attack_type == "special":
+            # Dramatic multi-layer aura
+            aura_y = cy + 30
+            pygame.draw.circle(surface, (255, 200, 0), (int(cx), int(aura_y)), 32, 3)
+            pygame.draw.circle(surface, (255, 150, 0), (int(cx), int(aura_y)), 38, 1)
+            pygame.draw.circle(surface, (255, 100, 0), (int(cx), int(aura_y)), 26, 2)
         
         # ===== BLOCKING EFFECT =====
-        if self.is_blocking:
+        if blocking:
             block_aura_y = cy + 30
             pygame.draw.circle(surface, (100, 150, 255), (int(cx), int(block_aura_y)), 50, 2)
             pygame.draw.circle(surface, (150, 200, 255), (int(cx), int(block_aura_y)), 45, 1)
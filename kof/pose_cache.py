@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+
+class PoseCache:
+    """LRU cache of rendered fighter frames, bounded by a memory budget"""
+    def __init__(self, budget_bytes=8 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.frames = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def _size_of(image):
+        return image.get_pitch() * image.get_height()
+    
+    def get(self, key):
+        """Return the cached frame for key, or None on a miss"""
+        image = self.frames.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self.frames.move_to_end(key)
+        self.hits += 1
+        return image
+    
+    def put(self, key, image):
+        """Store a frame, evicting least recently used ones to stay within budget"""
+        if key in self.frames:
+            self.used_bytes -= self._size_of(self.frames.pop(key))
+        self.frames[key] = image
+        self.used_bytes += self._size_of(image)
+        while self.used_bytes > self.budget_bytes and len(self.frames) > 1:
+            _, evicted = self.frames.popitem(last=False)
+            self.used_bytes -= self._size_of(evicted)
+            self.evictions += 1
+    
+    def clear(self):
+        self.frames.clear()
+        self.used_bytes = 0
+    
+    def get_stats(self):
+        """Hit/miss counters and memory use, for sizing the budget"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.frames),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_pose_cache = None
+
+
+def get_pose_cache():
+    """Cache shared by every fighter in the process"""
+    global _pose_cache
+    if _pose_cache is None:
+        _pose_cache = PoseCache()
+    return _pose_cache
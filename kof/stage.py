@@ -0,0 +1,116 @@
+import pygame
+from utils.constants import *
+
+
+def paint_arena(surface):
+    """Paint the static fight arena (sky, scenery, back wall, floor, lighting)"""
+    width, height = surface.get_size()
+    
+    # Gradient sky background
+    for y in range(height):
+        color_ratio = y / height
+        r = int(50 + (100 - 50) * color_ratio)
+        g = int(70 + (120 - 70) * color_ratio)
+        b = int(120 + (180 - 120) * color_ratio)
+        pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+    
+    # Distant mountains/scenery
+    pygame.draw.polygon(surface, (80, 100, 120), [
+        (0, GROUND_Y - 120),
+        (300, GROUND_Y - 80),
+        (600, GROUND_Y - 100),
+        (900, GROUND_Y - 70),
+        (width, GROUND_Y - 100),
+        (width, GROUND_Y - 150),
+        (0, GROUND_Y - 150)
+    ])
+    
+    # Arena back wall with detail
+    pygame.draw.rect(surface, (60, 60, 80), (0, GROUND_Y - 100, width, 100))
+    
+    # Wall pattern
+    for x in range(0, width, 80):
+        pygame.draw.line(surface, (100, 100, 130), (x, GROUND_Y - 100), (x, GROUND_Y), 2)
+        pygame.draw.line(surface, (40, 40, 50), (x + 40, GROUND_Y - 100), (x + 40, GROUND_Y), 1)
+    
+    # Horizontal lines for detail
+    for y in range(GROUND_Y - 100, GROUND_Y, 20):
+        pygame.draw.line(surface, (80, 80, 100), (0, y), (width, y), 1)
+    
+    # Fight stage floor with gradient
+    floor_color_start = (100, 120, 60)
+    floor_color_end = (80, 100, 40)
+    stage_height = 70
+    
+    for y in range(stage_height):
+        color_ratio = y / stage_height
+        r = int(floor_color_start[0] + (floor_color_end[0] - floor_color_start[0]) * color_ratio)
+        g = int(floor_color_start[1] + (floor_color_end[1] - floor_color_start[1]) * color_ratio)
+        b = int(floor_color_start[2] + (floor_color_end[2] - floor_color_start[2]) * color_ratio)
+        pygame.draw.line(surface, (r, g, b), (0, GROUND_Y + y), (width, GROUND_Y + y))
+    
+    # Stage edge highlight
+    pygame.draw.line(surface, (150, 170, 100), (0, GROUND_Y), (width, GROUND_Y), 3)
+    
+    # Stage edge shadow
+    pygame.draw.line(surface, (50, 60, 30), (0, GROUND_Y + 68), (width, GROUND_Y + 68), 2)
+    
+    # Decorative arena features
+    pygame.draw.rect(surface, (70, 70, 90), (100, GROUND_Y - 80, 30, 80))
+    pygame.draw.rect(surface, (70, 70, 90), (width - 130, GROUND_Y - 80, 30, 80))
+    
+    # Lighting effects on stage
+    pygame.draw.polygon(surface, (200, 180, 100), [
+        (width // 2 - 200, GROUND_Y - 100),
+        (width // 2 + 200, GROUND_Y - 100),
+        (width // 2 + 150, GROUND_Y),
+        (width // 2 - 150, GROUND_Y)
+    ])
+
+
+class StageRenderer:
+    """Static KOF arena baked once, restored only under what moved"""
+    def __init__(self):
+        self.background = None
+        self.dirty_rects = []  # Screen areas changed by the current frame
+        self.drawn_rects = []  # Areas to restore at the start of the next frame
+        self.full_redraw = True
+        self.bounds = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    def bake(self, size):
+        """Render the arena into one display-format surface"""
+        self.background = pygame.Surface(size)
+        paint_arena(self.background)
+        if pygame.display.get_surface() is not None:
+            self.background = self.background.convert()
+        self.full_redraw = True
+    
+    def invalidate(self):
+        """Repaint the whole arena next frame (e.g. after another screen was shown)"""
+        self.full_redraw = True
+    
+    def begin_frame(self, surface):
+        """Restore the arena under everything drawn in the previous frame"""
+        if self.background is None or self.background.get_size() != surface.get_size():
+            self.bake(surface.get_size())
+        self.bounds = surface.get_rect()
+        
+        if self.full_redraw:
+            surface.blit(self.background, (0, 0))
+            self.dirty_rects = [surface.get_rect()]
+            self.full_redraw = False
+        else:
+            for rect in self.drawn_rects:
+                surface.blit(self.background, rect, rect)
+            self.dirty_rects = self.drawn_rects
+        self.drawn_rects = []
+    
+    def mark(self, rect):
+        """Record an area drawn this frame so it is presented now and restored next frame"""
+        if rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        self.drawn_rects.append(rect)
+        self.dirty_rects.append(rect)
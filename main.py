@@ -2,33 +2,49 @@ import pygame
 import sys
 from game_manager import GameManager
 from utils.constants import FPS
+from utils.game_loop import FixedStepLoop
+
+# Most simulation ticks run to catch up after one slow frame
+MAX_CATCH_UP_STEPS = 5
+
+
+def _option(name, default):
+    """Value following name on the command line, or default"""
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
 
 
 def main():
     pygame.init()
     
-    # Create game manager
-    game_manager = GameManager()
+    # Create game manager (--dirty-rects presents only changed screen areas)
+    game_manager = GameManager(dirty_rects="--dirty-rects" in sys.argv)
     
-    # Game loop
-    clock = pygame.time.Clock()
-    running = True
+    # Fixed-step game loop: the simulation ticks at FPS whatever the render rate
+    loop = FixedStepLoop(tick_rate=FPS, max_steps=MAX_CATCH_UP_STEPS,
+                         render_fps=int(_option("--render-fps", FPS)))
+    interpolate = "--no-interpolate" not in sys.argv
     
-    while running:
+    def handle_events():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE and game_manager.state != 5:  # Not in Mario
-                    running = False
-        
-        # Update game state
-        game_manager.update()
-        
-        # Draw everything
-        game_manager.draw()
-        
-        clock.tick(FPS)
+                    return False
+        return True
+    
+    def render(alpha):
+        game_manager.draw(alpha if interpolate else 1.0)
+    
+    loop.run(handle_events, game_manager.update, render)
+    
+    # --stats reports loop and presentation counters on exit
+    if "--stats" in sys.argv:
+        print("Game loop:", loop.get_stats())
+        if game_manager.presenter is not None:
+            print("Dirty-rect presentation:", game_manager.presenter.get_stats())
     
     pygame.quit()
     sys.exit()
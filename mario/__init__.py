@@ -2,7 +2,9 @@
 from .game import MarioGame
 from .player import MarioPlayer
 from .enemies import Enemy
+from .enemy_store import EnemyStore
 from .platforms import Platform
 from .items import Coin
+from .ecs import World
 
-__all__ = ['MarioGame', 'MarioPlayer', 'Enemy', 'Platform', 'Coin']
+__all__ = ['MarioGame', 'MarioPlayer', 'Enemy', 'EnemyStore', 'Platform', 'Coin', 'World']
@@ -0,0 +1,50 @@
+import bisect
+
+
+# Entities within this many pixels of the viewport are simulated
+ACTIVE_MARGIN = 256
+# Active entities are frozen only once this far out, so nothing flickers
+# between states right at the window edge
+SLEEP_MARGIN = ACTIVE_MARGIN + 128
+
+
+class DormantList:
+    """Frozen entities kept sorted by level x, woken in bulk as the camera reaches them"""
+    def __init__(self):
+        self.xs = []
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, x, item):
+        index = bisect.bisect_right(self.xs, x)
+        self.xs.insert(index, x)
+        self.items.insert(index, item)
+
+    def wake(self, left, right):
+        """Remove and return every entity with left <= x <= right"""
+        lo = bisect.bisect_left(self.xs, left)
+        hi = bisect.bisect_right(self.xs, right)
+        if lo == hi:
+            return []
+        woken = self.items[lo:hi]
+        del self.xs[lo:hi]
+        del self.items[lo:hi]
+        return woken
+
+    def drop(self, left, right):
+        """Remove and return every entity with left <= x < right"""
+        lo = bisect.bisect_left(self.xs, left)
+        hi = bisect.bisect_left(self.xs, right)
+        dropped = self.items[lo:hi]
+        del self.xs[lo:hi]
+        del self.items[lo:hi]
+        return dropped
+
+    def clear(self):
+        self.xs.clear()
+        self.items.clear()
@@ -0,0 +1,75 @@
+import pygame
+from utils.constants import *
+from .enemies import Enemy
+from .items import Coin
+from .powerups import PowerUp
+
+
+# Transparent border around each frame for shadows, glows and bobbing
+SPRITE_MARGIN = 12
+
+
+class SpriteAtlas:
+    """Pre-rendered sprite frames shelf-packed into a single surface"""
+    def __init__(self, max_width=1024):
+        self.max_width = max_width
+        self.image = None
+        self.regions = {}  # key -> Rect of the frame inside the atlas
+
+    def build(self, frames):
+        """Render and pack frames given as (key, (width, height), paint) tuples,
+        where paint(surface, x, y, key) draws the frame anchored at (x, y)"""
+        cells = []
+        for key, (width, height), paint in frames:
+            cells.append((key, width + SPRITE_MARGIN * 2, height + SPRITE_MARGIN * 2, paint))
+        # Tallest first keeps the shelves tight
+        cells.sort(key=lambda cell: cell[2], reverse=True)
+
+        placements = []
+        x = y = shelf_height = 0
+        for key, width, height, paint in cells:
+            if x + width > self.max_width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            placements.append((key, pygame.Rect(x, y, width, height), paint))
+            x += width
+            shelf_height = max(shelf_height, height)
+
+        self.image = pygame.Surface((self.max_width, max(1, y + shelf_height)), pygame.SRCALPHA)
+        self.regions = {}
+        for key, region, paint in placements:
+            paint(self.image, region.x + SPRITE_MARGIN, region.y + SPRITE_MARGIN, key)
+            self.regions[key] = region
+        if pygame.display.get_surface() is not None:
+            self.image = self.image.convert_alpha()
+
+    def has(self, key):
+        return key in self.regions
+
+    def blit_args(self, key, x, y):
+        """(source, dest, area) for Surface.blits, placing the frame anchor at (x, y)"""
+        return (self.image, (x - SPRITE_MARGIN, y - SPRITE_MARGIN), self.regions[key])
+
+
+def build_mario_atlas():
+    """Atlas holding every enemy, coin and power-up frame"""
+    frames = []
+    for prototype in (Enemy(0, 0), Coin(0, 0), PowerUp(0, 0)):
+        size = (prototype.width, prototype.height)
+        for key in prototype.sprite_keys():
+            frames.append((key, size, prototype.draw_frame))
+    atlas = SpriteAtlas()
+    atlas.build(frames)
+    return atlas
+
+
+_mario_atlas = None
+
+
+def get_mario_atlas():
+    """Process-wide atlas, built on first use"""
+    global _mario_atlas
+    if _mario_atlas is None:
+        _mario_atlas = build_mario_atlas()
+    return _mario_atlas
@@ -0,0 +1,141 @@
+import pygame
+from utils.constants import *
+
+
+# Colours used when baking the level background
+DEFAULT_THEME = {
+    "sky_top": (135, 206, 250),
+    "sky_bottom": (100, 150, 220),
+    "grass_bottom": (50, 100, 50),
+    "ground": (80, 60, 40),
+    "cloud": (255, 255, 255),
+    "cloud_shadow": (150, 150, 200),
+    "mountain": (100, 120, 100),
+    "mountain_highlight": (140, 160, 140),
+}
+
+CLOUD_SPACING = 300
+CLOUD_Y = 80
+CLOUD_PARALLAX = 0.3
+MOUNTAIN_PARALLAX = 0.2
+
+
+def _lerp_color(start, end, ratio):
+    """Blend two RGB colours"""
+    return tuple(int(s + (e - s) * ratio) for s, e in zip(start, end))
+
+
+def _to_display_format(image, alpha):
+    """Convert a baked surface to the display pixel format when possible"""
+    if pygame.display.get_surface() is None:
+        return image
+    return image.convert_alpha() if alpha else image.convert()
+
+
+class BackgroundLayer:
+    """A baked background strip, tiled horizontally and scrolled by a parallax factor"""
+    def __init__(self, image, y, scroll_factor):
+        self.image = image
+        self.y = y
+        self.scroll_factor = scroll_factor
+
+    def draw(self, surface, camera_x):
+        tile_width = self.image.get_width()
+        x = -(int(camera_x * self.scroll_factor) % tile_width)
+        while x < surface.get_width():
+            surface.blit(self.image, (x, self.y))
+            x += tile_width
+
+
+class ParallaxBackground:
+    """Mario level background baked once into parallax layers"""
+    def __init__(self, theme=None):
+        self.theme = dict(DEFAULT_THEME)
+        if theme:
+            self.theme.update(theme)
+        self.layers = []
+        self.size = None
+        self.bake_count = 0
+
+    def set_theme(self, theme):
+        """Change colours; layers are rebaked on the next draw"""
+        self.theme = dict(DEFAULT_THEME)
+        self.theme.update(theme)
+        self.size = None
+
+    def bake(self, size):
+        """Render every layer for the given screen size"""
+        width, height = size
+        self.layers = [
+            BackgroundLayer(self._bake_sky(width), 0, 0),
+            BackgroundLayer(self._bake_clouds(), CLOUD_Y - 40, CLOUD_PARALLAX),
+            BackgroundLayer(self._bake_mountains(width), GROUND_Y - 150, MOUNTAIN_PARALLAX),
+            BackgroundLayer(self._bake_ground(width, height), GROUND_Y, 0),
+        ]
+        self.size = size
+        self.bake_count += 1
+
+    def _bake_sky(self, width):
+        """Vertical sky gradient down to the ground line"""
+        image = pygame.Surface((width, GROUND_Y))
+        for y in range(GROUND_Y):
+            color = _lerp_color(self.theme["sky_top"], self.theme["sky_bottom"], y / GROUND_Y)
+            pygame.draw.line(image, color, (0, y), (width, y))
+        return _to_display_format(image, False)
+
+    def _bake_clouds(self):
+        """One cloud per tile, repeated every CLOUD_SPACING pixels"""
+        image = pygame.Surface((CLOUD_SPACING, 95), pygame.SRCALPHA)
+        cx = CLOUD_SPACING // 2
+        cy = 40
+        # Cloud shadow
+        pygame.draw.ellipse(image, self.theme["cloud_shadow"], pygame.Rect(cx - 40, cy + 20, 100, 30))
+        # Cloud
+        pygame.draw.circle(image, self.theme["cloud"], (cx - 20, cy), 30)
+        pygame.draw.circle(image, self.theme["cloud"], (cx, cy), 35)
+        pygame.draw.circle(image, self.theme["cloud"], (cx + 20, cy), 30)
+        return _to_display_format(image, True)
+
+    def _bake_mountains(self, width):
+        """Distant hills; both edges meet at the same height so the tile wraps"""
+        image = pygame.Surface((width, 151), pygame.SRCALPHA)
+        top = 150  # GROUND_Y in tile coordinates
+        pygame.draw.polygon(image, self.theme["mountain"], [
+            (0, top - 100),
+            (300, top - 150),
+            (600, top - 80),
+            (900, top - 140),
+            (width, top - 100),
+            (width, top),
+            (0, top)
+        ])
+        # Mountain highlights
+        pygame.draw.line(image, self.theme["mountain_highlight"], (300, top - 150), (600, top - 80), 2)
+        return _to_display_format(image, True)
+
+    def _bake_ground(self, width, height):
+        """Grass transition followed by the brown ground strip"""
+        image = pygame.Surface((width, max(height - GROUND_Y, 20)))
+        image.fill(self.theme["ground"])
+        for y in range(20):
+            color = _lerp_color(self.theme["sky_bottom"], self.theme["grass_bottom"], y / 20)
+            pygame.draw.line(image, color, (0, y), (width, y))
+        return _to_display_format(image, False)
+
+    def draw(self, surface, camera_x):
+        """Blit the layers at their parallax offsets, rebaking if the screen size changed"""
+        if self.size != surface.get_size():
+            self.bake(surface.get_size())
+        for layer in self.layers:
+            layer.draw(surface, camera_x)
+
+
+_shared_background = None
+
+
+def get_shared_background():
+    """Background shared by every MarioGame so restarts don't rebake it"""
+    global _shared_background
+    if _shared_background is None:
+        _shared_background = ParallaxBackground()
+    return _shared_background
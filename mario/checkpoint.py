@@ -19,16 +19,20 @@ class Checkpoint:
         """Get collision rectangle"""
         return pygame.Rect(self.x - self.width // 2, self.y - self.height, self.width, self.height)
     
-    def draw(self, surface):
-        """Draw checkpoint flag and pole"""
+    def draw(self, surface, offset_x=0):
+        """Draw checkpoint flag and pole shifted left by offset_x"""
+        self.draw_frame(surface, self.x - offset_x, self.y)
+    
+    def draw_frame(self, surface, x, y):
+        """Draw the flag with its pole standing on (x, y)"""
         # Draw pole
         pygame.draw.rect(surface, self.pole_color, 
-                        (self.x - 3, self.y - self.height, 6, self.height))
+                        (x - 3, y - self.height, 6, self.height))
         
         # Draw flag
         pygame.draw.rect(surface, self.flag_color,
-                        (self.x + 3, self.y - self.height + 10, self.flag_width, self.flag_height))
+                        (x + 3, y - self.height + 10, self.flag_width, self.flag_height))
         
         # Draw flag outline
         pygame.draw.rect(surface, (200, 0, 0),
-                        (self.x + 3, self.y - self.height + 10, self.flag_width, self.flag_height), 2)
+                        (x + 3, y - self.height + 10, self.flag_width, self.flag_height), 2)
@@ -0,0 +1,98 @@
+"""Swept AABB collision against static platforms"""
+import pygame
+
+
+# Contact normals, pointing from the platform towards the mover
+TOP = (0, -1)     # Landed on the platform
+BOTTOM = (0, 1)   # Bumped its underside
+LEFT = (-1, 0)    # Ran into its left side
+RIGHT = (1, 0)    # Ran into its right side
+
+# A move is resolved against at most this many impacts: one per axis plus
+# a corner case where both axes hit at the same time
+MAX_IMPACTS = 3
+
+
+def _axis_times(start, size, delta, low, high):
+    """Entry and exit time along one axis, or None if never overlapping"""
+    if delta > 0:
+        return (low - (start + size)) / delta, (high - start) / delta
+    if delta < 0:
+        return (high - start) / delta, (low - (start + size)) / delta
+    if start + size <= low or start >= high:
+        return None
+    return float("-inf"), float("inf")
+
+
+def sweep(x, y, width, height, dx, dy, rect):
+    """Time of impact in [0, 1] and contact normal of a box moving by (dx, dy), or None.
+
+    Boxes that merely touch do not collide, and a box already overlapping
+    rect at the start is ignored, so it can always move out again.
+    """
+    x_times = _axis_times(x, width, dx, rect.left, rect.right)
+    if x_times is None:
+        return None
+    y_times = _axis_times(y, height, dy, rect.top, rect.bottom)
+    if y_times is None:
+        return None
+    entry = max(x_times[0], y_times[0])
+    exit_time = min(x_times[1], y_times[1])
+    if entry >= exit_time or entry < 0 or entry > 1:
+        return None
+    if x_times[0] > y_times[0]:
+        return entry, (LEFT if dx > 0 else RIGHT)
+    return entry, (TOP if dy > 0 else BOTTOM)
+
+
+def swept_bounds(x, y, width, height, dx, dy):
+    """Rect covering a box over its whole move, for broad-phase queries"""
+    left = min(x, x + dx)
+    top = min(y, y + dy)
+    return pygame.Rect(int(left) - 1, int(top) - 1,
+                       int(width + abs(dx)) + 3, int(height + abs(dy)) + 3)
+
+
+def move_and_collide(x, y, width, height, dx, dy, platforms):
+    """Move a box by (dx, dy) through platforms, stopping at the first impact each time.
+
+    Impacts are resolved in time-of-impact order: the box stops flush
+    against the earliest platform, the blocked component of the move is
+    cancelled and the rest slides along the surface. Returns the new x, y
+    and a list of (platform, normal) contacts in the order they happened.
+    """
+    contacts = []
+    for _ in range(MAX_IMPACTS):
+        if not dx and not dy:
+            break
+        earliest = None
+        for platform in platforms:
+            hit = sweep(x, y, width, height, dx, dy, platform.rect)
+            # Ties go to the earlier platform in the list
+            if hit is not None and (earliest is None or hit[0] < earliest[0]):
+                earliest = hit[0], hit[1], platform
+        if earliest is None:
+            x += dx
+            y += dy
+            break
+
+        time, normal, platform = earliest
+        x += dx * time
+        y += dy * time
+        remaining = 1 - time
+        # Snap flush to the surface so rounding never leaves the box inside
+        rect = platform.rect
+        if normal == TOP:
+            y = rect.top - height
+            dx, dy = dx * remaining, 0
+        elif normal == BOTTOM:
+            y = rect.bottom
+            dx, dy = dx * remaining, 0
+        elif normal == LEFT:
+            x = rect.left - width
+            dx, dy = 0, dy * remaining
+        else:
+            x = rect.right
+            dx, dy = 0, dy * remaining
+        contacts.append((platform, normal))
+    return x, y, contacts
@@ -0,0 +1,18 @@
+"""Compile JSON levels to .mlvl files: python -m mario.compile_levels levels/*.json"""
+import os
+import sys
+
+from .level_format import compile_file, decompile_level, load_json, LevelFile
+
+
+def main(argv=None):
+    for source in (argv if argv is not None else sys.argv[1:]):
+        target = compile_file(source)
+        with LevelFile(target) as level_file:
+            exact = decompile_level(level_file) == load_json(source)
+            print(f"{source} -> {target}: {level_file.chunk_count} chunks, "
+                  f"{os.path.getsize(target)} bytes, round trip {'exact' if exact else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
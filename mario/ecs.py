@@ -0,0 +1,305 @@
+"""Entity-component core: entities are handles, components live in NumPy arrays"""
+import numpy as np
+
+
+# Low bits of a handle select the slot, the rest hold its generation
+SLOT_BITS = 20
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class SlotAllocator:
+    """Reusable slots addressed by generational handles.
+
+    A released slot gets a new generation, so handles issued for its
+    earlier occupant stop resolving once it is reused.
+    """
+    def __init__(self):
+        self.generation = []  # Slot -> current generation
+        self.free = []
+
+    def __len__(self):
+        """Slots in use"""
+        return len(self.generation) - len(self.free)
+
+    def allocate(self):
+        """A free slot, reusing the most recently released first"""
+        if self.free:
+            return self.free.pop()
+        self.generation.append(0)
+        return len(self.generation) - 1
+
+    def allocate_many(self, count):
+        """count slots, in the order count allocate() calls would return them"""
+        slots = [self.free.pop() for _ in range(min(count, len(self.free)))]
+        first = len(self.generation)
+        self.generation.extend([0] * (count - len(slots)))
+        slots.extend(range(first, len(self.generation)))
+        return slots
+
+    def handle(self, slot):
+        """Handle of a slot's current occupant"""
+        return self.generation[slot] << SLOT_BITS | int(slot)
+
+    def slot(self, handle):
+        """Slot a handle refers to, or None once it has been released"""
+        slot = handle & SLOT_MASK
+        if slot >= len(self.generation) or self.generation[slot] != handle >> SLOT_BITS:
+            return None
+        return slot
+
+    def release(self, slot):
+        self.generation[slot] += 1
+        self.free.append(slot)
+
+    def release_all(self):
+        for slot in range(len(self.generation)):
+            self.generation[slot] += 1
+        self.free = list(range(len(self.generation)))
+
+
+class ComponentArray:
+    """One component type for every entity that has it, one dense array per field.
+
+    Dense index i belongs to the entity in slot owners[i], and sparse maps a
+    slot back to its dense index (-1 when the entity lacks the component).
+    Removal swaps the last entry into the hole, so the field arrays stay
+    contiguous for batched systems. A component with no fields is a tag.
+    """
+    def __init__(self, fields, capacity=16):
+        self.fields = tuple(fields)
+        self.size = 0
+        self.capacity = capacity
+        self.owners = np.zeros(capacity, dtype=np.int64)
+        self.sparse = np.full(capacity, -1, dtype=np.int64)
+        for name, dtype in self.fields:
+            setattr(self, "_" + name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, name):
+        """Live view of one field, in dense order"""
+        return getattr(self, "_" + name)[:self.size]
+
+    def slots(self):
+        return self.owners[:self.size]
+
+    def indices(self, slots):
+        """Dense index of each slot, or -1 where it lacks the component"""
+        result = np.full(len(slots), -1, dtype=np.int64)
+        known = slots < len(self.sparse)
+        result[known] = self.sparse[slots[known]]
+        return result
+
+    def has(self, slot):
+        return slot < len(self.sparse) and self.sparse[slot] >= 0
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        owners = np.zeros(capacity, dtype=np.int64)
+        owners[:self.size] = self.owners[:self.size]
+        self.owners = owners
+        for name, dtype in self.fields:
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self.size] = getattr(self, "_" + name)[:self.size]
+            setattr(self, "_" + name, array)
+        self.capacity = capacity
+
+    def add(self, slot, values):
+        """Attach the component to a slot, or overwrite its values; missing fields are 0"""
+        if slot >= len(self.sparse):
+            sparse = np.full(max(slot + 1, len(self.sparse) * 2), -1, dtype=np.int64)
+            sparse[:len(self.sparse)] = self.sparse
+            self.sparse = sparse
+        index = self.sparse[slot]
+        if index < 0:
+            if self.size == self.capacity:
+                self._grow(self.size + 1)
+            index = self.size
+            self.owners[index] = slot
+            self.sparse[slot] = index
+            self.size += 1
+        for name, _ in self.fields:
+            getattr(self, "_" + name)[index] = values.get(name, 0)
+
+    def add_many(self, slots, values):
+        """Attach the component to slots that lack it; values are scalars or arrays, missing fields are 0"""
+        count = len(slots)
+        if not count:
+            return
+        needed = int(slots.max()) + 1
+        if needed > len(self.sparse):
+            sparse = np.full(max(needed, len(self.sparse) * 2), -1, dtype=np.int64)
+            sparse[:len(self.sparse)] = self.sparse
+            self.sparse = sparse
+        if self.size + count > self.capacity:
+            self._grow(self.size + count)
+        start, end = self.size, self.size + count
+        self.owners[start:end] = slots
+        self.sparse[slots] = np.arange(start, end)
+        for name, _ in self.fields:
+            getattr(self, "_" + name)[start:end] = values.get(name, 0)
+        self.size = end
+
+    def remove(self, slot):
+        if not self.has(slot):
+            return
+        index = self.sparse[slot]
+        last = self.size - 1
+        if index != last:
+            for name, _ in self.fields:
+                array = getattr(self, "_" + name)
+                array[index] = array[last]
+            moved = self.owners[last]
+            self.owners[index] = moved
+            self.sparse[moved] = index
+        self.sparse[slot] = -1
+        self.size -= 1
+
+    def get(self, slot):
+        """Field values of one slot as plain Python numbers"""
+        index = self.sparse[slot]
+        return {name: getattr(self, "_" + name)[index].item() for name, _ in self.fields}
+
+    def clear(self):
+        self.sparse[self.owners[:self.size]] = -1
+        self.size = 0
+
+
+class World:
+    """Entities and their components, stepped by a list of systems.
+
+    Entity handles come from a SlotAllocator, so a destroyed entity's
+    handle never resolves to a later one. destroy() is deferred to
+    flush() and destroyed entities drop out of queries straight away, so
+    systems may destroy entities while working on a query result.
+    """
+    def __init__(self, components=None):
+        self.components = {}
+        self.systems = []
+        self.allocator = SlotAllocator()
+        self.pending = set()  # Slots destroyed but not yet flushed
+        for name, fields in (components or {}).items():
+            self.register(name, fields)
+
+    def __len__(self):
+        return len(self.allocator) - len(self.pending)
+
+    def register(self, name, fields=()):
+        """Declare a component type as ((field, dtype), ...)"""
+        self.components[name] = ComponentArray(fields)
+
+    def add_system(self, system):
+        """Systems are objects with update(world), run in the order added"""
+        self.systems.append(system)
+        return system
+
+    # ===== ENTITIES =====
+
+    def entity(self, slot):
+        """Handle of the entity living in a slot"""
+        return self.allocator.handle(slot)
+
+    def _slot(self, entity):
+        """Slot of a live entity, or None"""
+        slot = self.allocator.slot(entity)
+        return None if slot in self.pending else slot
+
+    def alive(self, entity):
+        return self._slot(entity) is not None
+
+    def create(self, **components):
+        """New entity with the given components, each passed as a dict of field values"""
+        slot = self.allocator.allocate()
+        for name, values in components.items():
+            self.components[name].add(slot, values)
+        return self.entity(slot)
+
+    def create_many(self, count, **components):
+        """count new entities in one batch, each component a dict of scalars or per-entity arrays.
+
+        Slots are handed out in the same order count create() calls would
+        use; returns the new handles.
+        """
+        slots = np.array(self.allocator.allocate_many(count), dtype=np.int64)
+        for name, values in components.items():
+            self.components[name].add_many(slots, values)
+        return [self.entity(slot) for slot in slots.tolist()]
+
+    def add(self, entity, name, **values):
+        slot = self._slot(entity)
+        if slot is not None:
+            self.components[name].add(slot, values)
+
+    def remove(self, entity, name):
+        slot = self._slot(entity)
+        if slot is not None:
+            self.components[name].remove(slot)
+
+    def get(self, entity, name):
+        """Field values of one component of an entity, or None"""
+        slot = self._slot(entity)
+        if slot is None or not self.components[name].has(slot):
+            return None
+        return self.components[name].get(slot)
+
+    def snapshot(self, entity):
+        """Every component of an entity, in the form create() takes"""
+        slot = self._slot(entity)
+        if slot is None:
+            return None
+        return {name: array.get(slot) for name, array in self.components.items() if array.has(slot)}
+
+    def destroy(self, entity):
+        """Mark an entity for removal at the next flush()"""
+        slot = self._slot(entity)
+        if slot is not None:
+            self.pending.add(slot)
+
+    def flush(self):
+        """Remove destroyed entities from every component"""
+        for slot in self.pending:
+            for array in self.components.values():
+                array.remove(slot)
+            self.allocator.release(slot)
+        self.pending.clear()
+
+    def clear(self):
+        self.allocator.release_all()
+        self.pending.clear()
+        for array in self.components.values():
+            array.clear()
+
+    # ===== SYSTEMS =====
+
+    def query(self, *names):
+        """Slots of the live entities having every named component.
+
+        Returns the slots and, for each name, the dense indices of those
+        entities in that component's arrays. Results follow the dense order
+        of the smallest component.
+        """
+        arrays = [self.components[name] for name in names]
+        base = min(arrays, key=len)
+        slots = base.slots()
+        indices = [None] * len(arrays)
+        for position, array in enumerate(arrays):
+            if array is not base:
+                index = array.indices(slots)
+                present = index >= 0
+                slots = slots[present]
+                indices = [None if found is None else found[present] for found in indices]
+                indices[position] = index[present]
+        if self.pending:
+            live = ~np.isin(slots, list(self.pending))
+            slots = slots[live]
+            indices = [None if found is None else found[live] for found in indices]
+        return slots, [base.indices(slots) if found is None else found for found in indices]
+
+    def update(self):
+        """Run every system once, then drop what they destroyed"""
+        for system in self.systems:
+            system.update(self)
+        self.flush()
@@ -2,6 +2,10 @@ import pygame
 from utils.constants import *
 
 
+# Enemies this far outside the level (in level coordinates) are removed
+DESPAWN_MARGIN = 50
+
+
 class Enemy:
     """Enemy base class - Goomba, Koopa, Flying variants"""
     def __init__(self, x, y, direction=1, enemy_type="goomba"):
@@ -17,8 +21,9 @@ class Enemy:
         self.enemy_type = enemy_type
         self.anim_frame = 0
         self.bob_offset = 0  # For flying enemies
+        self.spawn_index = -1  # Index in the level file's enemy list, if loaded from one
     
-    def update(self):
+    def update(self, level_width):
         # Apply gravity (flying enemies don't use gravity the same way)
         if self.enemy_type != "flying":
             if not self.on_ground:
@@ -37,35 +42,57 @@ class Enemy:
         if self.anim_frame > 6:
             self.anim_frame = 0
         
-        # Die if off screen
-        if self.x < -50 or self.x > SCREEN_WIDTH + 500 or self.y > SCREEN_HEIGHT:
+        # Die once outside the level
+        if self.x < -DESPAWN_MARGIN or self.x > level_width + DESPAWN_MARGIN or self.y > SCREEN_HEIGHT:
             return False
         
         return True
-        
-        return True
     
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_bob_y(self):
+        """Vertical bobbing offset of flying enemies"""
+        if self.enemy_type != "flying":
+            return 0
+        return int(2 * abs(pygame.math.Vector2(1, 0).rotate(self.bob_offset).y))
+    
+    def get_sprite(self):
+        """Sprite key (type, frame, direction, bob) and integer anchor for the atlas"""
+        direction = (1 if self.direction > 0 else -1) if self.enemy_type == "goomba" else 1
+        return (self.enemy_type, 0, direction, self.get_bob_y()), (int(self.x), int(self.y))
+    
+    @classmethod
+    def sprite_keys(cls):
+        """Every distinct frame the enemy drawing code can produce"""
+        keys = [("goomba", 0, 1, 0), ("goomba", 0, -1, 0), ("koopa", 0, 1, 0)]
+        keys += [("flying", 0, 1, bob_y) for bob_y in range(3)]
+        return keys
+    
     def draw(self, surface):
         """Draw enemy based on type"""
-        if self.enemy_type == "goomba":
-            self._draw_goomba(surface)
-        elif self.enemy_type == "koopa":
-            self._draw_koopa(surface)
-        elif self.enemy_type == "flying":
-            self._draw_flying(surface)
+        key, (x, y) = self.get_sprite()
+        self.draw_frame(surface, x, y, key)
+    
+    def draw_frame(self, surface, x, y, key):
+        """Draw the frame described by a sprite key with its top-left at (x, y)"""
+        enemy_type, _, direction, bob_y = key
+        if enemy_type == "goomba":
+            self._draw_goomba(surface, x, y, direction)
+        elif enemy_type == "koopa":
+            self._draw_koopa(surface, x, y)
+        elif enemy_type == "flying":
+            self._draw_flying(surface, x, y, bob_y)
     
-    def _draw_goomba(self, surface):
+    def _draw_goomba(self, surface, x, y, direction):
         """Draw Goomba enemy"""
-        rect = self.get_rect()
+        rect = pygame.Rect(x, y, self.width, self.height)
         
         # Draw shadow
         shadow_width = int(self.width * 1.1)
         pygame.draw.ellipse(surface, (40, 40, 60), pygame.Rect(
-            self.x + self.width // 2 - shadow_width // 2, 
-            self.y + self.height + 1, 
+            x + self.width // 2 - shadow_width // 2, 
+            y + self.height + 1, 
             shadow_width, 5
         ))
         
@@ -86,16 +113,16 @@ class Enemy:
         pygame.draw.line(surface, (100, 50, 10), (rect.x, head_y), (rect.x + rect.width, head_y), 1)
         
         # Eyes
-        left_eye_x = int(self.x + 10)
-        right_eye_x = int(self.x + 22)
-        eye_y = int(self.y + 8)
+        left_eye_x = int(x + 10)
+        right_eye_x = int(x + 22)
+        eye_y = int(y + 8)
         
         # Eye whites
         pygame.draw.circle(surface, WHITE, (left_eye_x, eye_y), 3)
         pygame.draw.circle(surface, WHITE, (right_eye_x, eye_y), 3)
         
         # Eye pupils
-        pupil_offset = 2 if self.direction > 0 else -2
+        pupil_offset = 2 if direction > 0 else -2
         pygame.draw.circle(surface, BLACK, (left_eye_x + pupil_offset, eye_y), 2)
         pygame.draw.circle(surface, BLACK, (right_eye_x + pupil_offset, eye_y), 2)
         
@@ -104,7 +131,7 @@ class Enemy:
         pygame.draw.line(surface, (80, 30, 0), (right_eye_x - 2, eye_y - 3), (right_eye_x + 2, eye_y - 3), 1)
         
         # Mouth
-        pygame.draw.line(surface, (80, 30, 0), (int(self.x + 14), int(self.y + 16)), (int(self.x + 18), int(self.y + 16)), 1)
+        pygame.draw.line(surface, (80, 30, 0), (int(x + 14), int(y + 16)), (int(x + 18), int(y + 16)), 1)
         
         # Feet (shoes)
         foot_color = (60, 30, 10)
@@ -118,15 +145,15 @@ class Enemy:
         # Body border
         pygame.draw.rect(surface, (80, 30, 0), rect, 2)
     
-    def _draw_koopa(self, surface):
+    def _draw_koopa(self, surface, x, y):
         """Draw Koopa Troopa (faster enemy with shell)"""
-        rect = self.get_rect()
+        rect = pygame.Rect(x, y, self.width, self.height)
         
         # Shadow
         shadow_width = int(self.width * 1.1)
         pygame.draw.ellipse(surface, (40, 40, 60), pygame.Rect(
-            self.x + self.width // 2 - shadow_width // 2, 
-            self.y + self.height + 1, 
+            x + self.width // 2 - shadow_width // 2, 
+            y + self.height + 1, 
             shadow_width, 5
         ))
         
@@ -140,9 +167,9 @@ class Enemy:
         pygame.draw.rect(surface, head_color, (rect.x + 8, rect.y - 2, rect.width - 16, 6))
         
         # Eyes
-        left_eye_x = int(self.x + 12)
-        right_eye_x = int(self.x + 20)
-        eye_y = int(self.y + 0)
+        left_eye_x = int(x + 12)
+        right_eye_x = int(x + 20)
+        eye_y = int(y + 0)
         
         pygame.draw.circle(surface, WHITE, (left_eye_x, eye_y), 2)
         pygame.draw.circle(surface, WHITE, (right_eye_x, eye_y), 2)
@@ -156,19 +183,18 @@ class Enemy:
         
         pygame.draw.rect(surface, (0, 100, 0), rect, 2)
     
-    def _draw_flying(self, surface):
+    def _draw_flying(self, surface, x, y, bob_y):
         """Draw Flying enemy (Bullet Bill style)"""
-        rect = self.get_rect()
+        rect = pygame.Rect(x, y, self.width, self.height)
         
         # Add bobbing motion
-        bob_y = int(2 * abs(pygame.math.Vector2(1, 0).rotate(self.bob_offset).y))
         draw_rect = pygame.Rect(rect.x, rect.y - bob_y, rect.width, rect.height)
         
         # Shadow
         shadow_width = int(self.width * 0.9)
         pygame.draw.ellipse(surface, (40, 40, 60), pygame.Rect(
-            self.x + self.width // 2 - shadow_width // 2, 
-            self.y + self.height + 1, 
+            x + self.width // 2 - shadow_width // 2, 
+            y + self.height + 1, 
             shadow_width, 4
         ))
         
@@ -185,8 +211,8 @@ class Enemy:
         pygame.draw.polygon(surface, body_color, nose_points)
         
         # Eye
-        eye_x = int(self.x + 12)
-        eye_y = int(self.y - bob_y + 12)
+        eye_x = int(x + 12)
+        eye_y = int(y - bob_y + 12)
         pygame.draw.circle(surface, WHITE, (eye_x, eye_y), 2)
         pygame.draw.circle(surface, BLACK, (eye_x, eye_y), 1)
         
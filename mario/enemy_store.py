@@ -0,0 +1,362 @@
+import numpy as np
+import pygame
+from utils.constants import *
+from .enemies import Enemy, DESPAWN_MARGIN
+from .collision import MAX_IMPACTS
+
+
+ENEMY_TYPES = ("goomba", "koopa", "flying")
+GOOMBA, KOOPA, FLYING = range(len(ENEMY_TYPES))
+ENEMY_WIDTH = 32
+ENEMY_HEIGHT = 24
+GRAVITY = 0.6
+MAX_FALL_SPEED = 15
+# Width of the platform columns used to find landing candidates
+COLUMN_WIDTH = 128
+
+
+class PlatformColumns:
+    """Static platform rects bucketed into vertical columns for batched collision tests.
+
+    spans, if given, are what each platform is bucketed by (e.g. its rect
+    clipped to the loaded level); collisions always use the full rects.
+    """
+    def __init__(self, rects, column_width=COLUMN_WIDTH, spans=None):
+        self.column_width = column_width
+        self.count = len(rects)
+        self.left = np.array([rect.left for rect in rects], dtype=np.int64)
+        self.top = np.array([rect.top for rect in rects], dtype=np.int64)
+        self.right = np.array([rect.right for rect in rects], dtype=np.int64)
+        self.bottom = np.array([rect.bottom for rect in rects], dtype=np.int64)
+
+        if not rects:
+            self.first_column = 0
+            self.starts = np.zeros(1, dtype=np.int64)
+            self.counts = np.zeros(1, dtype=np.int64)
+            self.entries = np.zeros(0, dtype=np.int64)
+            return
+
+        # Every (column, platform) pair, grouped by column and kept in level order
+        if spans is None:
+            spans = rects
+        first = np.array([rect.left for rect in spans], dtype=np.int64) // column_width
+        last = (np.array([rect.right for rect in spans], dtype=np.int64) - 1) // column_width
+        widths = last - first + 1
+        platform_index = np.repeat(np.arange(self.count), widths)
+        column = np.repeat(first, widths) + _ragged_arange(widths)
+        order = np.lexsort((platform_index, column))
+        column = column[order]
+
+        self.first_column = int(column[0])
+        column_count = int(column[-1]) - self.first_column + 1
+        self.counts = np.bincount(column - self.first_column, minlength=column_count)
+        self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+        self.entries = platform_index[order]
+
+    def _pairs(self, left, right):
+        """(rect index, platform index) for every platform sharing a column with each span [left, right)"""
+        first = np.maximum(left // self.column_width - self.first_column, 0).astype(np.int64)
+        last = np.minimum((right - 1) // self.column_width - self.first_column,
+                          len(self.counts) - 1).astype(np.int64)
+        widths = np.maximum(last - first + 1, 0)
+        slot = np.repeat(first, widths) + _ragged_arange(widths)
+        counts = self.counts[slot]
+        pair_rect = np.repeat(np.repeat(np.arange(len(left)), widths), counts)
+        pair_platform = self.entries[np.repeat(self.starts[slot], counts) + _ragged_arange(counts)]
+        return pair_rect, pair_platform
+
+    def first_overlap(self, x, y, width, height):
+        """Index of the first platform (in level order) overlapping each rect, or count if none"""
+        result = np.full(len(x), self.count, dtype=np.int64)
+        if not self.count or not len(x):
+            return result
+        pair_rect, pair_platform = self._pairs(x, x + width)
+
+        # Same test as Rect.colliderect
+        ex = x[pair_rect]
+        ey = y[pair_rect]
+        hit = ((ex < self.right[pair_platform]) & (ex + width > self.left[pair_platform]) &
+               (ey < self.bottom[pair_platform]) & (ey + height > self.top[pair_platform]))
+        np.minimum.at(result, pair_rect[hit], pair_platform[hit])
+        return result
+
+    def first_impact(self, x, y, width, height, dx, dy):
+        """Earliest platform each box hits while moving by (dx, dy): (index or count, time, side hit).
+
+        The same test as collision.sweep on every candidate at once: boxes
+        that merely touch do not collide, a box already inside a platform
+        can move out, and equal times go to the earlier platform. side is
+        True for a left or right face, False for a top or bottom one.
+        """
+        platform = np.full(len(x), self.count, dtype=np.int64)
+        time = np.ones(len(x))
+        side = np.zeros(len(x), dtype=bool)
+        if not self.count or not len(x):
+            return platform, time, side
+        # Columns under the whole move, like collision.swept_bounds
+        left = np.floor(np.minimum(x, x + dx)) - 1
+        right = np.ceil(np.maximum(x, x + dx) + width) + 2
+        pair_rect, pair_platform = self._pairs(left, right)
+
+        # Only platforms overlapping the box's whole move can be hit
+        top = np.minimum(y, y + dy)[pair_rect]
+        bottom = np.maximum(y, y + dy)[pair_rect] + height
+        near = np.flatnonzero((left[pair_rect] < self.right[pair_platform]) &
+                              (right[pair_rect] > self.left[pair_platform]) &
+                              (top < self.bottom[pair_platform]) & (bottom > self.top[pair_platform]))
+        pair_rect = pair_rect[near]
+        pair_platform = pair_platform[near]
+
+        x_entry, x_exit = _axis_times(x[pair_rect], width, dx[pair_rect],
+                                      self.left[pair_platform], self.right[pair_platform])
+        y_entry, y_exit = _axis_times(y[pair_rect], height, dy[pair_rect],
+                                      self.top[pair_platform], self.bottom[pair_platform])
+        entry = np.maximum(x_entry, y_entry)
+        hit = np.flatnonzero((entry < np.minimum(x_exit, y_exit)) & (entry >= 0) & (entry <= 1))
+
+        # Earliest impact per box, then level order
+        hit = hit[np.lexsort((pair_platform[hit], entry[hit], pair_rect[hit]))]
+        boxes = pair_rect[hit]
+        hit = hit[np.concatenate(([True], boxes[1:] != boxes[:-1]))] if len(hit) else hit
+        platform[pair_rect[hit]] = pair_platform[hit]
+        time[pair_rect[hit]] = entry[hit]
+        side[pair_rect[hit]] = x_entry[hit] > y_entry[hit]
+        return platform, time, side
+
+
+def _axis_times(start, size, delta, low, high):
+    """Vectorised collision._axis_times as (entry, exit).
+
+    A still axis divides by zero: an overlapping one spans -inf to inf,
+    and one that never overlaps gets an infinite entry or a NaN, which
+    fails every comparison, so neither can register a hit.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near = (low - (start + size)) / delta
+        far = (high - start) / delta
+    return np.minimum(near, far), np.maximum(near, far)
+
+
+def _ragged_arange(counts):
+    """Concatenated arange(n) for each n in counts"""
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(total) - offsets
+
+
+class EnemyStore:
+    """Every enemy in the level held in contiguous NumPy arrays.
+
+    Behaviour matches Enemy.update plus MarioGame's wall bouncing, with
+    platforms resolved like collision.move_and_collide: enemies land on
+    tops, stop under undersides and turn round at sides, in time-of-impact
+    order. All enemies are stepped with vectorised operations.
+    Enemies are kept in spawn order, so index order equals list order.
+    """
+    FIELDS = (("x", np.float64), ("y", np.float64), ("vel_x", np.float64), ("vel_y", np.float64),
+              ("kind", np.int8), ("direction", np.int8), ("on_ground", np.bool_),
+              ("anim_frame", np.float64), ("bob_offset", np.float64), ("spawn_index", np.int64))
+
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, "_" + name, np.zeros(capacity, dtype=dtype))
+        self.platforms = PlatformColumns([])
+
+    # ===== STORAGE =====
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, dtype in self.FIELDS:
+            array = np.zeros(capacity, dtype=dtype)
+            array[:self.size] = getattr(self, "_" + name)[:self.size]
+            setattr(self, "_" + name, array)
+        self.capacity = capacity
+
+    def append(self, enemy):
+        """Add an Enemy; the object itself is not kept"""
+        if self.size == self.capacity:
+            self._grow(self.size + 1)
+        i = self.size
+        self._x[i] = enemy.x
+        self._y[i] = enemy.y
+        self._vel_x[i] = enemy.vel_x
+        self._vel_y[i] = enemy.vel_y
+        self._kind[i] = ENEMY_TYPES.index(enemy.enemy_type)
+        self._direction[i] = 1 if enemy.direction > 0 else -1
+        self._on_ground[i] = enemy.on_ground
+        self._anim_frame[i] = enemy.anim_frame
+        self._bob_offset[i] = enemy.bob_offset
+        self._spawn_index[i] = enemy.spawn_index
+        self.size += 1
+
+    def extend(self, enemies):
+        for enemy in enemies:
+            self.append(enemy)
+
+    def clear(self):
+        self.size = 0
+
+    def keep(self, mask):
+        """Drop every enemy whose mask entry is False, preserving order"""
+        count = int(np.count_nonzero(mask))
+        for name, _ in self.FIELDS:
+            array = getattr(self, "_" + name)
+            array[:count] = array[:self.size][mask]
+        self.size = count
+
+    def remove_indices(self, indices):
+        if len(indices):
+            mask = np.ones(self.size, dtype=bool)
+            mask[list(indices)] = False
+            self.keep(mask)
+
+    def get(self, i):
+        """Snapshot of one enemy as an Enemy object"""
+        kind = ENEMY_TYPES[self._kind[i]]
+        enemy = Enemy(float(self._x[i]), float(self._y[i]), int(self._direction[i]), kind)
+        enemy.vel_x = float(self._vel_x[i])
+        enemy.vel_y = float(self._vel_y[i])
+        enemy.on_ground = bool(self._on_ground[i])
+        enemy.anim_frame = float(self._anim_frame[i])
+        enemy.bob_offset = float(self._bob_offset[i])
+        enemy.spawn_index = int(self._spawn_index[i])
+        return enemy
+
+    def __iter__(self):
+        return (self.get(i) for i in range(self.size))
+
+    def freeze_outside(self, left, right):
+        """Remove the enemies with x outside [left, right]; returns them as Enemy objects"""
+        x = self._x[:self.size]
+        outside = np.flatnonzero((x < left) | (x > right))
+        if not len(outside):
+            return []
+        frozen = [self.get(i) for i in outside]
+        self.remove_indices(outside)
+        return frozen
+
+    def set_platforms(self, platforms, rects=None):
+        """Platforms to collide with; rects, if given, are the parts to look them up by (e.g. clipped ones)"""
+        self.platforms = PlatformColumns([p.rect for p in platforms], spans=rects)
+
+    # ===== SIMULATION =====
+
+    def _views(self):
+        """Live slice of every field array, in FIELDS order"""
+        return [getattr(self, "_" + name)[:self.size] for name, _ in self.FIELDS]
+
+    def rects(self):
+        """Integer collision rect origins, truncated like pygame.Rect"""
+        return self._x[:self.size].astype(np.int64), self._y[:self.size].astype(np.int64)
+
+    def update(self, level_width):
+        """Step every enemy: movement through the platforms, despawning and wall bounces"""
+        if not self.size:
+            return
+        x, y, vel_x, vel_y, kind, _, on_ground, anim_frame, bob_offset, _ = self._views()
+        flying = kind == FLYING
+
+        # Gravity for walkers, bobbing for flyers (Enemy.update)
+        falling = ~flying & ~on_ground
+        vel_y[falling] = np.minimum(vel_y[falling] + GRAVITY, MAX_FALL_SPEED)
+        bob_offset[flying] += 0.1
+
+        self._move(x, y, vel_x, vel_y, on_ground)
+
+        anim_frame += 0.2
+        anim_frame[anim_frame > 6] = 0
+
+        # Die once outside the level
+        alive = (x >= -DESPAWN_MARGIN) & (x <= level_width + DESPAWN_MARGIN) & (y <= SCREEN_HEIGHT)
+        if not alive.all():
+            self.keep(alive)
+            x, y, vel_x, vel_y, kind, _, on_ground, anim_frame, bob_offset, _ = self._views()
+            flying = kind == FLYING
+
+        # Walls; flying enemies turn back earlier
+        right_wall = np.where(flying, level_width - 100, level_width)
+        bounce = (x < 0) | (x > right_wall)
+        vel_x[bounce] *= -1
+
+    def _move(self, x, y, vel_x, vel_y, on_ground):
+        """Move every enemy by its velocity through the platforms, a batch of impacts at a time"""
+        platforms = self.platforms
+        on_ground[:] = False
+        dx = vel_x.copy()
+        dy = vel_y.copy()
+        moving = np.flatnonzero((dx != 0) | (dy != 0))
+        for _ in range(MAX_IMPACTS):
+            if not len(moving):
+                break
+            first, time, side = platforms.first_impact(x[moving], y[moving], ENEMY_WIDTH, ENEMY_HEIGHT,
+                                                       dx[moving], dy[moving])
+            hit = first < platforms.count
+            free = moving[~hit]
+            x[free] += dx[free]
+            y[free] += dy[free]
+            moving, first, time, side = moving[hit], first[hit], time[hit], side[hit]
+            x[moving] += dx[moving] * time
+            y[moving] += dy[moving] * time
+            remaining = 1 - time
+
+            # Sides: stop flush and turn round; any fall carries on
+            walls, wall = moving[side], first[side]
+            x[walls] = np.where(dx[walls] > 0, platforms.left[wall] - ENEMY_WIDTH, platforms.right[wall])
+            vel_x[walls] *= -1
+            dx[walls] = 0
+            dy[walls] *= remaining[side]
+
+            # Tops and undersides: stop flush, landing on tops; the walk carries on
+            floors, floor = moving[~side], first[~side]
+            down = dy[floors] > 0
+            y[floors] = np.where(down, platforms.top[floor] - ENEMY_HEIGHT, platforms.bottom[floor])
+            on_ground[floors[down]] = True
+            vel_y[floors] = 0
+            dx[floors] *= remaining[~side]
+            dy[floors] = 0
+
+            moving = moving[(dx[moving] != 0) | (dy[moving] != 0)]
+
+    def overlapping(self, rect):
+        """Indices of enemies whose collision rect overlaps rect, in order"""
+        rect = pygame.Rect(rect)
+        x, y = self.rects()
+        hit = ((x < rect.right) & (x + ENEMY_WIDTH > rect.left) &
+               (y < rect.bottom) & (y + ENEMY_HEIGHT > rect.top))
+        return np.flatnonzero(hit)
+
+    def center_y(self, i):
+        return int(self._y[i]) + ENEMY_HEIGHT // 2
+
+    def center(self, i):
+        return float(self._x[i]) + ENEMY_WIDTH / 2, float(self._y[i]) + ENEMY_HEIGHT / 2
+
+    # ===== DRAWING =====
+
+    def sprites(self, camera_x, cull_margin=50):
+        """(sprite key, screen position) for the enemies near the viewport, in order"""
+        x, y = self.rects()
+        screen_x = x - camera_x
+        visible = np.flatnonzero((screen_x > -cull_margin) & (screen_x < SCREEN_WIDTH + cull_margin))
+        # Same as Enemy.get_bob_y: 2 * |sin| of the bob angle in degrees
+        bob = (2 * np.abs(np.sin(np.radians(self._bob_offset[visible])))).astype(np.int64)
+        sprites = []
+        for i, bob_y in zip(visible, bob):
+            kind = self._kind[i]
+            if kind == GOOMBA:
+                key = ("goomba", 0, int(self._direction[i]), 0)
+            elif kind == KOOPA:
+                key = ("koopa", 0, 1, 0)
+            else:
+                key = ("flying", 0, 1, int(bob_y))
+            sprites.append((key, (int(x[i]) - camera_x, int(y[i]))))
+        return sprites
@@ -1,13 +1,37 @@
+import os
+import numpy as np
 import pygame
 from utils.constants import *
 from utils.sound_manager import SoundManager
 from utils.score_manager import ScoreManager
+from utils.text_cache import get_text_renderer
+from utils.particle import ParticleSystem
 from .player import MarioPlayer
 from .enemies import Enemy
-from .platforms import Platform
-from .items import Coin
-from .powerups import PowerUp
-from .checkpoint import Checkpoint
+from .background import get_shared_background
+from .atlas import get_mario_atlas
+from .tilemap import LevelTilemap
+from .spatial_hash import SpatialHash
+from .enemy_store import EnemyStore, ENEMY_TYPES
+from .activation import DormantList, ACTIVE_MARGIN, SLEEP_MARGIN
+from .systems import (create_world, spawn_coins, spawn_powerups, spawn_checkpoints, AnimationSystem,
+                      PhysicsSystem, CollisionSystem, PickupSystem, RenderSystem, COIN, CHECKPOINT,
+                      PICKUP_KINDS, PICKUP_GROUPS)
+from .level_format import open_level, POWERUP_TYPES
+from .level_stream import LevelStream, LOAD_MARGIN
+from .collision import move_and_collide, swept_bounds, TOP, BOTTOM
+
+
+# Pickup kind of each level file power-up type
+POWERUP_KINDS = np.array([PICKUP_KINDS.index(power_type) for power_type in POWERUP_TYPES])
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+
+
+def level_path(level):
+    """JSON source of a level (opened through its compiled cache), or the compiled file shipped alone"""
+    source = os.path.join(LEVELS_DIR, f"level{level}.json")
+    return source if os.path.exists(source) else os.path.join(LEVELS_DIR, f"level{level}.mlvl")
 
 
 class MarioGame:
@@ -15,10 +39,14 @@ class MarioGame:
     def __init__(self):
         self.player = MarioPlayer(50, GROUND_Y - 48)
         self.platforms = []
-        self.enemies = []
-        self.coins = []
-        self.powerups = []
-        self.checkpoints = []
+        self.enemies = EnemyStore()
+        # Coins, power-ups and checkpoints are entities stepped by systems
+        self.world = create_world()
+        self.world.add_system(AnimationSystem())
+        self.world.add_system(PhysicsSystem())
+        self.pickup_collision = self.world.add_system(CollisionSystem(self.player))
+        self.world.add_system(PickupSystem(self.pickup_collision, self.collect_pickup))
+        self.renderer = RenderSystem()
         self.level = 1
         self.game_over = False
         self.won = False
@@ -28,93 +56,124 @@ class MarioGame:
         self.sound_manager = SoundManager()  # Initialize sound manager
         self.score_manager = ScoreManager("mario")  # Initialize score manager
         self.last_checkpoint_x = 50  # Track last checkpoint position
+        self.background = get_shared_background()  # Baked lazily on first draw
+        self.particles = ParticleSystem()  # Coin and stomp effects
+        
+        # Entities far from the camera are frozen in these until it comes near
+        self.active_margin = ACTIVE_MARGIN
+        self.sleep_margin = SLEEP_MARGIN
+        self.dormant_enemies = DormantList()
+        self.dormant_entities = DormantList()
+        
+        # Level chunks this close to the camera are loaded
+        self.load_margin = LOAD_MARGIN
+        self.level_stream = None
         self.create_level()
     
     def create_level(self):
-        """Create level layout"""
-        self.platforms.clear()
+        """Load the current level's file"""
+        self.load_level(open_level(level_path(self.level)))
+    
+    def load_level(self, level_file):
+        """Start a level from a LevelFile, streaming in the chunks around the camera"""
+        if self.level_stream is not None:
+            self.level_stream.level_file.close()
+        self.platforms = []
         self.enemies.clear()
-        self.coins.clear()
-        self.powerups.clear()
+        self.world.clear()
         self.player.score = 0
         self.player.coins = 0
-        
-        # Extended ground across entire level
-        self.platforms.append(Platform(0, GROUND_Y, self.level_width, 50, "normal"))
-        
-        # Level 1 layout - Extended horizontally
-        if self.level == 1:
-            # First section (starting area)
-            self.platforms.append(Platform(150, 450, 150, 20, "normal"))
-            self.platforms.append(Platform(400, 380, 150, 20, "normal"))
-            self.platforms.append(Platform(650, 310, 150, 20, "normal"))
-            self.platforms.append(Platform(250, 300, 150, 20, "coin"))
-            self.platforms.append(Platform(800, 400, 150, 20, "normal"))
-            self.platforms.append(Platform(1000, 450, 150, 20, "normal"))
-            self.platforms.append(Platform(600, 200, 200, 20, "normal"))
-            
-            # Spike platform
-            self.platforms.append(Platform(300, 550, 100, 20, "spike"))
-            
-            # Second section (extended to right)
-            self.platforms.append(Platform(1200, 420, 150, 20, "normal"))
-            self.platforms.append(Platform(1450, 380, 140, 20, "normal"))
-            self.platforms.append(Platform(1700, 340, 150, 20, "coin"))
-            self.platforms.append(Platform(1950, 400, 150, 20, "normal"))
-            
-            # Elevated platforms in second section
-            self.platforms.append(Platform(1300, 300, 120, 20, "normal"))
-            self.platforms.append(Platform(1550, 250, 140, 20, "normal"))
-            self.platforms.append(Platform(1800, 280, 120, 20, "normal"))
-            
-            # Peak in second section
-            self.platforms.append(Platform(1400, 150, 180, 20, "normal"))
-            
-            # Coins throughout
-            self.coins.append(Coin(200, 400))
-            self.coins.append(Coin(450, 330))
-            self.coins.append(Coin(700, 260))
-            self.coins.append(Coin(850, 350))
-            self.coins.append(Coin(1050, 400))
-            self.coins.append(Coin(1250, 370))
-            self.coins.append(Coin(1500, 330))
-            self.coins.append(Coin(1750, 290))
-            self.coins.append(Coin(1450, 100))
-            
-            # Power-ups
-            self.powerups.append(PowerUp(320, 480, "mushroom"))  # Mushroom for growing
-            self.powerups.append(PowerUp(1500, 200, "star"))  # Star for invincibility
-            self.powerups.append(PowerUp(700, 140, "shield"))  # Shield for protection
-            
-            # Mixed enemy types for variety
-            self.enemies.append(Enemy(400, 340, 1, "goomba"))
-            self.enemies.append(Enemy(700, 270, -1, "goomba"))
-            self.enemies.append(Enemy(1000, 400, 1, "koopa"))  # Faster Koopa
-            self.enemies.append(Enemy(1250, 370, 1, "goomba"))
-            self.enemies.append(Enemy(1400, 100, -1, "flying"))  # Flying enemy on peak
-            self.enemies.append(Enemy(1800, 230, 1, "koopa"))
-            self.coins.append(Coin(800, 230))
-            self.coins.append(Coin(1050, 390))
-            self.coins.append(Coin(700, 100))
-            
-            # More enemies with different patterns
-            self.enemies.append(Enemy(300, 370, 1))
-            self.enemies.append(Enemy(600, 310, -1))
-            self.enemies.append(Enemy(850, 370, 1))
-            self.enemies.append(Enemy(400, 130, -1))
-            self.enemies.append(Enemy(800, 100, 1))
-            
-            # Add checkpoints throughout the level
-            self.checkpoints.append(Checkpoint(500, GROUND_Y))   # Early checkpoint
-            self.checkpoints.append(Checkpoint(1000, GROUND_Y))  # Mid checkpoint
-            self.checkpoints.append(Checkpoint(1500, GROUND_Y))  # Late checkpoint
+        self.level_stream = LevelStream(level_file, self.load_margin)
+        self.level_width = level_file.width
+        
+        # Geometry arrives chunk by chunk, so the tilemap is told the full height up front
+        self.tilemap = LevelTilemap([], extent=(level_file.top, level_file.bottom))
+        self.platform_grid = SpatialHash()
+        self.dormant_enemies.clear()
+        self.dormant_entities.clear()
+        self.stream_level()
+        
+        # Freeze everything outside the starting view
+        self.update_activation()
+        self.world.flush()
+    
+    def stream_level(self):
+        """Load level chunks approaching the camera and release the ones left far behind"""
+        changes = self.level_stream.update(self.camera_x)
+        
+        # Frozen entities in unloaded chunks are dropped; they respawn from the file later
+        for left, right in changes.unloaded:
+            dropped = self.dormant_enemies.drop(left, right)
+            self.level_stream.release("enemies", [enemy.spawn_index for enemy in dropped])
+            for components in self.dormant_entities.drop(left, right):
+                if "spawn" in components:
+                    group = PICKUP_GROUPS[components["pickup"]["kind"]]
+                    self.level_stream.release(group, [components["spawn"]["index"]])
+        
+        # Spawn in level order, as if the chunks were one list
+        if changes.loaded:
+            def records(kind):
+                table = np.concatenate([getattr(chunk, kind) for chunk in changes.loaded])
+                return table[np.argsort(table["index"], kind="stable")]
+            coins = records("coins")
+            spawn_coins(self.world, coins["x"], coins["y"], coins["index"])
+            powerups = records("powerups")
+            spawn_powerups(self.world, powerups["x"], powerups["y"], POWERUP_KINDS[powerups["type"]],
+                           powerups["index"])
+            for index, x, y, direction, enemy_type in records("enemies").tolist():
+                enemy = Enemy(x, y, direction, ENEMY_TYPES[enemy_type])
+                enemy.spawn_index = index
+                self.enemies.append(enemy)
+            checkpoints = records("checkpoints")
+            spawn_checkpoints(self.world, checkpoints["x"], checkpoints["y"], checkpoints["index"])
+        
+        # Re-index the loaded geometry, clipped so level-wide platforms stay cheap
+        if changes.platforms_changed:
+            loaded = self.level_stream.level_platforms()
+            released = set(self.platforms)
+            self.platforms = [platform for platform, _ in loaded]
+            rects = [rect for _, rect in loaded]
+            # Only platforms that arrived, left or had their clipped rect change touch the grid
+            released.difference_update(self.platforms)
+            for platform in released:
+                self.platform_grid.remove(platform)
+            for platform, rect in loaded:
+                if platform in self.platform_grid:
+                    self.platform_grid.move(platform, rect)
+                else:
+                    self.platform_grid.insert(platform, rect)
+            self.tilemap.set_platforms(self.platforms, rects)
+            self.enemies.set_platforms(self.platforms, rects)
+    
+    def update_activation(self):
+        """Freeze entities that left the window around the camera and wake the ones it reached"""
+        # Freeze (with a wider margin than waking, so edges don't flicker)
+        left = self.camera_x - self.sleep_margin
+        right = self.camera_x + SCREEN_WIDTH + self.sleep_margin
+        for enemy in self.enemies.freeze_outside(left, right):
+            self.dormant_enemies.add(enemy.x, enemy)
+        slots, (position,) = self.world.query("position")
+        x = self.world.components["position"]["x"][position]
+        outside = (x < left) | (x > right)
+        for slot, entity_x in zip(slots[outside], x[outside]):
+            entity = self.world.entity(slot)
+            self.dormant_entities.add(float(entity_x), self.world.snapshot(entity))
+            self.world.destroy(entity)
+        
+        # Wake
+        left = self.camera_x - self.active_margin
+        right = self.camera_x + SCREEN_WIDTH + self.active_margin
+        self.enemies.extend(self.dormant_enemies.wake(left, right))
+        for components in self.dormant_entities.wake(left, right):
+            self.world.create(**components)
     
     def update(self):
         """Update game state"""
         if self.game_over or self.won:
             return
         
-        self.player.update()
+        # Move the player through the platforms
+        self.player.update(self.move_player)
         
         # Update camera position to follow player
         # Keep player near center of screen
@@ -122,79 +181,60 @@ class MarioGame:
         # Clamp camera to level bounds
         self.camera_x = max(0, min(self.camera_x, self.level_width - SCREEN_WIDTH))
         
-        # Check platform collisions
-        self.check_platform_collisions()
+        # Only chunks near the camera are loaded, and only entities near it simulated
+        self.stream_level()
+        self.update_activation()
         
-        # Check coin collisions
-        for coin in self.coins[:]:
-            if self.player.get_rect().colliderect(coin.get_rect()):
-                self.coins.remove(coin)
-                self.player.score += 100
-                self.player.coins += 1
-                self.sound_manager.play('coin')  # Play coin sound
-            else:
-                coin.update()
+        # Coin and stomp effects
+        self.particles.update()
         
-        # Check power-up collisions
-        for powerup in self.powerups[:]:
-            powerup.update()
-            if powerup.active and self.player.get_rect().colliderect(powerup.get_rect()):
-                self.powerups.remove(powerup)
-                self._apply_powerup(powerup.power_type)
-                self.sound_manager.play('powerup')  # Play power-up sound
+        # Bob, fall and collect the pickups
+        self.world.update()
         
-        # Update and check enemy collisions
-        for enemy in self.enemies[:]:
-            if not enemy.update():
-                self.enemies.remove(enemy)
-                continue
-            
-            # Wall collision (for non-flying enemies)
-            if enemy.enemy_type != "flying":
-                if enemy.x < 0 or enemy.x > self.level_width:
-                    enemy.vel_x *= -1
-            else:
-                # Flying enemies bounce around more
-                if enemy.x < 0 or enemy.x > self.level_width - 100:
-                    enemy.vel_x *= -1
-            
-            # Platform collision
-            enemy.on_ground = False
-            for platform in self.platforms:
-                if enemy.get_rect().colliderect(platform.rect):
-                    if enemy.vel_y > 0:
-                        enemy.y = platform.rect.top - enemy.height
-                        enemy.vel_y = 0
-                        enemy.on_ground = True
-            
-            # Enemy-player collision
-            if self.player.get_rect().colliderect(enemy.get_rect()):
-                if self.player.vel_y > 0 and self.player.y + self.player.height < enemy.get_rect().centery:
-                    # Jumped on enemy
-                    self.enemies.remove(enemy)
-                    self.player.score += 200
-                    self.player.vel_y = -8
-                else:
-                    # Hit by enemy
-                    if self.player.invincible_timer <= 0 and self.player.shield_timer <= 0:
-                        self.player.lives -= 1
-                        self.player.invincible_timer = 120
-                        if self.player.lives <= 0:
-                            self.game_over = True
-                    elif self.player.shield_timer > 0:
-                        # Shield protects once
-                        self.player.shield_timer = 0
+        player_rect = self.player.get_rect()
         
-        # Check checkpoint collisions
-        for checkpoint in self.checkpoints:
-            if self.player.get_rect().colliderect(checkpoint.get_rect()):
-                self.last_checkpoint_x = checkpoint.x
+        # Move every enemy at once (movement never depends on the player)
+        self.enemies.update(self.level_width)
+        
+        # Enemy-player collision, in enemy order
+        stomped = []
+        for i in self.enemies.overlapping(player_rect):
+            if self.player.vel_y > 0 and self.player.y + self.player.height < self.enemies.center_y(i):
+                # Jumped on enemy
+                stomped.append(i)
+                self.particles.emit(*self.enemies.center(i), 10, (139, 69, 19), 20)
+                self.player.score += 200
+                self.player.vel_y = -8
+            else:
+                # Hit by enemy
+                if self.player.invincible_timer <= 0 and self.player.shield_timer <= 0:
+                    self.player.lives -= 1
+                    self.player.invincible_timer = 120
+                    if self.player.lives <= 0:
+                        self.game_over = True
+                elif self.player.shield_timer > 0:
+                    # Shield protects once
+                    self.player.shield_timer = 0
+        self.enemies.remove_indices(stomped)
         
         # Check win condition
         if self.player.coins >= 9:
             self.won = True
             self.sound_manager.play('victory')  # Play victory sound
     
+    def collect_pickup(self, kind, x, y):
+        """Apply the effect of a pickup the player touched at (x, y)"""
+        if kind == COIN:
+            self.player.score += 100
+            self.player.coins += 1
+            self.sound_manager.play('coin')  # Play coin sound
+            self.particles.emit(x + 8, y + 8, 12, (255, 215, 0), 20, speed=(1, 3), angle=(180, 360))
+        elif kind == CHECKPOINT:
+            self.last_checkpoint_x = int(x)
+        else:
+            self._apply_powerup(PICKUP_KINDS[kind])
+            self.sound_manager.play('powerup')  # Play power-up sound
+    
     def _apply_powerup(self, power_type):
         """Apply power-up effect to player"""
         if power_type == "mushroom":
@@ -208,27 +248,38 @@ class MarioGame:
             self.player.shield_timer = 300  # Shield lasts 5 seconds
             self.player.score += 250
     
-    def check_platform_collisions(self):
-        """Check collision with platforms"""
-        self.player.on_ground = False
-        
-        for platform in self.platforms:
-            player_rect = self.player.get_rect()
-            
-            if player_rect.colliderect(platform.rect):
-                # Coming from above
-                if self.player.vel_y > 0 and player_rect.bottom > platform.rect.top:
-                    self.player.y = platform.rect.top - self.player.height
-                    self.player.vel_y = 0
-                    self.player.on_ground = True
-                    self.player.is_jumping = False
-                    
-                    # Spike damage
-                    if platform.platform_type == "spike" and self.player.invincible_timer <= 0:
-                        self.player.lives -= 1
-                        self.player.invincible_timer = 120
-                        if self.player.lives <= 0:
-                            self.game_over = True
+    def music_state(self):
+        """(track, tempo scale, layers) for the music, or None for silence"""
+        if self.game_over:
+            return None
+        player = self.player
+        powered = player.is_powered_up or player.shield_timer > 0 or player.invincible_timer > 0
+        return "mario", 1.25 if self.won else 1.0, {"sparkle": powered}
+    
+    def move_player(self, player):
+        """Sweep the player by its velocity, colliding with every side of the platforms"""
+        player.on_ground = False
+        bounds = swept_bounds(player.x, player.y, player.width, player.height, player.vel_x, player.vel_y)
+        candidates = self.platform_grid.query(bounds)
+        player.x, player.y, contacts = move_and_collide(
+            player.x, player.y, player.width, player.height, player.vel_x, player.vel_y, candidates)
+        
+        for platform, normal in contacts:
+            if normal == TOP:
+                # Landed
+                player.vel_y = 0
+                player.on_ground = True
+                player.is_jumping = False
+                
+                # Spike damage
+                if platform.platform_type == "spike" and player.invincible_timer <= 0:
+                    player.lives -= 1
+                    player.invincible_timer = 120
+                    if player.lives <= 0:
+                        self.game_over = True
+            elif normal == BOTTOM:
+                # Bumped head
+                player.vel_y = 0
     
     def handle_input(self, keys):
         """Handle player input"""
@@ -242,167 +293,45 @@ class MarioGame:
         if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]:
             self.player.jump()
     
-    def draw(self, surface):
-        """Draw game"""
-        # Sky gradient (blue) - full screen
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / GROUND_Y
-            r = int(135 + (100 - 135) * min(color_ratio, 1.0))
-            g = int(206 + (150 - 206) * min(color_ratio, 1.0))
-            b = int(250 + (220 - 250) * min(color_ratio, 1.0))
-            pygame.draw.line(surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-        
-        # Clouds in background (parallax effect - scrolls slower)
-        cloud_y = 80
-        parallax_offset = int(self.camera_x * 0.3)  # Clouds move slower
-        for cloud_x in range(-parallax_offset, SCREEN_WIDTH + 200, 300):
-            adjusted_x = cloud_x + parallax_offset
-            if -100 < adjusted_x < SCREEN_WIDTH + 100:
-                # Cloud shadow
-                pygame.draw.ellipse(surface, (150, 150, 200), 
-                                  pygame.Rect(adjusted_x - 40, cloud_y + 20, 100, 30))
-                # Cloud
-                pygame.draw.circle(surface, (255, 255, 255), (adjusted_x - 20, cloud_y), 30)
-                pygame.draw.circle(surface, (255, 255, 255), (adjusted_x, cloud_y), 35)
-                pygame.draw.circle(surface, (255, 255, 255), (adjusted_x + 20, cloud_y), 30)
-        
-        # Ground/grass transition
-        for y in range(GROUND_Y, GROUND_Y + 20):
-            color_ratio = (y - GROUND_Y) / 20
-            r = int(100 + (50 - 100) * color_ratio)
-            g = int(150 + (100 - 150) * color_ratio)
-            b = int(220 + (50 - 220) * color_ratio)
-            pygame.draw.line(surface, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-        
-        # Ground (brown)
-        pygame.draw.rect(surface, (80, 60, 40), (0, GROUND_Y + 20, SCREEN_WIDTH, SCREEN_HEIGHT - GROUND_Y - 20))
-        
-        # Distant mountains/hills (parallax background - slower scroll)
-        mountain_color = (100, 120, 100)
-        mountain_parallax = int(self.camera_x * 0.2)
-        pygame.draw.polygon(surface, mountain_color, [
-            (-mountain_parallax, GROUND_Y - 100),
-            (300 - mountain_parallax, GROUND_Y - 150),
-            (600 - mountain_parallax, GROUND_Y - 80),
-            (900 - mountain_parallax, GROUND_Y - 140),
-            (SCREEN_WIDTH - mountain_parallax, GROUND_Y - 100),
-            (SCREEN_WIDTH, GROUND_Y),
-            (0, GROUND_Y)
-        ])
-        
-        # Mountain highlights
-        pygame.draw.line(surface, (140, 160, 140), (300 - mountain_parallax, GROUND_Y - 150), 
-                        (600 - mountain_parallax, GROUND_Y - 80), 2)
-        
-        # Draw platforms with camera offset
-        for platform in self.platforms:
-            platform_screen_x = platform.rect.x - self.camera_x
-            # Only draw platforms on screen
-            if -100 < platform_screen_x < SCREEN_WIDTH + 100:
-                # Draw platform manually with offset
-                if platform.platform_type == "normal":
-                    base_color = (100, 130, 50)
-                    pygame.draw.rect(surface, base_color, 
-                                   (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height))
-                    pygame.draw.line(surface, (140, 170, 80), (platform_screen_x, platform.rect.y), 
-                                   (platform_screen_x + platform.rect.width, platform.rect.y), 3)
-                    pygame.draw.line(surface, (60, 80, 20), (platform_screen_x, platform.rect.y + platform.rect.height - 1), 
-                                   (platform_screen_x + platform.rect.width, platform.rect.y + platform.rect.height - 1), 2)
-                    for i in range(0, platform.rect.width, 16):
-                        pygame.draw.rect(surface, (80, 110, 40), (platform_screen_x + i, platform.rect.y, 15, platform.rect.height), 1)
-                    pygame.draw.rect(surface, (50, 70, 20), (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height), 2)
-                
-                elif platform.platform_type == "coin":
-                    platform_color = (200, 150, 0)
-                    pygame.draw.rect(surface, platform_color, 
-                                   (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height))
-                    pygame.draw.line(surface, (255, 200, 50), (platform_screen_x, platform.rect.y), 
-                                   (platform_screen_x + platform.rect.width, platform.rect.y), 3)
-                    pygame.draw.circle(surface, (255, 220, 0), (int(platform_screen_x + platform.rect.width // 2), int(platform.rect.centery)), 10)
-                    pygame.draw.rect(surface, (150, 100, 0), (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height), 2)
-                
-                elif platform.platform_type == "spike":
-                    platform_color = (120, 20, 20)
-                    pygame.draw.rect(surface, platform_color, 
-                                   (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height))
-                    for i in range(platform.rect.x, platform.rect.x + platform.rect.width, 10):
-                        spike_x = i - self.camera_x
-                        pygame.draw.polygon(surface, (200, 60, 60), [
-                            (spike_x, platform.rect.y),
-                            (spike_x + 5, platform.rect.y - 10),
-                            (spike_x + 10, platform.rect.y)
-                        ])
-                    pygame.draw.rect(surface, (80, 10, 10), (platform_screen_x, platform.rect.y, platform.rect.width, platform.rect.height), 2)
-        
-        # Draw coins with camera offset
-        for coin in self.coins:
-            coin_screen_x = coin.x - self.camera_x
-            if -20 < coin_screen_x < SCREEN_WIDTH + 20:
-                coin.draw(surface)
-                # Adjust coin position for drawing
-                original_x = coin.x
-                coin.x = coin_screen_x
-                coin.draw(surface)
-                coin.x = original_x
-        
-        # Draw power-ups with camera offset
-        for powerup in self.powerups:
-            powerup_screen_x = powerup.x - self.camera_x
-            if -30 < powerup_screen_x < SCREEN_WIDTH + 30:
-                original_x = powerup.x
-                powerup.x = powerup_screen_x
-                powerup.draw(surface)
-                powerup.x = original_x
-        
-        # Draw enemies with camera offset
-        for enemy in self.enemies:
-            enemy_screen_x = enemy.x - self.camera_x
-            if -50 < enemy_screen_x < SCREEN_WIDTH + 50:
-                original_x = enemy.x
-                enemy.x = enemy_screen_x
-                enemy.draw(surface)
-                enemy.x = original_x
-        
-        # Draw checkpoints with camera offset
-        for checkpoint in self.checkpoints:
-            checkpoint_screen_x = checkpoint.x - self.camera_x
-            if -50 < checkpoint_screen_x < SCREEN_WIDTH + 50:
-                original_x = checkpoint.x
-                checkpoint.x = checkpoint_screen_x
-                checkpoint.draw(surface)
-                checkpoint.x = original_x
-        
-        # Draw player with camera offset
-        player_screen_x = self.player.x - self.camera_x
-        original_x = self.player.x
-        self.player.x = player_screen_x
-        self.player.draw(surface)
-        self.player.x = original_x
+    def draw(self, surface, camera_x=None, player_offset=(0, 0)):
+        """Draw game, from camera_x if given, with the player shifted by player_offset"""
+        if camera_x is None:
+            camera_x = self.camera_x
+        
+        # Sky, clouds, mountains and ground from the baked parallax layers
+        self.background.draw(surface, camera_x)
+        
+        # Level geometry from the pre-rendered chunks around the camera
+        self.tilemap.draw(surface, camera_x)
+        
+        # Coins, power-ups and enemies come from the sprite atlas in one batch
+        atlas = get_mario_atlas()
+        sprites = []
+        for key, (screen_x, y) in self.renderer.sprites(self.world, camera_x):
+            sprites.append(atlas.blit_args(key, screen_x, y))
+        for key, (screen_x, y) in self.enemies.sprites(camera_x, 50):
+            sprites.append(atlas.blit_args(key, screen_x, y))
+        surface.blits(sprites, False)
+        self.particles.draw(surface, camera_x)
+        
+        # Checkpoints and the player, drawn with the camera offset
+        self.renderer.draw_flags(surface, self.world, camera_x)
+        self.player.draw(surface, camera_x - player_offset[0], -player_offset[1])
         
         # Draw HUD
         self.draw_hud(surface)
     
     def draw_hud(self, surface):
         """Draw heads-up display"""
-        font_small = pygame.font.Font(None, 32)
+        text = get_text_renderer()
         
         # HUD background
-        hud_bg = pygame.Surface((400, 140))
-        hud_bg.set_alpha(200)
-        hud_bg.fill((0, 0, 0))
-        surface.blit(hud_bg, (10, 10))
-        
-        # Score
-        score_text = font_small.render(f"Score: {self.player.score}", True, (255, 255, 0))
-        surface.blit(score_text, (20, 20))
-        
-        # Coins
-        coins_text = font_small.render(f"Coins: {self.player.coins}/9", True, (255, 200, 0))
-        surface.blit(coins_text, (20, 50))
+        surface.blit(text.panel((400, 140)), (10, 10))
         
-        # Lives
-        lives_text = font_small.render(f"Lives: {self.player.lives}", True, (255, 0, 0))
-        surface.blit(lives_text, (20, 80))
+        # Score, coins and lives
+        text.draw_field(surface, "Score: ", self.player.score, 32, (255, 255, 0), (20, 20))
+        text.draw_field(surface, "Coins: ", self.player.coins, 32, (255, 200, 0), (20, 50), "/9")
+        text.draw_field(surface, "Lives: ", self.player.lives, 32, (255, 0, 0), (20, 80))
         
         # Power-up status
         powerup_text = "Power: "
@@ -419,21 +348,15 @@ class MarioGame:
         else:
             powerup_text += "NONE"
         
-        power_text = font_small.render(powerup_text, True, powerup_color)
-        surface.blit(power_text, (220, 20))
+        text.draw(surface, powerup_text, 32, powerup_color, (220, 20))
         
         # Level progress
-        progress_text = font_small.render(f"X: {int(self.player.x)}/2000", True, (150, 255, 150))
-        surface.blit(progress_text, (220, 50))
+        text.draw_field(surface, "X: ", self.player.x, 32, (150, 255, 150), (220, 50), "/2000")
         
         # Game over
         if self.game_over:
-            font_large = pygame.font.Font(None, 72)
-            game_over_text = font_large.render("GAME OVER", True, RED)
-            surface.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 300))
+            text.draw_centered(surface, "GAME OVER", 72, RED, SCREEN_WIDTH // 2, 300)
         
         # Win
         if self.won:
-            font_large = pygame.font.Font(None, 72)
-            win_text = font_large.render("YOU WIN!", True, GREEN)
-            surface.blit(win_text, (SCREEN_WIDTH // 2 - win_text.get_width() // 2, 300))
+            text.draw_centered(surface, "YOU WIN!", 72, GREEN, SCREEN_WIDTH // 2, 300)
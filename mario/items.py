@@ -18,8 +18,25 @@ class Coin:
         return pygame.Rect(self.x, self.y - abs(5 * pygame.math.Vector2(1, 0).rotate(self.bob * 10).y), 
                           self.width, self.height)
     
-    def draw(self, surface):
+    def get_sprite(self):
+        """Sprite key (type, frame, direction, shine) and integer anchor for the atlas"""
         rect = self.get_rect()
+        shine_offset = int(2 * pygame.math.Vector2(1, 0).rotate(self.bob * 10).y)
+        return ("coin", 0, 1, shine_offset), (rect.x, rect.y)
+    
+    @classmethod
+    def sprite_keys(cls):
+        """Every distinct frame the coin drawing code can produce"""
+        return [("coin", 0, 1, shine_offset) for shine_offset in range(-2, 3)]
+    
+    def draw(self, surface):
+        key, (x, y) = self.get_sprite()
+        self.draw_frame(surface, x, y, key)
+    
+    def draw_frame(self, surface, x, y, key):
+        """Draw the frame described by a sprite key with its top-left at (x, y)"""
+        rect = pygame.Rect(x, y, self.width, self.height)
+        shine_offset = key[3]
         
         # Outer coin ring (dark gold)
         pygame.draw.circle(surface, (200, 150, 0), (int(rect.centerx), int(rect.centery)), 8)
@@ -31,7 +48,6 @@ class Coin:
         pygame.draw.circle(surface, (255, 240, 100), (int(rect.centerx), int(rect.centery)), 5)
         
         # Coin shine highlight (simulates reflection)
-        shine_offset = int(2 * pygame.math.Vector2(1, 0).rotate(self.bob * 10).y)
         pygame.draw.circle(surface, (255, 255, 150), 
                           (int(rect.centerx - 2 + shine_offset), int(rect.centery - 3)), 2)
         
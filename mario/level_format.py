@@ -0,0 +1,278 @@
+"""Mario level files: JSON for authoring, compiled to chunked NumPy tables for streaming.
+
+A compiled .mlvl file is a header, a table of per-chunk row offsets and one
+packed record table per kind of entity, sorted by chunk. The file is memory
+mapped and every table is a NumPy view into it, so opening a level reads
+only the header and a chunk is two slices per kind. Each chunk holds the
+entities whose x falls inside it plus every platform overlapping it;
+records carry their index in the JSON lists so decompiling gives back the
+exact authored level.
+
+The header also stores a hash of the JSON source. open_level() compiles a
+source to the .mlvl next to it and recompiles whenever the hash no longer
+matches, so a stale level cache never loads. Run
+`python -m mario.compile_levels levels/*.json` to compile levels ahead of time.
+"""
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+from utils.files import write_atomic
+from .enemy_store import ENEMY_TYPES
+
+
+MAGIC = b"MLVL"
+VERSION = 2
+CHUNK_WIDTH = 512
+
+PLATFORM_TYPES = ("normal", "coin", "spike")
+POWERUP_TYPES = ("mushroom", "star", "shield")
+
+# magic, version, chunk width, level width, platform top, platform bottom,
+# chunk count, platform count, SHA-1 of the JSON source; padded to 64 bytes
+HEADER = struct.Struct("<4sHIiiiII20s14x")
+NO_SOURCE = bytes(20)
+
+# Every record starts with its index in the level's list of that kind
+PLATFORM = np.dtype([("index", "<u4"), ("x", "<i4"), ("y", "<i4"), ("width", "<i4"),
+                     ("height", "<i4"), ("type", "u1")])
+COIN = np.dtype([("index", "<u4"), ("x", "<i4"), ("y", "<i4")])
+POWERUP = np.dtype([("index", "<u4"), ("x", "<i4"), ("y", "<i4"), ("type", "u1")])
+ENEMY = np.dtype([("index", "<u4"), ("x", "<i4"), ("y", "<i4"), ("direction", "i1"), ("type", "u1")])
+CHECKPOINT = np.dtype([("index", "<u4"), ("x", "<i4"), ("y", "<i4")])  # x, y of the foot of the pole
+
+RECORDS = (("platforms", PLATFORM), ("coins", COIN), ("powerups", POWERUP),
+           ("enemies", ENEMY), ("checkpoints", CHECKPOINT))
+# Row where each chunk starts in each table, plus a final row for the end
+OFFSETS = np.dtype("<u4")
+
+
+class LevelFormatError(ValueError):
+    """Raised for level data that cannot be compiled or read"""
+
+
+# ===== JSON =====
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(level, path):
+    """Write a level with one entity per line, so diffs stay readable"""
+    lines = ["{"]
+    keys = list(level)
+    for position, key in enumerate(keys):
+        comma = "," if position < len(keys) - 1 else ""
+        value = level[key]
+        if isinstance(value, list):
+            items = [json.dumps(item) for item in value]
+            if items:
+                lines.append(f'  "{key}": [')
+                lines.extend("    " + item + ("," if i < len(items) - 1 else "") for i, item in enumerate(items))
+                lines.append("  ]" + comma)
+            else:
+                lines.append(f'  "{key}": []' + comma)
+        else:
+            lines.append(f'  "{key}": {json.dumps(value)}' + comma)
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ===== COMPILING =====
+
+def _int(value, what):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or int(value) != value:
+        raise LevelFormatError(f"{what} must be a whole number, got {value!r}")
+    return int(value)
+
+
+def _type_index(types, value, what):
+    if value not in types:
+        raise LevelFormatError(f"unknown {what} {value!r}; expected one of {', '.join(types)}")
+    return types.index(value)
+
+
+def _encode(kind, index, item):
+    """Record tuple for one JSON entity, starting with its index"""
+    x = _int(item["x"], f"{kind}[{index}].x")
+    y = _int(item["y"], f"{kind}[{index}].y")
+    if kind == "platforms":
+        return (index, x, y, _int(item["width"], f"platforms[{index}].width"),
+                _int(item["height"], f"platforms[{index}].height"),
+                _type_index(PLATFORM_TYPES, item.get("type", "normal"), "platform type"))
+    if kind == "powerups":
+        return index, x, y, _type_index(POWERUP_TYPES, item.get("type", "mushroom"), "power-up type")
+    if kind == "enemies":
+        direction = 1 if item.get("direction", 1) > 0 else -1
+        return index, x, y, direction, _type_index(ENEMY_TYPES, item.get("type", "goomba"), "enemy type")
+    return index, x, y
+
+
+def source_hash(data):
+    """Key a compiled level by the exact bytes of its JSON source"""
+    return hashlib.sha1(data).digest()
+
+
+def compile_level(level, chunk_width=CHUNK_WIDTH, source=NO_SOURCE):
+    """Binary form of a level dict; source is the hash of the JSON it came from"""
+    width = _int(level["width"], "width")
+    chunk_count = max(1, -(-width // chunk_width))
+
+    def chunk_of(x):
+        return min(max(x // chunk_width, 0), chunk_count - 1)
+
+    chunks = [{kind: [] for kind, _ in RECORDS} for _ in range(chunk_count)]
+    tops = []
+    bottoms = []
+    for kind, _ in RECORDS:
+        for index, item in enumerate(level.get(kind, [])):
+            record = _encode(kind, index, item)
+            if kind == "platforms":
+                # Stored in every chunk it overlaps, so any of them brings it in
+                x, y, w, h = record[1:5]
+                for chunk in range(chunk_of(x), chunk_of(x + w - 1) + 1):
+                    chunks[chunk][kind].append(record)
+                tops.append(y)
+                bottoms.append(y + h)
+            else:
+                chunks[chunk_of(record[1])][kind].append(record)
+
+    offsets = np.zeros((chunk_count + 1, len(RECORDS)), dtype=OFFSETS)
+    tables = []
+    for column, (kind, dtype) in enumerate(RECORDS):
+        rows = [record for chunk in chunks for record in chunk[kind]]
+        offsets[1:, column] = np.cumsum([len(chunk[kind]) for chunk in chunks])
+        tables.append(np.array(rows, dtype=dtype).tobytes())
+
+    header = HEADER.pack(MAGIC, VERSION, chunk_width, width, min(tops, default=0), max(bottoms, default=0),
+                         chunk_count, len(level.get("platforms", [])), source)
+    return header + offsets.tobytes() + b"".join(tables)
+
+
+def compile_file(source, target=None, chunk_width=CHUNK_WIDTH):
+    """Compile a JSON level to a .mlvl file next to it; returns the target path"""
+    target = target or os.path.splitext(source)[0] + ".mlvl"
+    with open(source, "rb") as f:
+        data = f.read()
+    write_atomic(target, compile_level(json.loads(data), chunk_width, source_hash(data)))
+    return target
+
+
+# ===== READING =====
+
+class LevelChunk:
+    """Records of one chunk, a structured NumPy array per kind"""
+    def __init__(self, index, left, right):
+        self.index = index
+        self.left = left
+        self.right = right
+
+
+class LevelFile:
+    """Random access to the chunks of a compiled level.
+
+    source is a path, which is memory mapped, or the compiled bytes. Tables
+    are views into the mapping, so nothing is read until it is used.
+    """
+    def __init__(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            if os.path.getsize(source) < HEADER.size:
+                raise LevelFormatError("not a compiled level file")
+            # A plain array over the mapping; memmap's own indexing is slow
+            self.data = np.memmap(source, dtype=np.uint8, mode="r").view(np.ndarray)
+        else:
+            self.data = np.frombuffer(source, dtype=np.uint8)
+        if len(self.data) < HEADER.size or bytes(self.data[:4]) != MAGIC:
+            raise LevelFormatError("not a compiled level file")
+        (_, version, self.chunk_width, self.width, self.top, self.bottom, self.chunk_count,
+         self.platform_count, self.source_hash) = HEADER.unpack(bytes(self.data[:HEADER.size]))
+        if version != VERSION:
+            raise LevelFormatError(f"unsupported level format version {version}")
+
+        position = HEADER.size + OFFSETS.itemsize * len(RECORDS) * (self.chunk_count + 1)
+        if len(self.data) < position:
+            raise LevelFormatError("truncated level file")
+        self.offsets = self.data[HEADER.size:position].view(OFFSETS).reshape(self.chunk_count + 1, len(RECORDS))
+        self.tables = {}
+        for column, (kind, dtype) in enumerate(RECORDS):
+            end = position + dtype.itemsize * int(self.offsets[-1, column])
+            if len(self.data) < end:
+                raise LevelFormatError("truncated level file")
+            self.tables[kind] = self.data[position:end].view(dtype)
+            position = end
+
+    def close(self):
+        """Drop the views, which unmaps the file once nothing else holds one"""
+        self.data = self.offsets = None
+        self.tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunk_range(self, index):
+        """Level x range [left, right) of a chunk"""
+        return index * self.chunk_width, (index + 1) * self.chunk_width
+
+    def read_chunk(self, index):
+        chunk = LevelChunk(index, *self.chunk_range(index))
+        start, end = self.offsets[index], self.offsets[index + 1]
+        for column, (kind, _) in enumerate(RECORDS):
+            setattr(chunk, kind, self.tables[kind][start[column]:end[column]])
+        return chunk
+
+
+def decompile_level(source):
+    """Level dict of a compiled level; equal to the JSON it was compiled from"""
+    level_file = source if isinstance(source, LevelFile) else LevelFile(source)
+    level = {"width": level_file.width}
+    for kind, _ in RECORDS:
+        table = level_file.tables[kind]
+        # Platforms repeat in every chunk they overlap; keep one of each, in index order
+        _, first = np.unique(table["index"], return_index=True)
+        items = []
+        for record in table[first].tolist():
+            item = {"x": record[1], "y": record[2]}
+            if kind == "platforms":
+                item.update(width=record[3], height=record[4], type=PLATFORM_TYPES[record[5]])
+            elif kind == "powerups":
+                item["type"] = POWERUP_TYPES[record[3]]
+            elif kind == "enemies":
+                item.update(direction=record[3], type=ENEMY_TYPES[record[4]])
+            items.append(item)
+        level[kind] = items
+    return level
+
+
+def open_level(path):
+    """LevelFile for a level, going through its compiled cache when given the JSON source.
+
+    The .mlvl next to the source is used when it was compiled from exactly
+    this source, and rebuilt otherwise. Where it can't be written the level
+    is compiled in memory instead.
+    """
+    if not path.endswith(".json"):
+        return LevelFile(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = source_hash(data)
+    target = os.path.splitext(path)[0] + ".mlvl"
+    try:
+        level_file = LevelFile(target)
+        if level_file.source_hash == digest:
+            return level_file
+        level_file.close()
+    except (OSError, LevelFormatError):
+        pass
+    compiled = compile_level(json.loads(data), source=digest)
+    try:
+        write_atomic(target, compiled)
+    except OSError:
+        return LevelFile(compiled)
+    return LevelFile(target)
@@ -0,0 +1,122 @@
+"""Streams level chunks in and out around the camera"""
+from collections import namedtuple
+
+import numpy as np
+import pygame
+from utils.constants import *
+from .platforms import Platform
+from .level_format import PLATFORM_TYPES
+from .activation import SLEEP_MARGIN
+
+
+# Chunks within this many pixels of the viewport are loaded; it must exceed
+# SLEEP_MARGIN so every entity that is simulated stands on loaded geometry
+LOAD_MARGIN = SLEEP_MARGIN + 128
+# Loaded chunks are released only once this much further out, so the
+# boundary doesn't thrash
+UNLOAD_SLACK = 256
+
+StreamChanges = namedtuple("StreamChanges", "loaded unloaded platforms_changed")
+
+
+class LevelStream:
+    """Keeps the chunks of a LevelFile around the camera loaded.
+
+    Platforms stay alive while any chunk holding them is loaded, and are
+    indexed only by the part lying in loaded chunks, so a ground platform
+    as wide as the level costs no more than a short one. Entities are
+    claimed by their level index when their chunk loads, so nothing spawns
+    twice; release() hands back the ones dropped with an unloaded chunk so
+    they respawn from the file next time. Entities that die stay claimed and
+    never come back. Work and memory depend on the loaded window, not on the
+    level length.
+    """
+    def __init__(self, level_file, load_margin=LOAD_MARGIN, unload_slack=UNLOAD_SLACK):
+        self.level_file = level_file
+        self.width = level_file.width
+        self.load_margin = load_margin
+        self.unload_margin = load_margin + unload_slack
+        self.loaded = set()        # Chunk indices
+        self.platforms = {}        # Level index -> Platform
+        self.platform_chunks = {}  # Level index -> loaded chunks holding it
+        self.chunk_platforms = {}  # Chunk index -> platform indices
+        self.claimed = {kind: set() for kind in ("coins", "powerups", "enemies", "checkpoints")}
+        self.load_count = 0
+        self.unload_count = 0
+
+    def _chunks_near(self, camera_x, margin):
+        chunk_width = self.level_file.chunk_width
+        first = max(0, int(camera_x - margin) // chunk_width)
+        last = min(self.level_file.chunk_count - 1, int(camera_x + SCREEN_WIDTH + margin) // chunk_width)
+        return range(first, last + 1)
+
+    def update(self, camera_x):
+        """Load chunks approaching the camera and unload the ones far behind.
+
+        Returns StreamChanges: the newly loaded chunks (with already claimed
+        entities filtered out of their record arrays), the (left, right)
+        ranges of unloaded chunks, and whether the loaded platforms or their
+        indexed rects changed.
+        """
+        keep = set(self._chunks_near(camera_x, self.unload_margin))
+        unloaded = []
+        for index in sorted(self.loaded - keep):
+            self.loaded.discard(index)
+            self.unload_count += 1
+            for platform_index in self.chunk_platforms.pop(index):
+                chunks = self.platform_chunks[platform_index]
+                chunks.discard(index)
+                if not chunks:
+                    del self.platform_chunks[platform_index]
+                    del self.platforms[platform_index]
+            left, right = self.level_file.chunk_range(index)
+            # Entities outside the level belong to the edge chunks
+            if index == 0:
+                left = float("-inf")
+            if index == self.level_file.chunk_count - 1:
+                right = float("inf")
+            unloaded.append((left, right))
+
+        loaded = []
+        for index in self._chunks_near(camera_x, self.load_margin):
+            if index in self.loaded:
+                continue
+            chunk = self.level_file.read_chunk(index)
+            self.loaded.add(index)
+            self.load_count += 1
+            self.chunk_platforms[index] = chunk.platforms["index"].tolist()
+            for platform_index, x, y, width, height, platform_type in chunk.platforms.tolist():
+                if platform_index not in self.platforms:
+                    self.platforms[platform_index] = Platform(x, y, width, height, PLATFORM_TYPES[platform_type])
+                    self.platform_chunks[platform_index] = set()
+                self.platform_chunks[platform_index].add(index)
+            for kind, claimed in self.claimed.items():
+                records = getattr(chunk, kind)
+                indices = records["index"].tolist()
+                fresh = [index not in claimed for index in indices]
+                if not all(fresh):
+                    records = records[np.array(fresh, dtype=bool)]
+                claimed.update(indices)
+                setattr(chunk, kind, records)
+            loaded.append(chunk)
+        return StreamChanges(loaded, unloaded, bool(loaded or unloaded))
+
+    def release(self, kind, indices):
+        """Let entities dropped with an unloaded chunk spawn again"""
+        self.claimed[kind].difference_update(indices)
+
+    def level_platforms(self):
+        """Loaded platforms in level order, each with its rect clipped to the loaded chunks"""
+        chunk_width = self.level_file.chunk_width
+        result = []
+        for index in sorted(self.platforms):
+            platform = self.platforms[index]
+            chunks = self.platform_chunks[index]
+            left, right = platform.rect.left, platform.rect.right
+            # Parts beyond the level's ends belong to the edge chunks
+            if min(chunks) > 0:
+                left = max(left, min(chunks) * chunk_width)
+            if max(chunks) < self.level_file.chunk_count - 1:
+                right = min(right, (max(chunks) + 1) * chunk_width)
+            result.append((platform, pygame.Rect(left, platform.rect.top, right - left, platform.rect.height)))
+        return result
@@ -43,15 +43,19 @@ class MarioPlayer:
             self.on_ground = False
             self.is_jumping = True
     
-    def update(self):
+    def update(self, move=None):
+        """Step physics; move(player) replaces the plain position update if given"""
         # Apply gravity
         if not self.on_ground:
             self.vel_y += self.gravity
             self.vel_y = min(self.vel_y, 15)
         
         # Update position
-        self.x += self.vel_x
-        self.y += self.vel_y
+        if move is None:
+            self.x += self.vel_x
+            self.y += self.vel_y
+        else:
+            move(self)
         
         # Allow going off-screen to the right (for scrolling levels)
         # Only prevent going too far left
@@ -96,7 +100,11 @@ class MarioPlayer:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
-    def draw(self, surface):
+    def draw(self, surface, offset_x=0, offset_y=0):
+        """Draw Mario shifted left by offset_x, e.g. the camera position, and up by offset_y"""
+        x = self.x - offset_x
+        y = self.y - offset_y
+        
         # Flash when invincible
         if self.invincible_timer > 0 and self.invincible_timer % 10 < 5:
             return
@@ -105,21 +113,21 @@ class MarioPlayer:
         if self.shield_timer > 0:
             shield_radius = int(self.width * 0.7)
             pygame.draw.circle(surface, (0, 150, 255), 
-                              (int(self.x + self.width // 2), int(self.y + self.height // 2)), 
+                              (int(x + self.width // 2), int(y + self.height // 2)), 
                               shield_radius, 2)
         
         # Draw power-up glow if powered up
         if self.is_powered_up:
             glow_radius = int(self.width * 0.8)
             pygame.draw.circle(surface, (255, 200, 0), 
-                              (int(self.x + self.width // 2), int(self.y + self.height // 2)), 
+                              (int(x + self.width // 2), int(y + self.height // 2)), 
                               glow_radius, 1)
         
         # Draw shadow
         shadow_width = int(self.width * 1.2)
         pygame.draw.ellipse(surface, (40, 40, 60), pygame.Rect(
-            self.x + self.width // 2 - shadow_width // 2, 
-            self.y + self.height + 2, 
+            x + self.width // 2 - shadow_width // 2, 
+            y + self.height + 2, 
             shadow_width, 8
         ))
         
@@ -129,26 +137,26 @@ class MarioPlayer:
         shoe_height = 6
         
         # Left shoe with highlight
-        pygame.draw.rect(surface, shoe_color, (self.x + 6, self.y + self.height - shoe_height, shoe_width, shoe_height))
-        pygame.draw.rect(surface, (50, 50, 50), (self.x + 6, self.y + self.height - shoe_height, shoe_width, 2))
+        pygame.draw.rect(surface, shoe_color, (x + 6, y + self.height - shoe_height, shoe_width, shoe_height))
+        pygame.draw.rect(surface, (50, 50, 50), (x + 6, y + self.height - shoe_height, shoe_width, 2))
         
         # Right shoe with highlight
-        pygame.draw.rect(surface, shoe_color, (self.x + self.width - shoe_width - 6, self.y + self.height - shoe_height, shoe_width, shoe_height))
-        pygame.draw.rect(surface, (50, 50, 50), (self.x + self.width - shoe_width - 6, self.y + self.height - shoe_height, shoe_width, 2))
+        pygame.draw.rect(surface, shoe_color, (x + self.width - shoe_width - 6, y + self.height - shoe_height, shoe_width, shoe_height))
+        pygame.draw.rect(surface, (50, 50, 50), (x + self.width - shoe_width - 6, y + self.height - shoe_height, shoe_width, 2))
         
         # Draw pants (blue with detail)
         pants_color = (0, 40, 140)
         pants_height = 12
-        pygame.draw.rect(surface, pants_color, (self.x + 4, self.y + self.height - 18, self.width - 8, pants_height))
+        pygame.draw.rect(surface, pants_color, (x + 4, y + self.height - 18, self.width - 8, pants_height))
         # Pants highlight
-        pygame.draw.line(surface, (0, 80, 200), (self.x + 6, self.y + self.height - 18), (self.x + self.width - 6, self.y + self.height - 18), 1)
+        pygame.draw.line(surface, (0, 80, 200), (x + 6, y + self.height - 18), (x + self.width - 6, y + self.height - 18), 1)
         
         # Draw torso/body (red with detail)
         body_color = (200, 40, 40)
         body_height = 16
-        pygame.draw.rect(surface, body_color, (self.x + 4, self.y + 14, self.width - 8, body_height))
+        pygame.draw.rect(surface, body_color, (x + 4, y + 14, self.width - 8, body_height))
         # Body highlight
-        pygame.draw.line(surface, (255, 100, 100), (self.x + 6, self.y + 16), (self.x + self.width - 6, self.y + 16), 1)
+        pygame.draw.line(surface, (255, 100, 100), (x + 6, y + 16), (x + self.width - 6, y + 16), 1)
         
         # Draw arms (enhanced)
         arm_color = (220, 160, 100)
@@ -156,43 +164,43 @@ class MarioPlayer:
         arm_height = 14
         
         # Left arm
-        pygame.draw.rect(surface, arm_color, (self.x - 2, self.y + 16, arm_width, arm_height))
-        pygame.draw.circle(surface, arm_color, (int(self.x + 2), int(self.y + 30)), 3)
-        pygame.draw.line(surface, (240, 180, 120), (self.x + 1, self.y + 17), (self.x + 3, self.y + 17), 1)
+        pygame.draw.rect(surface, arm_color, (x - 2, y + 16, arm_width, arm_height))
+        pygame.draw.circle(surface, arm_color, (int(x + 2), int(y + 30)), 3)
+        pygame.draw.line(surface, (240, 180, 120), (x + 1, y + 17), (x + 3, y + 17), 1)
         
         # Right arm
-        pygame.draw.rect(surface, arm_color, (self.x + self.width - 4, self.y + 16, arm_width, arm_height))
-        pygame.draw.circle(surface, arm_color, (int(self.x + self.width - 2), int(self.y + 30)), 3)
-        pygame.draw.line(surface, (240, 180, 120), (self.x + self.width - 3, self.y + 17), (self.x + self.width - 1, self.y + 17), 1)
+        pygame.draw.rect(surface, arm_color, (x + self.width - 4, y + 16, arm_width, arm_height))
+        pygame.draw.circle(surface, arm_color, (int(x + self.width - 2), int(y + 30)), 3)
+        pygame.draw.line(surface, (240, 180, 120), (x + self.width - 3, y + 17), (x + self.width - 1, y + 17), 1)
         
         # Draw head (skin with detail)
         head_color = (220, 160, 100)
         head_radius = 8
-        pygame.draw.circle(surface, head_color, (int(self.x + self.width // 2), int(self.y + 10)), head_radius)
+        pygame.draw.circle(surface, head_color, (int(x + self.width // 2), int(y + 10)), head_radius)
         # Head highlight
-        pygame.draw.circle(surface, (240, 180, 120), (int(self.x + self.width // 2 - 2), int(self.y + 6)), 2)
+        pygame.draw.circle(surface, (240, 180, 120), (int(x + self.width // 2 - 2), int(y + 6)), 2)
         
         # Draw cap (M logo hat - red)
         cap_color = (200, 40, 40)
         pygame.draw.polygon(surface, cap_color, [
-            (self.x + 6, self.y + 2),
-            (self.x + self.width - 6, self.y + 2),
-            (self.x + self.width - 4, self.y + 8),
-            (self.x + 8, self.y + 8)
+            (x + 6, y + 2),
+            (x + self.width - 6, y + 2),
+            (x + self.width - 4, y + 8),
+            (x + 8, y + 8)
         ])
         # Cap highlight
-        pygame.draw.line(surface, (255, 100, 100), (self.x + 8, self.y + 3), (self.x + self.width - 8, self.y + 3), 1)
+        pygame.draw.line(surface, (255, 100, 100), (x + 8, y + 3), (x + self.width - 8, y + 3), 1)
         
         # Draw M on cap
         m_color = (255, 200, 50)
         # M letter
-        pygame.draw.line(surface, m_color, (self.x + self.width // 2 - 3, self.y + 4), (self.x + self.width // 2 - 3, self.y + 7), 2)
-        pygame.draw.line(surface, m_color, (self.x + self.width // 2 - 3, self.y + 4), (self.x + self.width // 2, self.y + 6), 2)
-        pygame.draw.line(surface, m_color, (self.x + self.width // 2, self.y + 6), (self.x + self.width // 2 + 3, self.y + 4), 2)
-        pygame.draw.line(surface, m_color, (self.x + self.width // 2 + 3, self.y + 4), (self.x + self.width // 2 + 3, self.y + 7), 2)
+        pygame.draw.line(surface, m_color, (x + self.width // 2 - 3, y + 4), (x + self.width // 2 - 3, y + 7), 2)
+        pygame.draw.line(surface, m_color, (x + self.width // 2 - 3, y + 4), (x + self.width // 2, y + 6), 2)
+        pygame.draw.line(surface, m_color, (x + self.width // 2, y + 6), (x + self.width // 2 + 3, y + 4), 2)
+        pygame.draw.line(surface, m_color, (x + self.width // 2 + 3, y + 4), (x + self.width // 2 + 3, y + 7), 2)
         
         # Eyes (animated blink)
         eye_color = (0, 0, 0)
-        if (int(self.y) // 30) % 2 == 0:  # Simple blink animation
-            pygame.draw.circle(surface, eye_color, (int(self.x + self.width // 2 - 2), int(self.y + 8)), 1)
-            pygame.draw.circle(surface, eye_color, (int(self.x + self.width // 2 + 2), int(self.y + 8)), 1)
+        if (int(y) // 30) % 2 == 0:  # Simple blink animation
+            pygame.draw.circle(surface, eye_color, (int(x + self.width // 2 - 2), int(y + 8)), 1)
+            pygame.draw.circle(surface, eye_color, (int(x + self.width // 2 + 2), int(y + 8)), 1)
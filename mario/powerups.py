@@ -2,6 +2,10 @@ import pygame
 from utils.constants import *
 
 
+# Star rotation frames; the star has five-fold symmetry so 72 degrees repeat
+STAR_FRAMES = 72
+
+
 class PowerUp:
     """Base power-up class"""
     def __init__(self, x, y, power_type="mushroom"):
@@ -35,40 +39,58 @@ class PowerUp:
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
+    def get_sprite(self):
+        """Sprite key (type, frame, direction, bob) and integer anchor for the atlas"""
+        bob_offset = int(3 * abs(pygame.math.Vector2(1, 0).rotate(self.bob).y))
+        # Only the star changes shape: quantise its rotation to whole degrees
+        frame = int(self.bob) % STAR_FRAMES if self.power_type == "star" else 0
+        return (self.power_type, frame, 1, 0), (int(self.x), int(self.y - bob_offset))
+    
+    @classmethod
+    def sprite_keys(cls):
+        """Every distinct frame the power-up drawing code can produce"""
+        keys = [("mushroom", 0, 1, 0), ("shield", 0, 1, 0)]
+        keys += [("star", frame, 1, 0) for frame in range(STAR_FRAMES)]
+        return keys
+    
     def draw(self, surface):
         """Draw power-up with animation"""
-        bob_offset = int(3 * abs(pygame.math.Vector2(1, 0).rotate(self.bob).y))
-        draw_y = self.y - bob_offset
+        key, (x, y) = self.get_sprite()
+        self.draw_frame(surface, x, y, key)
+    
+    def draw_frame(self, surface, x, y, key):
+        """Draw the frame described by a sprite key with its top-left at (x, y)"""
+        power_type, frame = key[0], key[1]
+        draw_y = y
         
-        if self.power_type == "mushroom":
+        if power_type == "mushroom":
             # Red mushroom with spots
             # Stem
-            pygame.draw.rect(surface, (100, 80, 60), (int(self.x + 8), int(draw_y + 12), 4, 8))
+            pygame.draw.rect(surface, (100, 80, 60), (int(x + 8), int(draw_y + 12), 4, 8))
             # Cap
-            pygame.draw.circle(surface, (255, 0, 0), (int(self.x + 10), int(draw_y + 8)), 10)
+            pygame.draw.circle(surface, (255, 0, 0), (int(x + 10), int(draw_y + 8)), 10)
             # Spots
-            pygame.draw.circle(surface, (255, 200, 200), (int(self.x + 5), int(draw_y + 6)), 2)
-            pygame.draw.circle(surface, (255, 200, 200), (int(self.x + 15), int(draw_y + 6)), 2)
-            pygame.draw.circle(surface, (255, 200, 200), (int(self.x + 10), int(draw_y + 12)), 2)
+            pygame.draw.circle(surface, (255, 200, 200), (int(x + 5), int(draw_y + 6)), 2)
+            pygame.draw.circle(surface, (255, 200, 200), (int(x + 15), int(draw_y + 6)), 2)
+            pygame.draw.circle(surface, (255, 200, 200), (int(x + 10), int(draw_y + 12)), 2)
         
-        elif self.power_type == "star":
+        elif power_type == "star":
             # Golden star that rotates
-            angle = self.bob
+            angle = frame
             points = []
             for i in range(10):
                 radius = 8 if i % 2 == 0 else 4
-                x = self.x + 10 + radius * pygame.math.Vector2(1, 0).rotate(angle + i * 36).x
-                y = draw_y + 10 + radius * pygame.math.Vector2(1, 0).rotate(angle + i * 36).y
-                points.append((x, y))
+                point = pygame.math.Vector2(radius, 0).rotate(angle + i * 36)
+                points.append((x + 10 + point.x, draw_y + 10 + point.y))
             pygame.draw.polygon(surface, (255, 255, 0), points)
             # Star outline
             pygame.draw.polygon(surface, (200, 200, 0), points, 2)
         
-        elif self.power_type == "shield":
+        elif power_type == "shield":
             # Blue shield
-            pygame.draw.circle(surface, (0, 150, 255), (int(self.x + 10), int(draw_y + 10)), 10)
-            pygame.draw.circle(surface, (100, 200, 255), (int(self.x + 10), int(draw_y + 10)), 8)
-            pygame.draw.circle(surface, (0, 150, 255), (int(self.x + 10), int(draw_y + 10)), 10, 2)
+            pygame.draw.circle(surface, (0, 150, 255), (int(x + 10), int(draw_y + 10)), 10)
+            pygame.draw.circle(surface, (100, 200, 255), (int(x + 10), int(draw_y + 10)), 8)
+            pygame.draw.circle(surface, (0, 150, 255), (int(x + 10), int(draw_y + 10)), 10, 2)
             # Shield letter
-            pygame.draw.line(surface, WHITE, (int(self.x + 10), int(draw_y + 5)), 
-                           (int(self.x + 10), int(draw_y + 15)), 2)
+            pygame.draw.line(surface, WHITE, (int(x + 10), int(draw_y + 5)), 
+                           (int(x + 10), int(draw_y + 15)), 2)
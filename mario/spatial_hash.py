@@ -0,0 +1,86 @@
+import pygame
+
+
+CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Uniform-grid broadphase answering "what overlaps this rect" queries.
+
+    Objects are stored with the rect they were inserted or last moved with and
+    are returned in insertion order, so callers iterating query results see
+    the same order as iterating the original list.
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> {obj: None}, a dict used as an ordered set
+        self.entries = {}  # obj -> [order, rect, cell range]
+        self.next_order = 0
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_to_cells(self, obj, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = {}
+                cell[obj] = None
+
+    def _remove_from_cells(self, obj, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[obj]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def insert(self, obj, rect):
+        rect = pygame.Rect(rect)
+        cell_range = self._cell_range(rect)
+        self.entries[obj] = [self.next_order, rect, cell_range]
+        self.next_order += 1
+        self._add_to_cells(obj, cell_range)
+
+    def remove(self, obj):
+        entry = self.entries.pop(obj, None)
+        if entry is not None:
+            self._remove_from_cells(obj, entry[2])
+
+    def move(self, obj, rect):
+        """Update an object's rect, touching only the cells it entered or left"""
+        entry = self.entries[obj]
+        rect = pygame.Rect(rect)
+        cell_range = self._cell_range(rect)
+        if cell_range != entry[2]:
+            self._remove_from_cells(obj, entry[2])
+            self._add_to_cells(obj, cell_range)
+            entry[2] = cell_range
+        entry[1] = rect
+
+    def query(self, rect):
+        """Objects whose stored rect overlaps rect, in insertion order"""
+        rect = pygame.Rect(rect)
+        x0, y0, x1, y1 = self._cell_range(rect)
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    for obj in cell:
+                        if obj not in found:
+                            entry = self.entries[obj]
+                            if entry[1].colliderect(rect):
+                                found[obj] = entry[0]
+        return sorted(found, key=found.get)
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def __len__(self):
+        return len(self.entries)
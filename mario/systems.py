@@ -0,0 +1,224 @@
+"""Components, entity factories and systems for the Mario pickups"""
+import numpy as np
+from utils.constants import *
+from .ecs import World
+from .checkpoint import Checkpoint
+from .powerups import STAR_FRAMES
+
+
+# Pickup kinds; the power-up ones match PowerUp.power_type
+PICKUP_KINDS = ("coin", "mushroom", "star", "shield", "checkpoint")
+COIN, MUSHROOM, STAR, SHIELD, CHECKPOINT = range(len(PICKUP_KINDS))
+# Level file list each pickup kind is loaded from
+PICKUP_GROUPS = ("coins", "powerups", "powerups", "powerups", "checkpoints")
+MAX_FALL_SPEED = 15
+
+COMPONENTS = {
+    "position": (("x", np.float64), ("y", np.float64)),
+    # Collision box relative to the position; coins rise by up to bob_lift
+    # pixels as they bob
+    "body": (("offset_x", np.int32), ("offset_y", np.int32), ("width", np.int32),
+             ("height", np.int32), ("bob_lift", np.float64)),
+    "velocity": (("vel_y", np.float64), ("gravity", np.float64)),
+    "bob": (("phase", np.float64), ("rate", np.float64)),
+    "pickup": (("kind", np.int8), ("consumed", np.bool_)),
+    "sprite": (("kind", np.int8), ("cull_margin", np.int32)),  # Drawn from the sprite atlas
+    "flag": (),  # Drawn as a checkpoint flag
+    "spawn": (("index", np.int64),),  # Index in the level file's list of its kind
+}
+
+
+def create_world():
+    """Empty world with every Mario component registered"""
+    return World(COMPONENTS)
+
+
+def _spawn(world, spawn_index, components):
+    """Create an entity, tagged with its level file index when it has one"""
+    if spawn_index is not None:
+        components["spawn"] = {"index": spawn_index}
+    return world.create(**components)
+
+
+def _spawn_many(world, count, spawn_index, components):
+    """Create count entities from per-entity arrays, tagged like _spawn"""
+    if spawn_index is not None:
+        components["spawn"] = {"index": spawn_index}
+    return world.create_many(count, **components)
+
+
+# Component values of each pickup; x, y and kind may be scalars or arrays
+
+def _coin(x, y):
+    return dict(position={"x": x, "y": y},
+                body={"width": 16, "height": 16, "bob_lift": 5},
+                bob={"rate": 0.1},
+                pickup={"kind": COIN, "consumed": True},
+                sprite={"kind": COIN, "cull_margin": 20})
+
+
+def _powerup(x, y, kind):
+    return dict(position={"x": x, "y": y},
+                body={"width": 20, "height": 20},
+                velocity={"gravity": 0.6},
+                bob={"rate": 0.1},
+                pickup={"kind": kind, "consumed": True},
+                sprite={"kind": kind, "cull_margin": 30})
+
+
+def _checkpoint(x, y):
+    return dict(position={"x": x, "y": y},
+                body={"offset_x": -15, "offset_y": -100, "width": 30, "height": 100},
+                pickup={"kind": CHECKPOINT, "consumed": False},
+                flag={})
+
+
+def spawn_coin(world, x, y, spawn_index=None):
+    return _spawn(world, spawn_index, _coin(x, y))
+
+
+def spawn_powerup(world, x, y, power_type="mushroom", spawn_index=None):
+    return _spawn(world, spawn_index, _powerup(x, y, PICKUP_KINDS.index(power_type)))
+
+
+def spawn_checkpoint(world, x, y, spawn_index=None):
+    """Flag pole standing on (x, y); touching it moves the respawn point"""
+    return _spawn(world, spawn_index, _checkpoint(x, y))
+
+
+def spawn_coins(world, x, y, spawn_index=None):
+    """Coins at arrays of positions, created in one batch"""
+    return _spawn_many(world, len(x), spawn_index, _coin(x, y))
+
+
+def spawn_powerups(world, x, y, kinds, spawn_index=None):
+    """Power-ups at arrays of positions; kinds are PICKUP_KINDS indices"""
+    return _spawn_many(world, len(x), spawn_index, _powerup(x, y, kinds))
+
+
+def spawn_checkpoints(world, x, y, spawn_index=None):
+    return _spawn_many(world, len(x), spawn_index, _checkpoint(x, y))
+
+
+def _sin_degrees(angle):
+    """Same as pygame.math.Vector2(1, 0).rotate(angle).y"""
+    return np.sin(np.radians(angle))
+
+
+class AnimationSystem:
+    """Advance the bobbing of every entity that bobs"""
+    def update(self, world):
+        bob = world.components["bob"]
+        bob["phase"][:] += bob["rate"]
+
+
+class PhysicsSystem:
+    """Gravity and vertical movement for entities with a velocity"""
+    def update(self, world):
+        _, (velocity, position) = world.query("velocity", "position")
+        velocities = world.components["velocity"]
+        vel_y = np.minimum(velocities["vel_y"][velocity] + velocities["gravity"][velocity], MAX_FALL_SPEED)
+        velocities["vel_y"][velocity] = vel_y
+        world.components["position"]["y"][position] += vel_y
+
+
+class CollisionSystem:
+    """Find the entities whose body touches the target this frame.
+
+    Moving entities that fell below the screen are destroyed. The touched
+    entity handles are left in contacts, in query order, for the systems
+    that run afterwards.
+    """
+    def __init__(self, target):
+        self.target = target  # Anything with get_rect(), e.g. the player
+        self.contacts = []
+
+    def rects(self, world):
+        """Slots plus integer body rects (x, y, width, height), truncated like pygame.Rect"""
+        slots, (position, body) = world.query("position", "body")
+        positions = world.components["position"]
+        bodies = world.components["body"]
+        x = positions["x"][position] + bodies["offset_x"][body]
+        y = positions["y"][position] + bodies["offset_y"][body]
+        lift = bodies["bob_lift"][body]
+        if lift.any():
+            # Only bobbing bodies have a lift, so missing bob phases are never used
+            phase = np.zeros(len(slots))
+            bob_index = world.components["bob"].indices(slots)
+            bobbing = bob_index >= 0
+            phase[bobbing] = world.components["bob"]["phase"][bob_index[bobbing]]
+            y = y - np.abs(lift * _sin_degrees(phase * 10))
+        return slots, x.astype(np.int64), y.astype(np.int64), bodies["width"][body], bodies["height"][body]
+
+    def update(self, world):
+        # Fell out of the level; can never be collected
+        slots, (_, position) = world.query("velocity", "position")
+        for slot in slots[world.components["position"]["y"][position] > SCREEN_HEIGHT]:
+            world.destroy(world.entity(slot))
+
+        target = self.target.get_rect()
+        slots, x, y, width, height = self.rects(world)
+        hit = ((x < target.right) & (x + width > target.left) &
+               (y < target.bottom) & (y + height > target.top))
+        self.contacts = [world.entity(slot) for slot in slots[hit]]
+
+
+class PickupSystem:
+    """Hand every touched pickup to a collect callback, removing consumed ones"""
+    def __init__(self, collision, collect):
+        self.collision = collision
+        self.collect = collect  # collect(kind, x, y) applies the pickup's effect
+
+    def update(self, world):
+        for entity in self.collision.contacts:
+            pickup = world.get(entity, "pickup")
+            if pickup is None:
+                continue
+            position = world.get(entity, "position")
+            self.collect(pickup["kind"], position["x"], position["y"])
+            if pickup["consumed"]:
+                world.destroy(entity)
+
+
+class RenderSystem:
+    """Screen-space drawing for entities with a sprite or a flag"""
+    def __init__(self):
+        self.flag = Checkpoint(0, 0)  # Prototype for the flag's look
+
+    def sprites(self, world, camera_x):
+        """(sprite key, screen position) for the atlas sprites near the viewport"""
+        _, (sprite, position, bob) = world.query("sprite", "position", "bob")
+        sprites = world.components["sprite"]
+        kind = sprites["kind"][sprite]
+        x = world.components["position"]["x"][position]
+        y = world.components["position"]["y"][position]
+        phase = world.components["bob"]["phase"][bob]
+
+        # Same as Coin.get_sprite and PowerUp.get_sprite
+        coin = kind == COIN
+        coin_y = y - np.abs(5 * _sin_degrees(phase * 10))
+        powerup_y = y - (3 * np.abs(_sin_degrees(phase))).astype(np.int64)
+        draw_x = x.astype(np.int64)
+        draw_y = np.where(coin, coin_y, powerup_y).astype(np.int64)
+        shine = (2 * _sin_degrees(phase * 10)).astype(np.int64)
+        star_frame = phase.astype(np.int64) % STAR_FRAMES
+
+        screen_x = draw_x - camera_x
+        margin = sprites["cull_margin"][sprite]
+        visible = np.flatnonzero((screen_x > -margin) & (screen_x < SCREEN_WIDTH + margin))
+        result = []
+        for i in visible:
+            name = PICKUP_KINDS[kind[i]]
+            if coin[i]:
+                key = (name, 0, 1, int(shine[i]))
+            else:
+                key = (name, int(star_frame[i]) if kind[i] == STAR else 0, 1, 0)
+            result.append((key, (int(screen_x[i]), int(draw_y[i]))))
+        return result
+
+    def draw_flags(self, surface, world, camera_x):
+        _, (_, position) = world.query("flag", "position")
+        for x, y in zip(world.components["position"]["x"][position], world.components["position"]["y"][position]):
+            screen_x = x - camera_x
+            if -50 < screen_x < SCREEN_WIDTH + 50:
+                self.flag.draw_frame(surface, int(screen_x), int(y))
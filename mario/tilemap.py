@@ -0,0 +1,91 @@
+import pygame
+from utils.constants import *
+
+
+CHUNK_WIDTH = 512
+# Spikes are drawn up to 10 px above and right of their platform rect
+DECORATION_MARGIN = 10
+
+
+class LevelTilemap:
+    """Static level geometry baked into fixed-width chunk surfaces.
+
+    Chunks are rendered lazily as the camera approaches them and evicted once
+    they fall far enough behind, so memory does not grow with level width.
+    extent gives the (top, bottom) of the whole level's platforms when only
+    part of it is passed in, e.g. while streaming.
+    """
+    def __init__(self, platforms, chunk_width=CHUNK_WIDTH, prefetch=1, keep_behind=1, extent=None):
+        self.chunk_width = chunk_width
+        self.prefetch = prefetch        # Chunks baked ahead of the viewport
+        self.keep_behind = keep_behind  # Chunks kept behind it before eviction
+        self.chunks = {}                # Chunk index -> Surface
+        self.bake_count = 0
+        self.evict_count = 0
+
+        # Vertical extent shared by every chunk
+        if extent is None and platforms:
+            extent = (min(platform.rect.top for platform in platforms),
+                      max(platform.rect.bottom for platform in platforms))
+        if extent is not None:
+            self.top = extent[0] - DECORATION_MARGIN
+            self.bottom = extent[1] + 1
+        else:
+            self.top = self.bottom = 0
+
+        self.chunk_platforms = self._bucket(platforms)
+
+    def _bucket(self, platforms, rects=None):
+        """Platforms touching each chunk, in level order so overlaps draw the same"""
+        chunk_platforms = {}
+        for platform, rect in zip(platforms, rects or [platform.rect for platform in platforms]):
+            left = rect.left // self.chunk_width
+            right = (rect.right + DECORATION_MARGIN) // self.chunk_width
+            for index in range(left, right + 1):
+                chunk_platforms.setdefault(index, []).append(platform)
+        return chunk_platforms
+
+    def set_platforms(self, platforms, rects=None):
+        """Replace the geometry, dropping only the baked chunks whose platforms changed.
+
+        Platforms are bucketed by rects when given, e.g. clipped to the
+        loaded part of the level, but always drawn whole.
+        """
+        chunk_platforms = self._bucket(platforms, rects)
+        for index in list(self.chunks):
+            if chunk_platforms.get(index) != self.chunk_platforms.get(index):
+                del self.chunks[index]
+        self.chunk_platforms = chunk_platforms
+
+    def _bake_chunk(self, index):
+        """Render every platform overlapping a chunk"""
+        image = pygame.Surface((self.chunk_width, self.bottom - self.top), pygame.SRCALPHA)
+        for platform in self.chunk_platforms[index]:
+            platform.draw(image, index * self.chunk_width, self.top)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        self.bake_count += 1
+        return image
+
+    def update(self, camera_x, view_width=SCREEN_WIDTH):
+        """Bake chunks approaching the viewport and evict the ones left behind"""
+        first = int(camera_x) // self.chunk_width
+        last = (int(camera_x) + view_width - 1) // self.chunk_width
+
+        for index in range(first, last + self.prefetch + 1):
+            if index not in self.chunks and index in self.chunk_platforms:
+                self.chunks[index] = self._bake_chunk(index)
+
+        for index in list(self.chunks):
+            if index < first - self.keep_behind or index > last + self.prefetch:
+                del self.chunks[index]
+                self.evict_count += 1
+        return first, last
+
+    def draw(self, surface, camera_x):
+        """Blit the chunks overlapping the viewport"""
+        first, last = self.update(camera_x, surface.get_width())
+        for index in range(first, last + 1):
+            image = self.chunks.get(index)
+            if image is not None:
+                surface.blit(image, (index * self.chunk_width - camera_x, self.top))
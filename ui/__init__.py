@@ -1,4 +1,5 @@
 """UI module for menus and HUD"""
 from .menu import MenuManager
+from .widgets import MenuScreen, MenuWidget
 
-__all__ = ['MenuManager']
+__all__ = ['MenuManager', 'MenuScreen', 'MenuWidget']
@@ -0,0 +1,73 @@
+import pygame
+from utils.constants import *
+
+
+class MenuWidget:
+    """Menu element cached as a surface, re-rendered only when its state changes"""
+    def __init__(self, bounds, paint):
+        self.bounds = bounds  # bounds(state) -> screen Rect the widget covers
+        self.paint = paint    # paint(surface, state) draws in screen coordinates
+        self.state = None
+        self.image = None
+        self.rect = None
+
+
+class MenuScreen:
+    """Retained-mode menu screen: a baked background plus cached widgets"""
+    def __init__(self, paint_background, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        background = pygame.Surface(size)
+        paint_background(background)
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        self.background = background
+        self.scratch = background.copy()
+        self.widgets = []
+        self.full_redraw = True
+        self.render_count = 0
+
+    def add_widget(self, bounds, paint):
+        widget = MenuWidget(bounds, paint)
+        self.widgets.append(widget)
+        return widget
+
+    def invalidate(self):
+        """Recompose the whole screen on the next draw"""
+        self.full_redraw = True
+
+    def _render(self, widget, state):
+        """Paint a widget over its background and cache the result"""
+        rect = widget.bounds(state).clip(self.background.get_rect())
+        self.scratch.set_clip(rect)
+        self.scratch.blit(self.background, rect, rect)
+        widget.paint(self.scratch, state)
+        self.scratch.set_clip(None)
+
+        old_rect = widget.rect
+        widget.image = self.scratch.subsurface(rect).copy()
+        widget.rect = rect
+        widget.state = state
+        self.render_count += 1
+        return [rect] if old_rect is None else [old_rect, rect]
+
+    def draw(self, surface, states):
+        """Recompose changed widgets; returns the screen rects that changed"""
+        dirty = []
+        for widget, state in zip(self.widgets, states):
+            if widget.image is None or widget.state != state:
+                dirty.extend(self._render(widget, state))
+
+        if self.full_redraw:
+            surface.blit(self.background, (0, 0))
+            for widget in self.widgets:
+                surface.blit(widget.image, widget.rect)
+            self.full_redraw = False
+            return [surface.get_rect()]
+
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.blit(self.background, rect, rect)
+            for widget in self.widgets:
+                if widget.rect.colliderect(rect):
+                    surface.blit(widget.image, widget.rect)
+        surface.set_clip(None)
+        return dirty
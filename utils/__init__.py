@@ -1,5 +1,5 @@
 """Utilities package"""
 from .constants import *
-from .particle import Particle
+from .particle import Particle, ParticleSystem
 
-__all__ = ['Particle']
+__all__ = ['Particle', 'ParticleSystem']
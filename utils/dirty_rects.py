@@ -0,0 +1,76 @@
+import pygame
+
+
+def merge_rects(rects):
+    """Union overlapping rects until no two remaining rects overlap"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectPresenter:
+    """Presents only the changed parts of the screen, flipping when too much changed"""
+    def __init__(self, screen, full_flip_threshold=0.5):
+        self.screen = screen
+        self.full_flip_threshold = full_flip_threshold  # Fraction of the screen
+        self.frames = 0
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.idle_frames = 0
+        self.last_dirty_fraction = 0.0
+        self.total_dirty_fraction = 0.0
+
+    def present(self, rects):
+        """Push rects to the display; None means the whole frame changed"""
+        screen_rect = self.screen.get_rect()
+        screen_area = screen_rect.width * screen_rect.height
+        self.frames += 1
+
+        if rects is None:
+            self._flip(1.0)
+            return
+
+        merged = [rect.clip(screen_rect) for rect in merge_rects(rects)]
+        merged = [rect for rect in merged if rect.width > 0 and rect.height > 0]
+        dirty_fraction = sum(rect.width * rect.height for rect in merged) / screen_area
+
+        if dirty_fraction > self.full_flip_threshold:
+            self._flip(dirty_fraction)
+        elif not merged:
+            self.idle_frames += 1
+            self._record(0.0)
+        else:
+            pygame.display.update(merged)
+            self.partial_updates += 1
+            self._record(dirty_fraction)
+
+    def _flip(self, dirty_fraction):
+        pygame.display.flip()
+        self.full_flips += 1
+        self._record(dirty_fraction)
+
+    def _record(self, dirty_fraction):
+        self.last_dirty_fraction = dirty_fraction
+        self.total_dirty_fraction += dirty_fraction
+
+    def get_stats(self):
+        """Per-frame dirty-area statistics"""
+        return {
+            "frames": self.frames,
+            "full_flips": self.full_flips,
+            "partial_updates": self.partial_updates,
+            "idle_frames": self.idle_frames,
+            "last_dirty_fraction": self.last_dirty_fraction,
+            "mean_dirty_fraction": self.total_dirty_fraction / self.frames if self.frames else 0.0,
+        }
@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+
+def write_atomic(path, data, mode="wb"):
+    """Replace a file in one step, so a reader never sees half of it.
+
+    data is what to write, or a function writing it to the open file. It
+    goes to a temporary file beside path that is then renamed over it.
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, mode) as f:
+            if callable(data):
+                data(f)
+            else:
+                f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
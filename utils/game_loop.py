@@ -0,0 +1,87 @@
+import time
+
+
+class FixedStepLoop:
+    """Fixed-timestep game loop with an accumulator.
+
+    The simulation always advances in steps of 1 / tick_rate seconds, however
+    long a frame took. Each rendered frame gets the fraction of a tick left in
+    the accumulator so it can interpolate between the last two states. At most
+    max_steps ticks run per frame; time beyond that is dropped, so a slow
+    machine loses game time instead of spiralling further behind.
+    """
+    def __init__(self, tick_rate=60, max_steps=5, render_fps=0, clock=time.perf_counter, sleep=time.sleep):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.render_fps = render_fps  # 0 renders as fast as possible
+        self.clock = clock
+        self.sleep = sleep
+        self.accumulator = 0.0
+        self.previous = None
+        self.started = None
+        self.running = False
+
+        self.ticks = 0
+        self.renders = 0
+        self.dropped_ticks = 0    # Ticks skipped by the catch-up cap
+        self.capped_frames = 0    # Frames that hit the catch-up cap
+        self.max_steps_seen = 0
+
+    def advance(self, update, render, now=None):
+        """Run the ticks owed up to now, then render one frame; returns ticks run"""
+        if now is None:
+            now = self.clock()
+        if self.previous is None:
+            self.previous = self.started = now
+            # Always simulate one tick before the first frame
+            self.accumulator = self.dt
+        self.accumulator += now - self.previous
+        self.previous = now
+
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            update()
+            self.accumulator -= self.dt
+            steps += 1
+        if self.accumulator >= self.dt:
+            # Spiral of death guard: forget the time we cannot catch up on
+            dropped = int(self.accumulator / self.dt)
+            self.dropped_ticks += dropped
+            self.accumulator -= dropped * self.dt
+            self.capped_frames += 1
+
+        self.ticks += steps
+        self.max_steps_seen = max(self.max_steps_seen, steps)
+        render(self.accumulator / self.dt)
+        self.renders += 1
+        return steps
+
+    def run(self, handle_events, update, render):
+        """Loop until handle_events() returns False"""
+        self.running = True
+        while self.running:
+            frame_start = self.clock()
+            if handle_events() is False:
+                break
+            self.advance(update, render)
+            if self.render_fps:
+                remaining = 1.0 / self.render_fps - (self.clock() - frame_start)
+                if remaining > 0:
+                    self.sleep(remaining)
+        self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def get_stats(self):
+        elapsed = (self.previous - self.started) if self.started is not None else 0.0
+        return {
+            "ticks": self.ticks,
+            "renders": self.renders,
+            "dropped_ticks": self.dropped_ticks,
+            "capped_frames": self.capped_frames,
+            "max_steps_per_frame": self.max_steps_seen,
+            "ticks_per_second": self.ticks / elapsed if elapsed > 0 else 0.0,
+            "renders_per_second": self.renders / elapsed if elapsed > 0 else 0.0,
+        }
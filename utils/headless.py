@@ -0,0 +1,167 @@
+"""Headless fixed-step simulation of the games, for testing, tuning and bots"""
+import os
+import sys
+import time
+import random
+
+
+def init_headless():
+    """Initialise pygame with SDL's dummy video and audio drivers"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    return pygame
+
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() holding a set of pressed keys"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class ScriptedInput:
+    """Key states read from a script of (frames, keys) segments.
+
+    The script loops once exhausted. A callable taking the frame number and
+    returning the pressed keys can be used instead, e.g. for bots.
+    """
+    def __init__(self, script=()):
+        if callable(script):
+            self.func = script
+            self.segments = []
+        else:
+            self.func = None
+            self.segments = [(frames, KeyState(keys)) for frames, keys in script]
+        self.length = sum(frames for frames, _ in self.segments)
+        self.idle = KeyState()
+
+    def keys_for(self, frame):
+        if self.func is not None:
+            return KeyState(self.func(frame))
+        if self.length <= 0:
+            return self.idle
+        frame %= self.length
+        for frames, keys in self.segments:
+            if frame < frames:
+                return keys
+            frame -= frames
+        return self.idle
+
+
+def random_input(keys, seed=0, hold=10):
+    """Callable for ScriptedInput pressing a random subset of keys, re-rolled every hold frames"""
+    rng = random.Random(seed)
+    current = [frozenset()]
+
+    def press(frame):
+        if frame % hold == 0:
+            current[0] = frozenset(key for key in keys if rng.random() < 0.3)
+        return current[0]
+    return press
+
+
+def mario_demo_script():
+    """Run right, jumping now and then"""
+    import pygame
+    return [(30, {pygame.K_RIGHT}), (1, {pygame.K_RIGHT, pygame.K_SPACE}), (20, {pygame.K_RIGHT})]
+
+
+def kof_demo_script():
+    """Both fighters trade punches and kicks while closing in"""
+    import pygame
+    return [
+        (10, {pygame.K_d, pygame.K_LEFT}),
+        (5, {pygame.K_q, pygame.K_i}),
+        (10, {pygame.K_a, pygame.K_RIGHT}),
+        (5, {pygame.K_e, pygame.K_u}),
+    ]
+
+
+class HeadlessSimulation:
+    """Steps a game's update() as fast as possible without drawing"""
+    def __init__(self, game_name, script=None, char1="Kyo", char2="Iori"):
+        init_headless()
+        self.game_name = game_name
+        if game_name == "mario":
+            from mario.game import MarioGame
+            self.game = MarioGame()
+            default_script = mario_demo_script
+        elif game_name == "kof":
+            from kof.game import KOFGame
+            self.game = KOFGame()
+            self.game.start_fight(char1, char2)
+            default_script = kof_demo_script
+        else:
+            raise ValueError(f"Unknown game: {game_name}")
+
+        if script is None:
+            script = default_script()
+        self.input = script if isinstance(script, ScriptedInput) else ScriptedInput(script)
+        self.frame = 0
+        self.elapsed = 0.0
+
+    @property
+    def finished(self):
+        """True once the round is decided"""
+        if self.game_name == "mario":
+            return self.game.game_over or self.game.won
+        return self.game.player1.health <= 0 or self.game.player2.health <= 0
+
+    def step(self, keys=None):
+        """Advance one frame with the given or scripted keys"""
+        if keys is None:
+            keys = self.input.keys_for(self.frame)
+        self.game.handle_input(keys)
+        self.game.update()
+        self.frame += 1
+        return self.finished
+
+    def run(self, frames, stop_when_finished=True):
+        """Step up to frames times; returns simulation statistics"""
+        start = time.perf_counter()
+        stepped = 0
+        for _ in range(frames):
+            stepped += 1
+            if self.step() and stop_when_finished:
+                break
+        seconds = time.perf_counter() - start
+        self.elapsed += seconds
+        return {
+            "frames": stepped,
+            "seconds": seconds,
+            "fps": stepped / seconds if seconds > 0 else float("inf"),
+            "finished": self.finished,
+        }
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a game headless as fast as possible")
+    parser.add_argument("game", choices=["mario", "kof"])
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--random", type=int, metavar="SEED", help="mash random keys instead of the demo script")
+    parser.add_argument("--keep-going", action="store_true", help="don't stop when the round ends")
+    args = parser.parse_args(argv)
+
+    pygame = init_headless()
+    script = None
+    if args.random is not None:
+        keys = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_a, pygame.K_d, pygame.K_w,
+                pygame.K_q, pygame.K_e, pygame.K_r, pygame.K_u, pygame.K_i, pygame.K_o, pygame.K_SPACE]
+        script = ScriptedInput(random_input(keys, args.random))
+
+    simulation = HeadlessSimulation(args.game, script)
+    stats = simulation.run(args.frames, stop_when_finished=not args.keep_going)
+    print(f"{args.game}: {stats['frames']} frames in {stats['seconds']:.3f} s "
+          f"({stats['fps']:.0f} simulated fps), finished: {stats['finished']}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    # Allow running as a script from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
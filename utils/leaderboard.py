@@ -0,0 +1,287 @@
+import queue
+import atexit
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+DATABASE_PATH = Path("scores/leaderboard.db")
+PERIODS = ("all", "week", "day")
+BUCKET_WIDTH = 1024  # Scores per coarse rank bucket
+BUSY_TIMEOUT = 5.0   # Seconds to wait on another process's write
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL,
+    week TEXT NOT NULL,
+    day TEXT NOT NULL,
+    cabinet TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_all ON scores (game, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_week ON scores (game, week, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_day ON scores (game, day, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_player ON scores (game, player, score DESC, id);
+CREATE TABLE IF NOT EXISTS score_counts (
+    game TEXT NOT NULL,
+    board TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game, board, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_buckets (
+    game TEXT NOT NULL,
+    board TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (game, board, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    created REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def period_boards(timestamp):
+    """Board of each period that a score set at timestamp counts towards"""
+    date = datetime.fromtimestamp(timestamp)
+    year, week, _ = date.isocalendar()
+    return {"all": "all", "week": f"{year}-W{week:02d}", "day": date.strftime("%Y-%m-%d")}
+
+
+class Leaderboard:
+    """Every score of every game, in one SQLite database shared by all
+    processes on the machine.
+
+    Each period has its own board: all time, the current ISO week and the
+    current day. Alongside the records the database keeps, per board, how
+    many scores there are of each value and of each BUCKET_WIDTH range of
+    values, so a rank is a sum over the buckets above a score plus the
+    values inside its own bucket, whatever the number of records. Top-N
+    lists and around-me windows are index range scans.
+
+    submit() returns at once; a background thread commits everything
+    queued in one transaction. The database runs in WAL mode, so reads on
+    the game thread never wait for a writer, and writers from several
+    processes take turns on the write lock. A score is visible to queries
+    once its transaction has committed. Nothing touches the disk until
+    the first score is submitted or the database already exists.
+    """
+    def __init__(self, path=DATABASE_PATH, cabinet=None):
+        self.path = Path(path)
+        self.cabinet = cabinet or socket.gethostname()
+        self.db = None  # The game thread's connection, for reads
+        self.written = 0
+        self.errors = 0
+
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, name="leaderboard", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=FULL")
+        db.executescript(SCHEMA)
+        return db
+
+    def _reader(self):
+        """The read connection, or None while there is no database yet"""
+        if self.db is None and self.path.exists():
+            self.db = self._connect()
+        return self.db
+
+    def submit(self, game, player, score, created=None):
+        """Record a score; returns at once, the writer thread commits it"""
+        self.pending.put((game, player, int(score), time.time() if created is None else created))
+
+    def _insert(self, db, entries):
+        """Add (game, player, score, created) entries and their counts; the caller holds the transaction"""
+        rows = []
+        counts = {}
+        buckets = {}
+        for game, player, score, created in entries:
+            boards = period_boards(created)
+            rows.append((game, player, score, created, boards["week"], boards["day"], self.cabinet))
+            for board in boards.values():
+                counts[game, board, score] = counts.get((game, board, score), 0) + 1
+                key = (game, board, score // BUCKET_WIDTH)
+                buckets[key] = buckets.get(key, 0) + 1
+        db.executemany("INSERT INTO scores (game, player, score, created, week, day, cabinet) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        db.executemany("INSERT INTO score_counts VALUES (?, ?, ?, ?) ON CONFLICT (game, board, score) "
+                       "DO UPDATE SET count = count + excluded.count",
+                       [key + (count,) for key, count in counts.items()])
+        db.executemany("INSERT INTO score_buckets VALUES (?, ?, ?, ?) ON CONFLICT (game, board, bucket) "
+                       "DO UPDATE SET count = count + excluded.count",
+                       [key + (count,) for key, count in buckets.items()])
+
+    def _commit(self, db, entries, source=None):
+        """Add entries in one transaction; with a source, only if it was never imported. Returns how many were added"""
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if source is not None:
+                if db.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+                    db.execute("ROLLBACK")
+                    return 0
+                db.execute("INSERT INTO imports VALUES (?, ?)", (source, time.time()))
+            self._insert(db, entries)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(entries)
+
+    def import_scores(self, source, entries):
+        """Add (game, player, score, created) entries now, unless source was imported before.
+
+        Runs on the caller's thread in its own transaction, so the scores
+        are committed once this returns; returns how many were added.
+        """
+        db = self._connect()
+        try:
+            return self._commit(db, entries, source)
+        finally:
+            db.close()
+
+    def _write_loop(self):
+        db = None  # Opened on the first score
+        running = True
+        while running:
+            # Everything queued so far goes in one transaction
+            batch = [self.pending.get()]
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            running = None not in batch
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries:
+                    if db is None:
+                        db = self._connect()
+                    self._commit(db, entries)
+                    self.written += len(entries)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error saving scores: {e}")
+            for _ in batch:
+                self.pending.task_done()
+        if db is not None:
+            db.close()
+
+    def flush(self):
+        """Wait until every submitted score is committed"""
+        self.pending.join()
+
+    def close(self):
+        """Commit what is queued and stop the writer"""
+        if self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def _board(self, period, at):
+        """Board name, and the WHERE clause picking its records"""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown leaderboard period: {period}")
+        if period == "all":
+            return "all", "game = ?", ()
+        board = period_boards(time.time() if at is None else at)[period]
+        return board, f"game = ? AND {period} = ?", (board,)
+
+    def count_at_least(self, game, score, period="all", at=None):
+        """How many scores on a board are score or better"""
+        db = self._reader()
+        if db is None:
+            return 0
+        board, _, _ = self._board(period, at)
+        bucket = score // BUCKET_WIDTH
+        above, = db.execute("SELECT COALESCE(SUM(count), 0) FROM score_buckets "
+                            "WHERE game = ? AND board = ? AND bucket > ?", (game, board, bucket)).fetchone()
+        inside, = db.execute("SELECT COALESCE(SUM(count), 0) FROM score_counts "
+                             "WHERE game = ? AND board = ? AND score >= ? AND score < ?",
+                             (game, board, score, (bucket + 1) * BUCKET_WIDTH)).fetchone()
+        return above + inside
+
+    def rank(self, game, score, period="all", at=None):
+        """Place a new score would take, after the equal scores already set"""
+        return self.count_at_least(game, score, period, at) + 1
+
+    def top(self, game, count, period="all", at=None):
+        """Best count entries of a board; equal scores keep the order they were set in"""
+        db = self._reader()
+        if db is None:
+            return []
+        _, where, args = self._board(period, at)
+        rows = db.execute(f"SELECT player, score FROM scores WHERE {where} ORDER BY score DESC, id LIMIT ?",
+                          (game, *args, count))
+        return [{"name": player, "score": score} for player, score in rows]
+
+    def best(self, game, player, period="all", at=None):
+        """A player's best entry on a board as (id, score), or None"""
+        db = self._reader()
+        if db is None:
+            return None
+        _, where, args = self._board(period, at)
+        return db.execute(f"SELECT id, score FROM scores WHERE {where} AND player = ? "
+                          f"ORDER BY score DESC, id LIMIT 1", (game, *args, player)).fetchone()
+
+    def around(self, game, player, radius=2, period="all", at=None):
+        """Up to radius entries either side of a player's best, each with its rank"""
+        mine = self.best(game, player, period, at)
+        if mine is None:
+            return []
+        entry_id, score = mine
+        _, where, args = self._board(period, at)
+        select = f"SELECT id, player, score FROM scores WHERE {where} AND "
+        # Keyset scans both ways from the player's entry: equal scores
+        # first, then the neighbouring values
+        above = self.db.execute(select + "score = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                                (game, *args, score, entry_id, radius)).fetchall()
+        above += self.db.execute(select + "score > ? ORDER BY score, id DESC LIMIT ?",
+                                 (game, *args, score, radius)).fetchall()
+        below = self.db.execute(select + "score = ? AND id > ? ORDER BY id LIMIT ?",
+                                (game, *args, score, entry_id, radius)).fetchall()
+        below += self.db.execute(select + "score < ? ORDER BY score DESC, id LIMIT ?",
+                                 (game, *args, score, radius)).fetchall()
+        window = above[:radius][::-1] + [(entry_id, player, score)] + below[:radius]
+
+        # Equal scores share a rank
+        ranks = {}
+        for _, _, value in window:
+            if value not in ranks:
+                ranks[value] = self.count_at_least(game, value + 1, period, at) + 1
+        return [{"rank": ranks[value], "name": name, "score": value} for _, name, value in window]
+
+    def history(self, game, player, count=10):
+        """A player's latest scores, newest first"""
+        db = self._reader()
+        if db is None:
+            return []
+        rows = db.execute("SELECT score, created FROM scores WHERE game = ? AND player = ? "
+                          "ORDER BY id DESC LIMIT ?", (game, player, count))
+        return [{"score": score, "created": created} for score, created in rows]
+
+
+_leaderboard = None
+
+
+def get_leaderboard():
+    """Process-wide leaderboard on the shared database"""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+    return _leaderboard
@@ -0,0 +1,228 @@
+import queue
+import threading
+from collections import namedtuple
+
+import pygame
+import numpy as np
+
+from utils.sound_manager import get_sound_bank, get_voice_manager, MUSIC_CHANNEL
+
+
+STEPS_PER_BEAT = 4   # Patterns are written in sixteenth notes
+BLOCK_MS = 100       # Length of each rendered block
+LOOKAHEAD = 4        # Rendered blocks waiting to be queued
+MASTER_VOLUME = 0.2  # Sits under the 0.3 effects
+ATTACK = 0.004       # Seconds of fade in and out around every note, against clicks
+RELEASE = 0.01
+
+# A layer plays a pattern of space-separated steps: a note such as C4, F#3
+# or Bb2, "x" for a noise hit, "-" to hold the previous note, "." to rest.
+# decay is how fast each note dies away, per second.
+Layer = namedtuple("Layer", "name wave pattern volume decay enabled")
+Track = namedtuple("Track", "name tempo layers")
+
+TRACKS = {
+    "mario": Track("mario", 140, (
+        Layer("lead", "square",
+              "C5 . E5 G5 . E5 C5 . D5 . F5 A5 . F5 D5 . "
+              "E5 . G5 C6 . G5 E5 . D5 - B4 - G4 - - .", 0.45, 3.0, True),
+        Layer("bass", "triangle", "C3 - . C3 G2 - . G2 A2 - . A2 F2 - G2 -", 0.9, 1.5, True),
+        Layer("drums", "noise", "x . . . x . . x x . . . x . x .", 0.25, 30.0, True),
+        # Star power and other power-ups
+        Layer("sparkle", "sine", "C6 E6 G6 E6 D6 F6 A6 F6", 0.35, 8.0, False),
+    )),
+    "kof": Track("kof", 150, (
+        Layer("bass", "square", "A2 A2 . A2 A2 . G2 . A2 A2 . A2 C3 . G2 .", 0.4, 4.0, True),
+        Layer("drums", "noise", "x . x . x . x . x . x . x x x x", 0.3, 25.0, True),
+        Layer("pad", "triangle", "A4 - - - C5 - - - E5 - D5 - C5 - B4 -", 0.5, 0.8, True),
+        # A fighter is nearly out
+        Layer("danger", "square", "A5 . E5 . A5 . C6 . B5 . G5 . E5 . G5 .", 0.3, 6.0, False),
+    )),
+}
+
+NOTE_OFFSETS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+
+def parse_pattern(pattern):
+    """Per-step MIDI note (-1 for rests), steps since the note started and note length in steps"""
+    notes = []
+    ages = []
+    for token in pattern.split():
+        if token == "-" and notes and notes[-1] >= 0:
+            notes.append(notes[-1])
+            ages.append(ages[-1] + 1)
+            continue
+        if token in (".", "-"):
+            notes.append(-1)
+        elif token == "x":
+            notes.append(0)
+        else:
+            offset = NOTE_OFFSETS[token[0]] + token.count("#") - token[1:].count("b")
+            notes.append(12 * (int(token.lstrip("ABCDEFG#b")) + 1) + offset)
+        ages.append(0)
+    # Each step's note lasts until the next onset
+    lengths = [0] * len(notes)
+    remaining = 0
+    for step in range(len(notes) - 1, -1, -1):
+        remaining = remaining + 1 if step + 1 < len(notes) and ages[step + 1] > 0 else 1
+        lengths[step] = ages[step] + remaining
+    return np.array(notes), np.array(ages, dtype=np.float64), np.array(lengths, dtype=np.float64)
+
+
+class MusicSynth:
+    """Renders a track block by block, carrying its place between blocks.
+
+    tempo_scale and layer_on may be changed between blocks; layers fade in
+    and out over one block.
+    """
+    def __init__(self, track, sample_rate):
+        self.track = track
+        self.sample_rate = sample_rate
+        self.position = 0.0  # In steps
+        self.tempo_scale = 1.0
+        self.layer_on = {layer.name: layer.enabled for layer in track.layers}
+        self.gains = {layer.name: float(layer.enabled) for layer in track.layers}
+        self.patterns = {layer.name: parse_pattern(layer.pattern) for layer in track.layers}
+        self.rng = np.random.default_rng(0)
+
+    def render(self, count):
+        """Next count samples as 16-bit mono PCM"""
+        steps_per_second = self.track.tempo * self.tempo_scale / 60 * STEPS_PER_BEAT
+        steps = self.position + np.arange(count) * (steps_per_second / self.sample_rate)
+        self.position += count * steps_per_second / self.sample_rate
+        step = steps.astype(np.int64)
+        frac = steps - step
+
+        mix = np.zeros(count)
+        for layer in self.track.layers:
+            start = self.gains[layer.name]
+            end = self.gains[layer.name] = 1.0 if self.layer_on[layer.name] else 0.0
+            if start == end == 0.0:
+                continue
+            notes, ages, lengths = self.patterns[layer.name]
+            index = step % len(notes)
+            note = notes[index]
+            age = (ages[index] + frac) / steps_per_second  # Seconds since the note started
+            left = (lengths[index] - ages[index] - frac) / steps_per_second
+            envelope = np.minimum(np.minimum(age / ATTACK, left / RELEASE), 1.0) * np.exp(-layer.decay * age)
+            envelope[note < 0] = 0.0
+
+            if layer.wave == "noise":
+                wave = self.rng.uniform(-1.0, 1.0, count)
+            else:
+                phase = 2 * np.pi * 440.0 * 2.0 ** ((note - 69) / 12.0) * age
+                wave = np.sin(phase)
+                if layer.wave == "square":
+                    wave = np.sign(wave) * 0.6
+                elif layer.wave == "triangle":
+                    wave = np.arcsin(wave) * (2 / np.pi)
+            gain = np.linspace(start, end, count) if start != end else end
+            mix += wave * envelope * gain * layer.volume
+        return np.int16(np.clip(mix * MASTER_VOLUME, -1.0, 1.0) * 32767)
+
+
+class MusicPlayer:
+    """Streams tracks through one reserved mixer channel.
+
+    A background thread renders blocks into a queue holding at most
+    LOOKAHEAD of them, so memory stays at a few blocks however long the
+    music plays. update(), called once a frame on the game thread, hands
+    the next block to the channel's queue whenever it has room, so the
+    game never waits on synthesis. Tempo and layer changes are heard once
+    the blocks already rendered have played.
+    """
+    def __init__(self, channel, sample_rate, channels=2, block_ms=BLOCK_MS, lookahead=LOOKAHEAD):
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_samples = int(sample_rate * block_ms / 1000)
+        self.lookahead = lookahead
+        self.track_name = None
+        self.synth = None
+        self.blocks = None
+        self.thread = None
+        self.stopping = None
+        self.blocks_fed = 0
+        self.underruns = 0
+
+    def _render_loop(self, synth, blocks, stopping):
+        while not stopping.is_set():
+            pcm = synth.render(self.block_samples)
+            # Same samples on every output channel
+            data = np.repeat(pcm[:, None], self.channels, axis=1).tobytes()
+            while not stopping.is_set():
+                try:
+                    blocks.put(data, timeout=0.05)
+                    break
+                except queue.Full:
+                    pass
+
+    def play(self, track_name):
+        """Start a track from the top; playing the current track again does nothing"""
+        if track_name == self.track_name:
+            return
+        self.stop()
+        self.track_name = track_name
+        self.blocks_fed = 0
+        self.underruns = 0
+        self.synth = MusicSynth(TRACKS[track_name], self.sample_rate)
+        self.blocks = queue.Queue(maxsize=self.lookahead)
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._render_loop, args=(self.synth, self.blocks, self.stopping),
+                                       name="music", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+        self.channel.stop()
+        self.track_name = self.synth = self.blocks = self.thread = self.stopping = None
+
+    def set_tempo(self, scale):
+        if self.synth is not None:
+            self.synth.tempo_scale = scale
+
+    def set_layers(self, layers):
+        """Turn layers of the current track on or off, by name"""
+        if self.synth is not None:
+            for name, on in layers.items():
+                self.synth.layer_on[name] = bool(on)
+
+    def update(self):
+        """Queue the next rendered block on the channel when it has room"""
+        if self.blocks is None or self.channel.get_queue() is not None:
+            return
+        try:
+            data = self.blocks.get_nowait()
+        except queue.Empty:
+            if self.blocks_fed and not self.channel.get_busy():
+                self.underruns += 1
+            return
+        self.channel.queue(pygame.mixer.Sound(buffer=data))
+        self.blocks_fed += 1
+
+    def get_stats(self):
+        """Counters for the current track"""
+        block_bytes = self.block_samples * self.channels * 2
+        # Rendered blocks waiting, plus the playing and the queued one
+        buffered = (self.blocks.qsize() + 2) * block_bytes if self.blocks is not None else 0
+        return {
+            "track": self.track_name,
+            "blocks_fed": self.blocks_fed,
+            "underruns": self.underruns,
+            "buffered_bytes": buffered,
+        }
+
+
+_music_player = None
+
+
+def get_music_player():
+    """Process-wide music player on the reserved music channel"""
+    global _music_player
+    if _music_player is None:
+        bank = get_sound_bank()
+        get_voice_manager()  # Reserves the music channel
+        _music_player = MusicPlayer(pygame.mixer.Channel(MUSIC_CHANNEL), bank.sample_rate, bank.channels)
+    return _music_player
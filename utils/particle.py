@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 
 
@@ -21,4 +22,132 @@ class Particle:
     def draw(self, surface):
         alpha = self.lifetime / self.max_lifetime
         size = max(2, int(4 * alpha))
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), size)
+        return pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), size)
+
+
+# Particles shrink from MAX_RADIUS to MIN_RADIUS over their lifetime, like Particle
+MIN_RADIUS = 2
+MAX_RADIUS = 4
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored in NumPy arrays.
+
+    Live particles are packed at the front of the arrays; dead ones are
+    compacted away each update, so their slots are reused by later emissions
+    without allocating. Behaviour per particle matches Particle.
+    """
+    def __init__(self, capacity=20000, gravity=0.3, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.size = 0
+        self.dropped = 0  # Particles refused because the pool was full
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vel_x = np.zeros(capacity)
+        self.vel_y = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int16)  # Index into palette
+        self.palette = []        # Colours seen so far
+        self.palette_index = {}  # colour -> palette index
+        self.sprites = []        # Per palette entry: circle surface for each radius
+        self.stamps = {}         # radius -> (dx, dy) pixel offsets covered by the circle
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def _color_index(self, color):
+        color = tuple(color)
+        index = self.palette_index.get(color)
+        if index is None:
+            index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+            sprites = {}
+            for radius in range(MIN_RADIUS, MAX_RADIUS + 1):
+                sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+                sprites[radius] = sprite
+            self.sprites.append(sprites)
+            if not self.stamps:
+                for radius, sprite in sprites.items():
+                    self.stamps[radius] = np.nonzero(pygame.surfarray.array_alpha(sprite))
+        return index
+
+    def emit(self, x, y, count, color, lifetime=30, speed=(2, 5), angle=(0, 360)):
+        """Burst of count particles from (x, y) in random directions and speeds"""
+        accepted = min(count, self.capacity - self.size)
+        self.dropped += count - accepted
+        count = accepted
+        if count <= 0:
+            return 0
+        start, end = self.size, self.size + count
+        angles = np.radians(self.rng.uniform(angle[0], angle[1], count))
+        speeds = self.rng.uniform(speed[0], speed[1], count)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vel_x[start:end] = speeds * np.cos(angles)
+        self.vel_y[start:end] = speeds * np.sin(angles)
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.color[start:end] = self._color_index(color)
+        self.size = end
+        return count
+
+    def update(self):
+        """Move every particle one frame and recycle the ones that expired"""
+        n = self.size
+        if not n:
+            return
+        self.x[:n] += self.vel_x[:n]
+        self.y[:n] += self.vel_y[:n]
+        self.vel_y[:n] += self.gravity
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        count = int(np.count_nonzero(alive))
+        if count < n:
+            for array in (self.x, self.y, self.vel_x, self.vel_y, self.lifetime, self.max_lifetime, self.color):
+                array[:count] = array[:n][alive]
+            self.size = count
+
+    def clear(self):
+        self.size = 0
+
+    def draw(self, surface, offset_x=0, offset_y=0):
+        """Draw every particle in one batch; returns their bounding rect, or None"""
+        n = self.size
+        if not n:
+            return None
+        radius = np.maximum(MIN_RADIUS, (MAX_RADIUS * self.lifetime[:n] / self.max_lifetime[:n]).astype(np.int32))
+        left = self.x[:n].astype(np.int32) - int(offset_x) - radius
+        top = self.y[:n].astype(np.int32) - int(offset_y) - radius
+        color = self.color[:n]
+
+        if surface.get_bytesize() in (1, 2, 4) and surface.get_clip() == surface.get_rect():
+            self._stamp(surface, radius, left, top, color)
+        else:
+            sprites = self.sprites
+            surface.blits([(sprites[c][r], (x, y)) for c, r, x, y in
+                           zip(color.tolist(), radius.tolist(), left.tolist(), top.tolist())], False)
+        return pygame.Rect(int(left.min()), int(top.min()),
+                           int((left + radius * 2).max() - left.min()), int((top + radius * 2).max() - top.min()))
+
+    def _stamp(self, surface, radius, left, top, color):
+        """Write circle pixels straight into the surface, one vectorised pass per radius"""
+        width, height = surface.get_size()
+        mapped = np.array([surface.map_rgb(c) for c in self.palette], dtype=np.int64)
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            for r, (dx, dy) in self.stamps.items():
+                chosen = np.flatnonzero(radius == r)
+                if not len(chosen):
+                    continue
+                xs = (left[chosen, None] + dx).ravel()
+                ys = (top[chosen, None] + dy).ravel()
+                values = np.repeat(mapped[color[chosen]], len(dx))
+                inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+                pixels[xs[inside], ys[inside]] = values[inside].astype(pixels.dtype)
+        finally:
+            del pixels  # Unlock the surface
@@ -1,62 +1,134 @@
 import os
 import json
+import hashlib
 from pathlib import Path
 
+from utils.leaderboard import get_leaderboard
+
+
+SCORES_DIR = Path("scores")
+HIGH_SCORES = 10
+
+
+def top_scores(scores, keep=HIGH_SCORES):
+    """Best scores first; equal scores keep the order they were set in"""
+    return sorted(scores, key=lambda x: x["score"], reverse=True)[:keep]
+
+
+def replay_scores(snapshot_path, log_path, keep=HIGH_SCORES):
+    """High scores from a legacy JSON snapshot plus its append-only log.
+
+    Log records numbered at or below the snapshot's last record are
+    already in it; a line torn by a crash mid-append is skipped.
+    """
+    scores, seq = [], 0
+    try:
+        with open(snapshot_path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            scores = data  # Written before the log existed
+        else:
+            scores, seq = data["scores"], data["seq"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading scores: {e}")
+
+    try:
+        with open(log_path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        raw = b""
+    complete = raw[:raw.rfind(b"\n") + 1]
+    for line in complete.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record["seq"] > seq:
+            scores.append({"name": record["name"], "score": record["score"]})
+            seq = record["seq"]
+    return top_scores(scores, keep)
+
+
+def import_legacy_scores(leaderboard, game_name, directory=SCORES_DIR):
+    """Move a game's JSON snapshot and log into the leaderboard, once.
+
+    The scores are committed in one transaction keyed by the files'
+    contents, so processes starting together import them once between
+    them. The files are renamed only after that commit; until then a
+    failed import leaves them in place to retry on the next start.
+    """
+    paths = [directory / f"{game_name}_scores.{suffix}" for suffix in ("json", "log")]
+    try:
+        contents = b"".join(path.read_bytes() for path in paths if path.exists())
+        created = max([os.path.getmtime(path) for path in paths if path.exists()], default=None)
+    except FileNotFoundError:
+        return 0  # Another process has just imported them
+    if created is None:
+        return 0
+    scores = replay_scores(paths[0], paths[1])
+    source = f"{game_name}:{hashlib.sha1(contents).hexdigest()}"
+    added = leaderboard.import_scores(source, [(game_name, entry["name"], entry["score"], created)
+                                               for entry in scores])
+    for path in paths:
+        try:
+            os.replace(path, path.with_name(path.name + ".imported"))
+        except FileNotFoundError:
+            pass
+    return added
+
+
+_imported = set()
+
 
 class ScoreManager:
     """Manages game scores and high scores"""
     
     def __init__(self, game_name="game"):
         self.game_name = game_name
-        self.score_file = Path(f"scores/{game_name}_scores.json")
-        self.score_file.parent.mkdir(exist_ok=True)
-        self.high_scores = self._load_scores()
+        self.leaderboard = get_leaderboard()
+        if game_name not in _imported:
+            _imported.add(game_name)
+            try:
+                import_legacy_scores(self.leaderboard, game_name)
+            except Exception as e:
+                print(f"Error importing scores: {e}")
     
-    def _load_scores(self):
-        """Load scores from file"""
-        try:
-            if self.score_file.exists():
-                with open(self.score_file, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading scores: {e}")
-        return []
+    @property
+    def high_scores(self):
+        return self.get_top_scores(HIGH_SCORES)
     
     def save_score(self, score, player_name="Player"):
-        """Save a score to the high scores list"""
+        """Save a score to the leaderboard; committed in the background"""
         try:
-            # Add new score
-            self.high_scores.append({
-                "name": player_name,
-                "score": int(score)
-            })
-            
-            # Sort and keep top 10
-            self.high_scores.sort(key=lambda x: x["score"], reverse=True)
-            self.high_scores = self.high_scores[:10]
-            
-            # Save to file
-            with open(self.score_file, 'w') as f:
-                json.dump(self.high_scores, f, indent=2)
-            
+            self.leaderboard.submit(self.game_name, player_name, int(score))
             return True
         except Exception as e:
             print(f"Error saving score: {e}")
             return False
     
-    def get_top_scores(self, count=5):
+    def get_top_scores(self, count=5, period="all"):
         """Get top N scores"""
-        return self.high_scores[:count]
+        return self.leaderboard.top(self.game_name, count, period)
     
-    def is_high_score(self, score):
+    def is_high_score(self, score, period="all"):
         """Check if a score would make the high score list"""
-        if len(self.high_scores) < 10:
-            return True
-        return score > self.high_scores[-1]["score"]
+        return self.get_rank(score, period) <= HIGH_SCORES
     
-    def get_rank(self, score):
+    def get_rank(self, score, period="all"):
         """Get the rank of a score"""
-        for i, entry in enumerate(self.high_scores):
-            if score > entry["score"]:
-                return i + 1
-        return len(self.high_scores) + 1
+        return self.leaderboard.rank(self.game_name, int(score), period)
+    
+    def get_around(self, player_name, radius=2, period="all"):
+        """Entries either side of a player's best, with their ranks"""
+        return self.leaderboard.around(self.game_name, player_name, radius, period)
+    
+    def get_player_best(self, player_name, period="all"):
+        """A player's best score, or None"""
+        best = self.leaderboard.best(self.game_name, player_name, period)
+        return None if best is None else best[1]
+    
+    def get_history(self, player_name, count=10):
+        """A player's latest scores, newest first"""
+        return self.leaderboard.history(self.game_name, player_name, count)
@@ -1,106 +1,276 @@
+import hashlib
+from collections import namedtuple
+from pathlib import Path
+
 import pygame
 import numpy as np
-import math
 
+from utils.files import write_atomic
 
-class SoundManager:
-    """Manager for game sounds and music"""
-    
-    def __init__(self):
+
+SAMPLE_RATE = 22050
+VOLUME = 0.3
+
+# Sound effects as notes of (frequency Hz, duration ms, fade in/out ms)
+EFFECTS = {
+    'jump': ((440, 100, 0),),       # A4 note
+    'coin': ((880, 150, 0),),       # A5 note (higher)
+    'powerup': ((660, 200, 0),),    # E5 note
+    'hit': ((220, 100, 0),),        # A3 note (lower)
+    'victory': ((440, 300, 50), (550, 300, 50), (660, 300, 50)),  # A, C#, E
+}
+
+# Synthesised effects are cached here between runs
+CACHE_DIR = Path(__file__).resolve().parent.parent / "cache"
+
+# How each effect may use the mixer: the most voices of it at once, its
+# priority when channels run out, the shortest gap between two starts, and
+# whether it plays on the reserved channels that nothing else can take
+VoiceRule = namedtuple("VoiceRule", "max_voices priority min_interval_ms reserved")
+VOICE_RULES = {
+    'jump': VoiceRule(1, 1, 80, False),
+    'coin': VoiceRule(3, 2, 40, False),
+    'powerup': VoiceRule(1, 3, 100, False),
+    'hit': VoiceRule(2, 2, 50, False),
+    'victory': VoiceRule(1, 5, 0, True),
+}
+DEFAULT_RULE = VoiceRule(2, 1, 50, False)
+CHANNELS = 8
+# Channels Sound.play() and find_channel() never use: the cue channel for
+# reserved effects, then the music channel
+CUE_CHANNELS = 1
+MUSIC_CHANNEL = CUE_CHANNELS
+RESERVED_CHANNELS = MUSIC_CHANNEL + 1
+
+Voice = namedtuple("Voice", "name priority started")
+
+
+def synthesize(effects, sample_rate):
+    """16-bit mono PCM of every effect, computed as one batch of notes"""
+    notes = [note for effect in effects.values() for note in effect]
+    frequency = np.array([note[0] for note in notes], dtype=np.float64)
+    duration = np.array([note[1] for note in notes], dtype=np.float64) / 1000.0
+    fade = np.array([int(sample_rate * note[2] / 1000.0) for note in notes])
+    counts = np.array([int(sample_rate * seconds) for seconds in duration.tolist()])
+    starts = np.cumsum(counts) - counts
+
+    # Position of every sample within its note
+    note_of = np.repeat(np.arange(len(notes)), counts)
+    i = np.arange(counts.sum()) - starts[note_of]
+    t = i * (duration / counts)[note_of]
+
+    # Linear fade in over the first samples of a note and out over the last
+    fades = fade[note_of]
+    ramp = np.maximum(fades - 1, 1)
+    envelope = np.ones(len(i))
+    fading_in = i < fades
+    envelope[fading_in] = (i / ramp)[fading_in]
+    from_end = counts[note_of] - 1 - i
+    fading_out = from_end < fades
+    envelope[fading_out] = (from_end / ramp)[fading_out]
+
+    wave = np.sin(2 * np.pi * frequency[note_of] * t) * VOLUME * envelope
+    pcm = np.int16(wave * 32767)
+
+    # Split back into effects
+    ends = np.cumsum([len(effect) for effect in effects.values()])
+    sample_ends = np.cumsum(counts)
+    result = {}
+    start = 0
+    for name, end_note in zip(effects, ends):
+        end = sample_ends[end_note - 1]
+        result[name] = pcm[start:end]
+        start = end
+    return result
+
+
+def effects_key(effects, sample_rate):
+    """Cache key that changes with the sample rate or any effect parameter"""
+    digest = hashlib.sha1(repr((sorted(effects.items()), VOLUME)).encode()).hexdigest()[:16]
+    return f"{sample_rate}_{digest}"
+
+
+class SoundBank:
+    """Every sound effect, synthesised once per process.
+
+    The PCM is cached in an .npz keyed by sample rate and effect
+    parameters, so later launches load it instead of synthesising.
+    """
+    def __init__(self, effects=EFFECTS, cache_dir=CACHE_DIR):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
+        self.sample_rate, _, self.channels = pygame.mixer.get_init()
+        self.cache_path = Path(cache_dir) / f"sounds_{effects_key(effects, self.sample_rate)}.npz"
+        self.from_cache = False
+        pcm = self._load_cache(effects)
+        if pcm is None:
+            pcm = synthesize(effects, self.sample_rate)
+            self._save_cache(pcm)
         self.sounds = {}
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-        self._load_sounds()
-    
-    def _load_sounds(self):
-        """Load all game sounds - create beep sounds programmatically"""
-        try:
-            # Create simple beep sounds for different game events
-            self.sounds['jump'] = self._create_beep(440, 100)      # A4 note
-            self.sounds['coin'] = self._create_beep(880, 150)      # A5 note (higher)
-            self.sounds['powerup'] = self._create_beep(660, 200)   # E5 note
-            self.sounds['hit'] = self._create_beep(220, 100)       # A3 note (lower)
-            self.sounds['victory'] = self._create_victory_sound()
-        except Exception as e:
-            print(f"Error loading sounds: {e}")
-    
-    def _create_beep(self, frequency, duration_ms):
-        """Create a simple beep sound using numpy"""
+        for name, samples in pcm.items():
+            try:
+                # Same samples on every output channel
+                frames = np.repeat(samples[:, None], self.channels, axis=1)
+                self.sounds[name] = pygame.mixer.Sound(buffer=frames.tobytes())
+            except Exception as e:
+                print(f"Error creating sound {name}: {e}")
+                self.sounds[name] = None
+
+    def _load_cache(self, effects):
+        """Cached PCM of every effect, or None when missing or unreadable"""
         try:
-            sample_rate = 22050
-            duration_sec = duration_ms / 1000.0
-            num_samples = int(sample_rate * duration_sec)
-            
-            # Generate time array
-            t = np.linspace(0, duration_sec, num_samples, False)
-            
-            # Generate sine wave
-            wave = np.sin(2 * np.pi * frequency * t) * 0.3
-            
-            # Convert to 16-bit PCM
-            wave_int = np.int16(wave * 32767)
-            
-            # Create stereo sound (duplicate for both channels)
-            stereo = np.zeros((num_samples, 2), dtype=np.int16)
-            stereo[:, 0] = wave_int
-            stereo[:, 1] = wave_int
-            
-            # Create pygame sound
-            sound = pygame.mixer.Sound(buffer=stereo.tobytes())
-            return sound
-        except Exception as e:
-            print(f"Error creating beep: {e}")
+            with np.load(self.cache_path) as cached:
+                if set(cached.files) != set(effects):
+                    return None
+                self.from_cache = True
+                return {name: cached[name] for name in effects}
+        except Exception:
             return None
-    
-    def _create_victory_sound(self):
-        """Create a simple victory sound sequence"""
+
+    def _save_cache(self, pcm):
+        """Write the cache atomically; a failed write only costs the next launch"""
         try:
-            sample_rate = 22050
-            duration_per_note = 0.3  # 300ms per note
-            
-            # Three ascending notes
-            frequencies = [440, 550, 660]  # A, C#, E
-            
-            all_waves = []
-            for freq in frequencies:
-                duration_sec = duration_per_note
-                num_samples = int(sample_rate * duration_sec)
-                t = np.linspace(0, duration_sec, num_samples, False)
-                
-                # Envelope: fade in and out
-                envelope = np.ones(num_samples)
-                fade_samples = int(sample_rate * 0.05)
-                envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-                envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
-                
-                wave = np.sin(2 * np.pi * freq * t) * 0.3 * envelope
-                all_waves.append(wave)
-            
-            # Concatenate all notes
-            full_wave = np.concatenate(all_waves)
-            wave_int = np.int16(full_wave * 32767)
-            
-            # Create stereo sound
-            stereo = np.zeros((len(wave_int), 2), dtype=np.int16)
-            stereo[:, 0] = wave_int
-            stereo[:, 1] = wave_int
-            
-            sound = pygame.mixer.Sound(buffer=stereo.tobytes())
-            return sound
-        except Exception as e:
-            print(f"Error creating victory sound: {e}")
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.cache_path, lambda f: np.savez(f, **pcm))
+        except OSError as e:
+            print(f"Error caching sounds: {e}")
+
+
+class VoiceManager:
+    """Keeps effects within a fixed channel budget.
+
+    Each effect is limited to its own number of voices; a further start
+    restarts its oldest voice instead of stacking another copy, so busy
+    scenes can't add up past full scale. Starts closer together than the
+    effect's interval are dropped. When every channel is busy the oldest
+    voice of the lowest priority is stolen, unless it outranks the new one,
+    in which case the new one is dropped. Reserved effects play on the cue
+    channels, which find_channel() and Sound.play() never use, so they
+    always get one. Reserved channels past the cue ones are left alone.
+    """
+    def __init__(self, sounds, rules=VOICE_RULES, channels=CHANNELS, reserved=RESERVED_CHANNELS,
+                 cue_channels=CUE_CHANNELS, clock=pygame.time.get_ticks):
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(reserved)
+        self.sounds = sounds
+        self.rules = rules
+        self.clock = clock
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.reserved = reserved
+        self.cue_channels = cue_channels
+        self.voices = {}      # Channel index -> Voice
+        self.last_start = {}  # Effect -> ms of its last start
+        self.played = 0
+        self.stolen = 0
+        self.dropped_rate = 0
+        self.dropped_busy = 0
+
+    def _reap(self):
+        """Forget voices that finished"""
+        for index in [index for index in self.voices if not self.channels[index].get_busy()]:
+            del self.voices[index]
+
+    def _pick_channel(self, name, rule):
+        same = [index for index, voice in self.voices.items() if voice.name == name]
+        if len(same) >= rule.max_voices:
+            self.stolen += 1
+            return min(same, key=lambda index: self.voices[index].started)
+        pool = range(self.cue_channels) if rule.reserved else range(self.reserved, len(self.channels))
+        for index in pool:
+            if index not in self.voices and not self.channels[index].get_busy():
+                return index
+        # Channels playing something else entirely are never stolen
+        ours = [index for index in pool if index in self.voices]
+        if not ours:
             return None
+        victim = min(ours, key=lambda index: (self.voices[index].priority, self.voices[index].started))
+        if self.voices[victim].priority > rule.priority:
+            return None
+        self.stolen += 1
+        return victim
+
+    def play(self, name):
+        """Start an effect if its limits allow; returns the channel, or None when dropped"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        rule = self.rules.get(name, DEFAULT_RULE)
+        now = self.clock()
+        last = self.last_start.get(name)
+        if last is not None and now - last < rule.min_interval_ms:
+            self.dropped_rate += 1
+            return None
+        self._reap()
+        index = self._pick_channel(name, rule)
+        if index is None:
+            self.dropped_busy += 1
+            return None
+        channel = self.channels[index]
+        channel.play(sound)
+        self.voices[index] = Voice(name, rule.priority, now)
+        self.last_start[name] = now
+        self.played += 1
+        return channel
+
+    def stop(self):
+        for index in self.voices:
+            self.channels[index].stop()
+        self.voices.clear()
+
+    def get_stats(self):
+        self._reap()
+        return {
+            "active": len(self.voices),
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped_rate": self.dropped_rate,
+            "dropped_busy": self.dropped_busy,
+        }
+
+
+_sound_bank = None
+_voice_manager = None
+
+
+def get_sound_bank():
+    """Process-wide sound bank; the mixer is initialised once, on first use"""
+    global _sound_bank
+    if _sound_bank is None:
+        _sound_bank = SoundBank()
+    return _sound_bank
+
+
+def get_voice_manager():
+    """Process-wide voice manager over the shared sound bank"""
+    global _voice_manager
+    if _voice_manager is None:
+        _voice_manager = VoiceManager(get_sound_bank().sounds)
+    return _voice_manager
+
+
+class SoundManager:
+    """Manager for game sounds and music"""
+    
+    def __init__(self):
+        # Sounds are shared, so every new game reuses the same buffers
+        self.sounds = get_sound_bank().sounds
+        self.voices = get_voice_manager()
     
     def play(self, sound_name):
-        """Play a sound effect"""
-        if sound_name in self.sounds and self.sounds[sound_name] is not None:
-            try:
-                self.sounds[sound_name].play()
-            except Exception as e:
-                print(f"Error playing sound {sound_name}: {e}")
+        """Play a sound effect within the voice budget"""
+        try:
+            self.voices.play(sound_name)
+        except Exception as e:
+            print(f"Error playing sound {sound_name}: {e}")
     
     def stop_all(self):
         """Stop all sounds"""
         try:
+            self.voices.stop()
             pygame.mixer.stop()
         except:
             pass
+    
+    def get_stats(self):
+        return self.voices.get_stats()
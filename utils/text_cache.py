@@ -0,0 +1,123 @@
+import pygame
+from collections import OrderedDict
+
+
+# Characters baked into each glyph atlas for numbers that change every frame
+NUMBER_GLYPHS = "0123456789-"
+
+
+class GlyphAtlas:
+    """Single-colour glyph strip for assembling numbers without font rendering"""
+    def __init__(self, font, color, chars=NUMBER_GLYPHS):
+        glyphs = [(ch, font.render(ch, True, color)) for ch in chars]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.height = max(glyph.get_height() for _, glyph in glyphs)
+        self.image = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        self.regions = {}
+
+        x = 0
+        for ch, glyph in glyphs:
+            # Copy the glyph's alpha as-is onto the transparent strip
+            self.image.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.regions[ch] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def draw(self, surface, text, pos):
+        """Blit a string of atlas characters; returns the covered rect"""
+        x, y = pos
+        blits = []
+        for ch in text:
+            region = self.regions[ch]
+            blits.append((self.image, (x, y), region))
+            x += region.width
+        surface.blits(blits, False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+class TextRenderer:
+    """Long-lived fonts plus caches of rendered strings, glyphs and HUD panels"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}           # size -> Font
+        self.strings = OrderedDict()  # (text, size, color) -> Surface, LRU order
+        self.glyphs = {}          # (size, color) -> GlyphAtlas
+        self.panels = {}          # (size, color, alpha) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, size, color):
+        """Rendered string surface, cached by (text, size, colour)"""
+        key = (text, size, tuple(color))
+        image = self.strings.get(key)
+        if image is not None:
+            self.strings.move_to_end(key)
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = self.font(size).render(text, True, color)
+        self.strings[key] = image
+        if len(self.strings) > self.max_entries:
+            self.strings.popitem(last=False)
+        return image
+
+    def draw(self, surface, text, size, color, pos):
+        """Blit a cached string; returns the covered rect"""
+        return surface.blit(self.render(text, size, color), pos)
+
+    def draw_centered(self, surface, text, size, color, center_x, y):
+        image = self.render(text, size, color)
+        return surface.blit(image, (center_x - image.get_width() // 2, y))
+
+    def draw_field(self, surface, label, value, size, color, pos, suffix=""):
+        """Blit "<label><value><suffix>" with the number assembled from glyphs"""
+        x, y = pos
+        rect = self.draw(surface, label, size, color, (x, y))
+        key = (size, tuple(color))
+        atlas = self.glyphs.get(key)
+        if atlas is None:
+            atlas = self.glyphs[key] = GlyphAtlas(self.font(size), color)
+        rect.union_ip(atlas.draw(surface, str(int(value)), (rect.right, y)))
+        if suffix:
+            rect.union_ip(self.draw(surface, suffix, size, color, (rect.right, y)))
+        return rect
+
+    def panel(self, size, color=(0, 0, 0), alpha=200):
+        """Translucent HUD backing panel, built once per size and colour"""
+        key = (tuple(size), tuple(color), alpha)
+        image = self.panels.get(key)
+        if image is None:
+            image = pygame.Surface(size)
+            image.set_alpha(alpha)
+            image.fill(color)
+            if pygame.display.get_surface() is not None:
+                image = image.convert()
+                image.set_alpha(alpha)
+            self.panels[key] = image
+        return image
+
+    def get_stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "strings": len(self.strings),
+            "glyph_atlases": len(self.glyphs),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_text_renderer = None
+
+
+def get_text_renderer():
+    """Process-wide text renderer, created on first use"""
+    global _text_renderer
+    if _text_renderer is None:
+        _text_renderer = TextRenderer()
+    return _text_renderer